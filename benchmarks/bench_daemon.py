@@ -0,0 +1,88 @@
+import argparse
+import io
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time as timer
+from datetime import date
+from pathlib import Path
+
+from benchmarks.synthetic import make_events, make_tasks
+from taskboard.daemon.client import request, run_command
+from taskboard.storage.sqlite_store import SqliteEventStore, SqliteTaskStore
+
+COMMANDS = [
+    ["display_events"],
+    ["display_tasks"],
+    ["run_today", "--start", "07:00", "--end", "23:59"],
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare commands run by the daemon with cold starts. The "
+        "board is a synthetic one in a temporary SQLite database."
+    )
+    parser.add_argument("--tasks", type=int, default=200, help="Board size")
+    parser.add_argument("--events", type=int, default=12, help="Events today")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per command")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        today = date.today()
+        os.environ.update(
+            TASKBOARD_BACKEND="sqlite",
+            TASKBOARD_DB=str(Path(directory) / "board.db"),
+            TASKBOARD_SOCKET=str(Path(directory) / "tb.sock"),
+        )
+        SqliteTaskStore(Path(directory) / "board.db").save(
+            make_tasks(args.tasks, today)
+        )
+        SqliteEventStore(Path(directory) / "board.db").save(
+            make_events(args.events, today)
+        )
+
+        daemon = subprocess.Popen(
+            [sys.executable, "-m", "taskboard.cli.serve"], stdout=subprocess.DEVNULL
+        )
+        try:
+            while not request(Path(os.environ["TASKBOARD_SOCKET"]), "ping"):
+                timer.sleep(0.05)
+
+            print(f"{'command':>16} {'cold ms':>9} {'daemon ms':>10}")
+            for command in COMMANDS:
+                cold = math.inf
+                for _ in range(max(1, args.repeat // 5)):
+                    started = timer.perf_counter()
+                    subprocess.run(
+                        [sys.executable, "-m", f"taskboard.cli.{command[0]}"]
+                        + command[1:],
+                        env=dict(os.environ, TASKBOARD_DAEMON="off"),
+                        stdout=subprocess.DEVNULL,
+                        check=True,
+                    )
+                    cold = min(cold, timer.perf_counter() - started)
+
+                warm = math.inf
+                for _ in range(args.repeat):
+                    started = timer.perf_counter()
+                    code = run_command(
+                        Path(os.environ["TASKBOARD_SOCKET"]),
+                        command[0],
+                        command[1:],
+                        io.StringIO(),
+                        io.StringIO(),
+                        sys.stderr,
+                    )
+                    warm = min(warm, timer.perf_counter() - started)
+                    assert code == 0
+                print(f"{command[0]:>16} {cold * 1e3:>9.1f} {warm * 1e3:>10.2f}")
+        finally:
+            request(Path(os.environ["TASKBOARD_SOCKET"]), "stop")
+            daemon.wait()
+
+
+if __name__ == "__main__":
+    main()
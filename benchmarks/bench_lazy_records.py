@@ -0,0 +1,115 @@
+import argparse
+import random
+import tempfile
+import time as timer
+import tracemalloc
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+from benchmarks.synthetic import make_events, make_tasks
+from taskboard.cli.run_today import build_schedule
+from taskboard.storage.events_repository import JsonEventStore
+from taskboard.storage.tasks_repository import JsonTaskStore
+
+
+def make_board(size: int, today: date, history: float):
+    # A board that has been in use for a while: `history` of the tasks are
+    # done, each with the work sessions it took
+    tasks = make_tasks(size, today, spread_days=300)
+    rng = random.Random(1)
+    for task in tasks:
+        if rng.random() < history:
+            task.is_completed = True
+            start = datetime.combine(task.scheduled_date, time(9))
+            task.work_sessions = [
+                (start, start + timedelta(minutes=25)),
+                (start + timedelta(hours=2), start + timedelta(hours=2, minutes=15)),
+            ]
+    return tasks
+
+
+def measure(load_tasks, event_store, today):
+    # Peak and retained traced memory of loading the board and building
+    # today's schedule, and the time taken without tracing
+    day_start = datetime.combine(today, time(7, 0))
+    day_end = datetime.combine(today, time(23, 59))
+
+    def run():
+        return build_schedule(
+            load_tasks(),
+            event_store.load(today, today),
+            day_start,
+            day_end,
+            10,
+            "interval",
+            day_start,
+        )
+
+    started = timer.perf_counter()
+    run()
+    seconds = timer.perf_counter() - started
+
+    tracemalloc.start()
+    tasks = load_tasks()
+    held = tracemalloc.get_traced_memory()[0]
+    del tasks
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, held, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare memory of the run_today path with eager and lazy "
+        "records and with a TaskTable."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=lambda s: [int(x) for x in s.split(",")],
+        default=[10000, 100000],
+        help="Comma separated board sizes (default: 10000,100000)",
+    )
+    parser.add_argument(
+        "--history",
+        type=float,
+        default=0.8,
+        help="Fraction of completed tasks with work sessions (default: 0.8)",
+    )
+    args = parser.parse_args()
+
+    today = date(2026, 1, 1)
+    print(
+        f"{'tasks':>8} {'source':>9} {'records':>8} {'peak MB':>8} "
+        f"{'held MB':>8} {'seconds':>8}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = Path(directory) / "tasks.json"
+        snapshot_path = Path(directory) / "tasks.bin"
+        events_path = Path(directory) / "events.json"
+        JsonEventStore(events_path).save(make_events(12, today))
+        for size in args.sizes:
+            JsonTaskStore(json_path, snapshot_path).save(
+                make_board(size, today, args.history)
+            )
+            for source, snapshot in (("json", None), ("snapshot", snapshot_path)):
+                for records in ("eager", "lazy", "table"):
+                    store = JsonTaskStore(json_path, snapshot, lazy=records == "lazy")
+                    if records == "table":
+                        # As run_today loads it
+                        load_tasks = lambda: list(store.load_table())  # noqa: E731
+                    else:
+                        load_tasks = store.load
+                    peak, held, seconds = measure(
+                        load_tasks,
+                        JsonEventStore(events_path, lazy=records == "lazy"),
+                        today,
+                    )
+                    print(
+                        f"{size:>8} {source:>9} {records:>8} "
+                        f"{peak / 1e6:>8.1f} {held / 1e6:>8.1f} {seconds:>8.3f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import math
+import tempfile
+import time as timer
+from datetime import date
+from pathlib import Path
+
+from benchmarks.synthetic import make_tasks
+from taskboard.storage.tasks_repository import JsonTaskStore
+
+
+def best_of(repeat, load):
+    best = math.inf
+    for _ in range(repeat):
+        started = timer.perf_counter()
+        load()
+        best = min(best, timer.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time load_tasks from tasks.json and from the binary snapshot."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=lambda s: [int(x) for x in s.split(",")],
+        default=[1000, 10000, 100000],
+        help="Comma separated board sizes (default: 1000,10000,100000)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size")
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} {'json (s)':>10} {'binary (s)':>11} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = Path(directory) / "tasks.json"
+        snapshot_path = Path(directory) / "tasks.bin"
+        for size in args.sizes:
+            JsonTaskStore(json_path, snapshot_path).save(
+                make_tasks(size, date(2026, 1, 1))
+            )
+            from_json = best_of(args.repeat, JsonTaskStore(json_path).load)
+            from_snapshot = best_of(
+                args.repeat, JsonTaskStore(json_path, snapshot_path).load
+            )
+            print(
+                f"{size:>8} {from_json:>10.4f} {from_snapshot:>11.4f} "
+                f"{from_json / from_snapshot:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
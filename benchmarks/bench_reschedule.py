@@ -0,0 +1,75 @@
+import argparse
+import math
+import time as timer
+from datetime import date, datetime, time
+
+from benchmarks.synthetic import make_events, make_tasks
+from taskboard.core.incremental import ChangeSet, plan_schedule, reschedule
+from taskboard.core.scheduler import generate_schedule
+from taskboard.models.task import Task
+
+
+def best_of(repeat, run):
+    best = math.inf
+    for _ in range(repeat):
+        started = timer.perf_counter()
+        run()
+        best = min(best, timer.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time re-planning after adding one task against planning from scratch."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=lambda s: [int(x) for x in s.split(",")],
+        default=[1250, 2500, 5000, 10000],
+        help="Comma separated board sizes (default: 1250,2500,5000,10000)",
+    )
+    parser.add_argument("--buffer", type=int, default=10, help="Buffer minutes")
+    parser.add_argument("--events", type=int, default=12, help="Events per day")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per size")
+    args = parser.parse_args()
+
+    today = date(2026, 1, 1)
+    day_start = datetime.combine(today, time(7, 0))
+    day_end = datetime.combine(today, time(23, 59))
+    events = make_events(args.events, today)
+
+    print(f"{'tasks':>8} {'full (s)':>10} {'replan (s)':>11} {'kept':>6}")
+    for size in args.sizes:
+        tasks = make_tasks(size, today)
+        plan = plan_schedule(tasks, events, day_start, day_end, args.buffer)
+
+        # An evening task added to a board planned this morning
+        tasks.append(
+            Task(
+                id=size + 1,
+                title="Added",
+                duration_minutes=30,
+                priority=1,
+                earliest_start_time=time(18, 0),
+                latest_end_time=None,
+                flexible=False,
+            )
+        )
+        changes = ChangeSet(added_tasks=[size + 1])
+
+        full = best_of(
+            args.repeat,
+            lambda: generate_schedule(tasks, events, day_start, day_end, args.buffer),
+        )
+        replan = best_of(args.repeat, lambda: reschedule(plan, tasks, events, changes))
+        replanned = reschedule(plan, tasks, events, changes)
+        kept = sum(
+            1
+            for task_id, placed in replanned.placements.items()
+            if plan.placements.get(task_id) == placed
+        )
+        print(f"{size:>8} {full:>10.4f} {replan:>11.4f} {kept:>6}")
+
+
+if __name__ == "__main__":
+    main()
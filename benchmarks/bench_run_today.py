@@ -0,0 +1,58 @@
+import argparse
+import math
+import time as timer
+from datetime import date, datetime, time
+
+from benchmarks.synthetic import make_events, make_tasks
+from taskboard.core.scheduler import ENGINES, generate_schedule
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time the run_today scheduling path on growing boards."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=lambda s: [int(x) for x in s.split(",")],
+        default=[1250, 2500, 5000, 10000],
+        help="Comma separated board sizes (default: 1250,2500,5000,10000)",
+    )
+    parser.add_argument(
+        "--buffer",
+        type=int,
+        default=10,
+        help="Buffer time in minutes between tasks (default: 10)",
+    )
+    parser.add_argument("--events", type=int, default=12, help="Events per day")
+    parser.add_argument(
+        "--engine", choices=ENGINES, default="interval", help="Scheduling engine"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size")
+    args = parser.parse_args()
+
+    today = date(2026, 1, 1)
+    day_start = datetime.combine(today, time(7, 0))
+    day_end = datetime.combine(today, time(23, 59))
+    events = make_events(args.events, today)
+
+    print(f"{'tasks':>8} {'scheduled':>10} {'seconds':>10} {'us / (n log2 n)':>16}")
+    for size in args.sizes:
+        tasks = make_tasks(size, today)
+        best = math.inf
+        for _ in range(args.repeat):
+            started = timer.perf_counter()
+            schedule, _ = generate_schedule(
+                tasks,
+                events,
+                day_start,
+                day_end,
+                buffer_minutes=args.buffer,
+                engine=args.engine,
+            )
+            best = min(best, timer.perf_counter() - started)
+        per_unit = best / (size * math.log2(size)) * 1e6
+        print(f"{size:>8} {len(schedule):>10} {best:>10.4f} {per_unit:>16.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import argparse
+import math
+import time as timer
+from datetime import date, time, timedelta
+
+from benchmarks.synthetic import make_events, make_tasks
+from taskboard.core.scheduler import generate_schedule_range
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time multi-day planning with generate_schedule_range."
+    )
+    parser.add_argument("--tasks", type=int, default=3000, help="Board size")
+    parser.add_argument("--days", type=int, default=30, help="Horizon in days")
+    parser.add_argument("--events", type=int, default=8, help="Events per day")
+    parser.add_argument("--buffer", type=int, default=10, help="Buffer minutes")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs to time")
+    args = parser.parse_args()
+
+    start_date = date(2026, 1, 1)
+    end_date = start_date + timedelta(days=args.days - 1)
+    # Spread scheduled dates over the horizon
+    tasks = make_tasks(args.tasks, end_date, spread_days=args.days - 1)
+    events = []
+    for offset in range(args.days):
+        events += make_events(args.events, start_date + timedelta(days=offset), offset)
+
+    best = math.inf
+    for _ in range(args.repeat):
+        started = timer.perf_counter()
+        plan, unscheduled = generate_schedule_range(
+            tasks,
+            events,
+            start_date,
+            end_date,
+            (time(8, 0), time(20, 0)),
+            buffer_minutes=args.buffer,
+            workers=args.workers,
+        )
+        best = min(best, timer.perf_counter() - started)
+
+    scheduled = sum(len(blocks) for blocks in plan.values())
+    print(
+        f"{args.tasks} tasks, {args.days} days: {scheduled} blocks, "
+        f"{len(unscheduled)} left over, {best:.4f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time as timer
+from pathlib import Path
+
+from taskboard.__main__ import COMMANDS
+
+
+def import_us(module: str) -> int:
+    # Cumulative -X importtime microseconds of importing `module` in a fresh
+    # interpreter
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    pattern = rf"import time:\s+\d+ \|\s+(\d+) \| {re.escape(module)}$"
+    return int(re.search(pattern, result.stderr, re.MULTILINE)[1])
+
+
+def wall_ms(code: str) -> float:
+    started = timer.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True)
+    return (timer.perf_counter() - started) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time the cold start of every taskboard subcommand: a fresh "
+        "interpreter importing the command, as `taskboard <command>` does before "
+        "running it without a daemon."
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command")
+    parser.add_argument("--save", type=Path, help="Write the import times as JSON")
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        help="Fail when a command imports slower than in this saved JSON",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown against --compare (default: 0.25)",
+    )
+    args = parser.parse_args()
+
+    os.environ["TASKBOARD_DAEMON"] = "off"
+    baseline = json.loads(args.compare.read_text()) if args.compare else {}
+    interpreter = min(wall_ms("pass") for _ in range(args.repeat))
+    print(f"interpreter alone: {interpreter:.1f} ms")
+    print(f"{'command':>16} {'import ms':>10} {'start ms':>9} {'baseline':>9}")
+
+    results = {}
+    regressions = []
+    for command in ["taskboard", *COMMANDS]:
+        module = "taskboard.__main__"
+        if command != "taskboard":
+            module = f"taskboard.cli.{command.replace('-', '_')}"
+        imported = min(import_us(module) for _ in range(args.repeat)) / 1e3
+        started = min(wall_ms(f"import {module}") for _ in range(args.repeat))
+        results[command] = round(imported, 2)
+
+        reference = baseline.get(command)
+        if reference is not None and imported > reference * (1 + args.tolerance):
+            regressions.append(command)
+        shown = "" if reference is None else f"{reference:.1f}"
+        print(f"{command:>16} {imported:>10.1f} {started:>9.1f} {shown:>9}")
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2) + "\n")
+    if regressions:
+        sys.exit(f"Slower to start than the baseline: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import os
+import random
+import tempfile
+import time as timer
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from taskboard.models.event import Event, external_event_id
+from taskboard.storage import events_repository
+
+BACKENDS = {
+    "json": {"TASKBOARD_BACKEND": "json", "TASKBOARD_EVENT_LAYOUT": "file"},
+    "monthly": {"TASKBOARD_BACKEND": "json", "TASKBOARD_EVENT_LAYOUT": "monthly"},
+    "jsonl": {"TASKBOARD_BACKEND": "jsonl", "TASKBOARD_EVENT_LAYOUT": "file"},
+    "sqlite": {"TASKBOARD_BACKEND": "sqlite", "TASKBOARD_EVENT_LAYOUT": "file"},
+}
+
+
+def make_calendar(count: int, rng: random.Random) -> list:
+    calendar = []
+    for i in range(count):
+        start = datetime(2024, 1, 1, 8) + timedelta(hours=rng.randrange(3 * 365 * 24))
+        calendar.append(
+            Event(
+                id=external_event_id("bench", f"event-{i}"),
+                title=f"Meeting {i}",
+                start=start,
+                end=start + timedelta(minutes=30),
+                source="bench",
+                external_id=f"event-{i}",
+            )
+        )
+    return calendar
+
+
+def timed(function, *args):
+    started = timer.perf_counter()
+    result = function(*args)
+    return result, (timer.perf_counter() - started) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time re-syncing a large calendar with a few changes through "
+        "sync_events, against replacing the source's events with save_events."
+    )
+    parser.add_argument("--events", type=int, default=50_000, help="Calendar size")
+    parser.add_argument(
+        "--changes", type=int, default=5, help="Events changed per re-sync"
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    calendar = make_calendar(args.events, rng)
+    print(f"{args.events} events, {args.changes} changed per re-sync")
+    print(
+        f"{'backend':>8} {'first ms':>9} {'re-sync ms':>11} {'same token ms':>14} {'replace ms':>11}"
+    )
+    for name, environment in BACKENDS.items():
+        with tempfile.TemporaryDirectory() as directory:
+            os.environ.update(
+                environment, TASKBOARD_DB=str(Path(directory) / "board.db")
+            )
+            events_repository.DATA_PATH = Path(directory) / "events.json"
+            events_repository.SYNC_STATE_PATH = Path(directory) / "sync.json"
+
+            _, first = timed(
+                events_repository.sync_events, "bench", list(calendar), "v1"
+            )
+            changed = list(calendar)
+            for index in rng.sample(range(len(changed)), args.changes):
+                changed[index] = replace(changed[index], title="Moved")
+            result, resync = timed(
+                events_repository.sync_events, "bench", changed, "v2"
+            )
+            assert result.updated == args.changes, result
+            _, same = timed(events_repository.sync_events, "bench", changed, "v2")
+
+            def replace_source():
+                kept = [
+                    e for e in events_repository.load_events() if e.source != "bench"
+                ]
+                events_repository.save_events(
+                    kept + [replace(e, title="Again") for e in calendar]
+                )
+
+            _, replaced = timed(replace_source)
+            print(
+                f"{name:>8} {first:>9.0f} {resync:>11.1f} {same:>14.1f} {replaced:>11.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
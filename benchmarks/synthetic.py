@@ -0,0 +1,53 @@
+import random
+from datetime import date, datetime, time, timedelta
+from typing import List
+
+from taskboard.models.event import Event
+from taskboard.models.task import Task
+
+
+def make_tasks(n: int, day: date, seed: int = 0, spread_days: int = 3) -> List[Task]:
+    # Scheduled dates fall on `day` or up to spread_days before it
+    rng = random.Random(seed)
+    tasks: List[Task] = []
+    for task_id in range(1, n + 1):
+        earliest = latest = None
+        if rng.random() < 0.2:
+            earliest = time(rng.randint(7, 18), rng.choice([0, 15, 30, 45]))
+        if rng.random() < 0.2:
+            latest = time(rng.randint(10, 22), rng.choice([0, 15, 30, 45]))
+        depends_on = []
+        if task_id > 1 and rng.random() < 0.2:
+            depends_on = [rng.randint(max(1, task_id - 50), task_id - 1)]
+        tasks.append(
+            Task(
+                id=task_id,
+                title=f"Task {task_id}",
+                duration_minutes=rng.choice([5, 10, 15, 20, 30, 45, 60]),
+                priority=rng.randint(1, 3),
+                earliest_start_time=earliest,
+                latest_end_time=latest,
+                flexible=rng.random() < 0.5,
+                is_completed=rng.random() < 0.05,
+                description=f"Description for task {task_id}",
+                scheduled_date=day - timedelta(days=rng.randint(0, spread_days)),
+                depends_on=depends_on,
+            )
+        )
+    return tasks
+
+
+def make_events(n: int, day: date, seed: int = 0) -> List[Event]:
+    rng = random.Random(seed)
+    events: List[Event] = []
+    for event_id in range(1, n + 1):
+        start = datetime.combine(day, time(rng.randint(7, 21), rng.choice([0, 30])))
+        events.append(
+            Event(
+                id=1_000_000 + event_id,
+                title=f"Event {event_id}",
+                start=start,
+                end=start + timedelta(minutes=rng.choice([15, 30, 60])),
+            )
+        )
+    return events
@@ -0,0 +1,105 @@
+import importlib
+import os
+import sys
+
+# taskboard <command> [arguments]: one entry point for the taskboard.cli modules.
+# Only the chosen command's module is imported, and commands the daemon can run
+# are handed to it before that, so a served command imports just the client.
+COMMANDS = {
+    "add-event": "Add a calendar event",
+    "add-task": "Add a task",
+    "archive-tasks": "Move old completed tasks to the archive",
+    "display-events": "List the events of a day",
+    "display-tasks": "List tasks",
+    "import-ics": "Import the events of an iCalendar file",
+    "migrate-storage": "Copy the JSON board into the SQLite database",
+    "run-today": "Plan the rest of today",
+    "run-week": "Plan the coming days",
+    "serve": "Keep the board in memory for other terminals",
+    "start-task": "Start working on a task",
+    "stop-task": "Stop the active task",
+}
+
+PROFILE_LINES = 20
+
+
+def usage() -> str:
+    lines = ["usage: taskboard [--startup-profile] <command> [arguments]", ""]
+    lines += [f"  {name:<16} {summary}" for name, summary in COMMANDS.items()]
+    lines += [
+        "",
+        "Run 'taskboard <command> --help' for a command's arguments. With",
+        "--startup-profile, the command runs under -X importtime and the slowest",
+        "imports are reported on stderr when it exits.",
+    ]
+    return "\n".join(lines)
+
+
+def profile_startup(command: str, argv) -> int:
+    # Runs the command in a fresh interpreter, as the console script would, and
+    # reports where its startup went in -X importtime's format
+    import re
+    import subprocess
+    import time as timer
+
+    started = timer.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "taskboard", command, *argv],
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    elapsed = timer.perf_counter() - started
+
+    imports = []
+    for line in result.stderr.splitlines(keepends=True):
+        if not line.startswith("import time:"):
+            sys.stderr.write(line)
+            continue
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| ( *)", line)
+        if match is not None:
+            imports.append((int(match[1]), len(match[2]) // 2, line.rstrip()))
+    total = sum(cumulative for cumulative, depth, _ in imports if depth == 0)
+
+    print(
+        f"taskboard {command}: {elapsed * 1e3:.1f} ms to exit, "
+        f"{total / 1e3:.1f} ms in {len(imports)} imports",
+        file=sys.stderr,
+    )
+    print("import time: self [us] | cumulative | imported package", file=sys.stderr)
+    for _, _, line in sorted(imports, reverse=True)[:PROFILE_LINES]:
+        print(line, file=sys.stderr)
+    return result.returncode
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    profile = argv[:1] == ["--startup-profile"]
+    if profile:
+        argv = argv[1:]
+    if argv[:1] in (["-h"], ["--help"]):
+        print(usage())
+        return
+    if not argv:
+        sys.exit(usage())
+    command, argv = argv[0].replace("_", "-"), argv[1:]
+    if command not in COMMANDS:
+        print(f"taskboard: unknown command {command!r}\n\n{usage()}", file=sys.stderr)
+        sys.exit(2)
+    if profile:
+        sys.exit(profile_startup(command, argv))
+
+    module = command.replace("-", "_")
+    sys.argv = [f"taskboard {command}", *argv]
+    from taskboard.daemon.handoff import COMMANDS as SERVED
+    from taskboard.daemon.handoff import run_via_daemon
+
+    if module in SERVED:
+        if run_via_daemon(module):
+            return
+        # Asked once already; the command should not ask again
+        os.environ["TASKBOARD_DAEMON"] = "off"
+    importlib.import_module(f"taskboard.cli.{module}").main()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,14 @@
 import uuid
 from datetime import datetime
 
+from taskboard.daemon.handoff import run_via_daemon
 from taskboard.models.event import Event
-from taskboard.storage.events_repository import load_events, save_events
+from taskboard.storage.events_repository import save_event
 
 
 def main():
-    events = load_events()
+    if run_via_daemon("add_event"):
+        return
 
     title = input("Enter event title: ")
     start_str = input("Enter start time (YYYY-MM-DD HH:MM): ")
@@ -32,8 +34,7 @@ def main():
         source="manual",
     )
 
-    events.append(event)
-    save_events(events)
+    save_event(event)
 
     print(f"Event '{title}' added successfully!")
 
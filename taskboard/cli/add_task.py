@@ -1,11 +1,15 @@
 import uuid
 from datetime import date, time
 
+from taskboard.daemon.handoff import run_via_daemon
 from taskboard.models.task import Task
-from taskboard.storage.tasks_repository import load_tasks, save_tasks
+from taskboard.storage.tasks_repository import load_tasks, save_task
 
 
 def main():
+    if run_via_daemon("add_task"):
+        return
+
     tasks = load_tasks()
 
     title = input("Enter task title: ")
@@ -64,8 +68,7 @@ def main():
         depends_on=depends_on_ids,
     )
 
-    tasks.append(task)
-    save_tasks(tasks)
+    save_task(task)
 
     print(f"Task '{title}' added successfully!")
 
@@ -0,0 +1,39 @@
+import argparse
+from datetime import date
+
+from taskboard.daemon.handoff import run_via_daemon
+from taskboard.storage.archive import (
+    DEFAULT_ARCHIVE_AFTER_DAYS,
+    archive_completed_tasks,
+    archive_path,
+)
+
+
+def main():
+    if run_via_daemon("archive_tasks"):
+        return
+
+    parser = argparse.ArgumentParser(
+        description="Move old completed tasks to the compressed task archive."
+    )
+    parser.add_argument(
+        "--older-than",
+        type=int,
+        default=DEFAULT_ARCHIVE_AFTER_DAYS,
+        help=f"Archive tasks completed more than this many days ago (default: {DEFAULT_ARCHIVE_AFTER_DAYS})",
+    )
+    args = parser.parse_args()
+
+    if args.older_than < 0:
+        print("Error: --older-than cannot be negative.")
+        return
+
+    moved = archive_completed_tasks(date.today(), args.older_than)
+    if moved:
+        print(f"Archived {moved} completed tasks to {archive_path()}.")
+    else:
+        print("No completed tasks to archive.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 import argparse
 from datetime import date, datetime
 
-from taskboard.storage.events_repository import load_events
+from taskboard.daemon.handoff import run_via_daemon
+from taskboard.storage.events_repository import iter_events
 
 
 def parse_date_string(date_str: str) -> date:
@@ -14,6 +15,9 @@ def parse_date_string(date_str: str) -> date:
 
 
 def main():
+    if run_via_daemon("display_events"):
+        return
+
     parser = argparse.ArgumentParser(description="Display events")
     parser.add_argument(
         "--date",
@@ -33,15 +37,10 @@ def main():
     )
     args = parser.parse_args()
 
-    events = load_events()
-    events = sorted(events, key=lambda e: e.start)
-    if not args.all:
-        events = [e for e in events if e.start.date() == args.date]
-
-    if not events:
-        print("No events found.")
-        return
+    # Events are printed as they are read, in stored order (by start time)
+    events = iter_events() if args.all else iter_events(args.date, args.date)
 
+    shown = 0
     for event in events:
         title = f"{event.title} (Event)"
         if event.start <= datetime.now() <= event.end:
@@ -51,6 +50,10 @@ def main():
         )
         if args.verbose:
             print(f"  Description: {event.description}")
+        shown += 1
+
+    if not shown:
+        print("No events found.")
 
 
 if __name__ == "__main__":
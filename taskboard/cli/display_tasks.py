@@ -1,7 +1,11 @@
 import argparse
-from datetime import date
+from datetime import date, timedelta
+from typing import Iterable, Iterator, List
 
-from taskboard.storage.tasks_repository import load_tasks
+from taskboard.daemon.handoff import run_via_daemon
+from taskboard.models.task import Task
+from taskboard.storage.archive import archive_path, iter_archived_tasks
+from taskboard.storage.tasks_repository import iter_tasks
 
 
 def parse_date_string(date_str: str) -> date:
@@ -13,7 +17,48 @@ def parse_date_string(date_str: str) -> date:
         )
 
 
+def _by_day(tasks: Iterable[Task]) -> Iterator[Task]:
+    # Tasks in stored order (by scheduled date, then priority) in display
+    # order: the active task after the other tasks of its day, and tasks
+    # without a date last. Only those two are held back.
+    active, undated = None, []
+    for task in tasks:
+        if task.scheduled_date is None:
+            undated.append(task)
+            continue
+        if active is not None and task.scheduled_date != active.scheduled_date:
+            yield active
+            active = None
+        if task.active_session_start is not None:
+            active = task
+        else:
+            yield task
+    if active is not None:
+        yield active
+    undated.sort(key=lambda t: t.active_session_start is not None)
+    yield from undated
+
+
+def _completed_first(tasks: Iterable[Task]) -> Iterator[Task]:
+    # Completed tasks first, then open ones, each by day; the open tasks wait
+    # until the stored tasks have all been read
+    open_tasks: List[Task] = []
+
+    def completed():
+        for task in tasks:
+            if task.is_completed:
+                yield task
+            else:
+                open_tasks.append(task)
+
+    yield from _by_day(completed())
+    yield from _by_day(open_tasks)
+
+
 def main():
+    if run_via_daemon("display_tasks"):
+        return
+
     parser = argparse.ArgumentParser(description="Display tasks")
     parser.add_argument(
         "--all",
@@ -43,66 +88,76 @@ def main():
     )
     args = parser.parse_args()
 
-    tasks = load_tasks()
-    tasks.sort(
-        key=lambda t: (
-            not t.is_completed,
-            t.scheduled_date or date.max,
-            t.active_session_start is not None,
+    # Tasks are printed as they are read, so large boards start printing at
+    # once. Stores with indexes read only the tasks these select.
+    today = date.today()
+    if args.all:
+        tasks = _completed_first(iter_tasks())
+    elif args.overdue:
+        tasks = (
+            t
+            for t in iter_tasks(
+                completed=False, scheduled_until=today - timedelta(days=1)
+            )
+            if t.active_session_start is None
         )
-    )
-
+    elif args.completed:
+        tasks = iter_tasks(completed=True)
+    else:
+        tasks = iter_tasks(completed=False, scheduled_until=args.date)
     if not args.all:
-        if args.overdue:
-            tasks = [
-                t
-                for t in tasks
-                if t.scheduled_date is not None
-                and t.scheduled_date < date.today()
-                and not t.is_completed
-                and t.active_session_start is None
-            ]
-        elif args.completed:
-            tasks = [t for t in tasks if t.is_completed]
-        else:
-            tasks = [
-                t for t in tasks if t.scheduled_date <= args.date and not t.is_completed
-            ]
+        tasks = _by_day(tasks)
 
-    if not tasks:
-        print("No tasks to display.")
-        return
+    # Archived tasks are all completed, and were finished before the completed
+    # tasks still in the store, so they come first, streamed from the archive
+    # in the order they were archived. Copies of tasks that are still in the
+    # task store (left by an interrupted archive run) are skipped, which takes
+    # a pass over the store's ids first.
+    shown = 0
+    if (args.all or args.completed) and archive_path().exists():
+        hot_ids = {t.id for t in iter_tasks(completed=None if args.all else True)}
+        for task in iter_archived_tasks():
+            if task.id not in hot_ids:
+                print_task(task, args.verbose)
+                shown += 1
 
     for task in tasks:
-        post_title_str = ""
+        print_task(task, args.verbose)
+        shown += 1
+
+    if not shown:
+        print("No tasks to display.")
+
+
+def print_task(task: Task, verbose: bool):
+    post_title_str = ""
+    if task.is_completed:
+        status = "✓"
+    elif task.active_session_start is not None:
+        status = ">"
+        post_title_str = (
+            f" (ACTIVE since {task.active_session_start.strftime('%Y-%m-%d %H:%M')})"
+        )
+    elif task.scheduled_date is not None and task.scheduled_date < date.today():
+        status = "!"
+    else:
+        status = " "
+    print(f"[{status}] {task.title}{post_title_str}")
+    if verbose:
+        print(f"    Priority: {task.priority}")
         if task.is_completed:
-            status = "✓"
-        elif task.active_session_start is not None:
-            status = ">"
-            post_title_str = f" (ACTIVE since {task.active_session_start.strftime('%Y-%m-%d %H:%M')})"
-        elif task.scheduled_date is not None and task.scheduled_date < date.today():
-            status = "!"
+            time_taken_minutes = int(
+                sum((end - start).total_seconds() for start, end in task.work_sessions)
+                / 60
+            )
+            print(f"    Time Taken: {time_taken_minutes} mins")
         else:
-            status = " "
-        print(f"[{status}] {task.title}{post_title_str}")
-        if args.verbose:
-            print(f"    Priority: {task.priority}")
-            if task.is_completed:
-                time_taken_minutes = int(
-                    sum(
-                        (end - start).total_seconds()
-                        for start, end in task.work_sessions
-                    )
-                    / 60
-                )
-                print(f"    Time Taken: {time_taken_minutes} mins")
-            else:
-                print(f"    Estimated: {task.duration_minutes} mins")
-            print(f"    Scheduled Date: {task.scheduled_date}")
-            print(f"    Earliest Start: {task.earliest_start_time}")
-            print(f"    Latest End: {task.latest_end_time}")
-            print(f"    Flexible: {'Yes' if task.flexible else 'No'}")
-            print(f"    Description: {task.description}\n")
+            print(f"    Estimated: {task.duration_minutes} mins")
+        print(f"    Scheduled Date: {task.scheduled_date}")
+        print(f"    Earliest Start: {task.earliest_start_time}")
+        print(f"    Latest End: {task.latest_end_time}")
+        print(f"    Flexible: {'Yes' if task.flexible else 'No'}")
+        print(f"    Description: {task.description}\n")
 
 
 if __name__ == "__main__":
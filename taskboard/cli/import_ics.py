@@ -0,0 +1,87 @@
+import argparse
+from hashlib import blake2b
+from pathlib import Path
+
+from taskboard.models.recurring_event import RecurringEvent
+from taskboard.storage.events_repository import (
+    get_recurring_store,
+    is_synced,
+    record_sync_token,
+    sync_events,
+)
+from taskboard.storage.ics import IcsReader
+
+
+def file_digest(path: Path) -> str:
+    # The sync token of an export: the same file imports to the same events
+    digest = blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Import the events of an iCalendar (.ics) file, such as a "
+        "Google or Outlook calendar export."
+    )
+    parser.add_argument("path", type=Path, help="The .ics file to import")
+    parser.add_argument(
+        "--source",
+        default="ics",
+        help="Name the events are stored under (default: ics). Importing again "
+        "under the same name adds, updates and removes events to match the file.",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="List the events that could not be imported",
+    )
+    args = parser.parse_args()
+
+    if args.source == "manual":
+        parser.error("--source manual is reserved for events added by hand")
+    if not args.path.is_file():
+        parser.error(f"no such file: {args.path}")
+
+    reader = IcsReader(args.path, args.source)
+    series = []
+
+    def single_events():
+        # Repeating events are kept aside while the file streams into the sync
+        for item in reader:
+            if isinstance(item, RecurringEvent):
+                series.append(item)
+            else:
+                yield item
+
+    # The file's digest is only recorded once its repeating events are saved
+    # too, so an import cut short is not taken for an unchanged file next time
+    token = file_digest(args.path)
+    if is_synced(args.source, token):
+        print(f"{args.path} has not changed since it was last imported.")
+        return
+    try:
+        result = sync_events(args.source, single_events())
+    except (UnicodeError, ValueError) as error:
+        parser.error(f"cannot import {args.path}: {error}")
+
+    store = get_recurring_store()
+    store.save([s for s in store.load() if s.source != args.source] + series)
+    record_sync_token(args.source, token)
+
+    print(
+        f"Imported {args.path}: {result.added} events added, {result.updated} "
+        f"updated, {result.removed} removed and {result.unchanged} unchanged, "
+        f"and {len(series)} repeating events."
+    )
+    if reader.skipped:
+        print(f"Skipped {len(reader.skipped)} events that could not be read.")
+        if args.verbose:
+            for reason in reader.skipped:
+                print(f"- {reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import argparse
+from pathlib import Path
+
+from taskboard.storage import events_repository, tasks_repository
+from taskboard.storage.events_repository import JsonEventStore
+from taskboard.storage.settings import db_path
+from taskboard.storage.sqlite_store import migrate_from_json
+from taskboard.storage.tasks_repository import JsonTaskStore
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Copy tasks.json and events.json into a SQLite database."
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=None,
+        help="Database to create (default: $TASKBOARD_DB or taskboard/storage/taskboard.db)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Replace the contents of a database that already holds tasks or events",
+    )
+    args = parser.parse_args()
+
+    path = args.db or db_path()
+    tasks = JsonTaskStore(tasks_repository.DATA_PATH).load()
+    events = JsonEventStore(events_repository.DATA_PATH).load()
+
+    if not migrate_from_json(path, tasks, events, force=args.force):
+        print(f"{path} already holds data. Use --force to replace it.")
+        return
+
+    print(f"Copied {len(tasks)} tasks and {len(events)} events to {path}.")
+    print("Set TASKBOARD_BACKEND=sqlite (and TASKBOARD_DB if needed) to use it.")
+
+
+if __name__ == "__main__":
+    main()
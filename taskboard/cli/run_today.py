@@ -1,10 +1,24 @@
 import argparse
-from datetime import datetime, time
+import sys
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Set, TextIO, Tuple
 
-from taskboard.core.scheduler import generate_schedule
-from taskboard.core.timeline import ScheduledBlock
-from taskboard.storage.events_repository import load_events
-from taskboard.storage.tasks_repository import load_tasks
+from taskboard.core.incremental import (
+    ChangeSet,
+    Plan,
+    advance,
+    plan_schedule,
+    reschedule,
+)
+from taskboard.core.scheduler import ENGINES, generate_schedule
+from taskboard.core.timeline import block_minutes, event_blocks, format_block
+from taskboard.daemon.handoff import run_via_daemon
+from taskboard.models.event import Event
+from taskboard.models.task import Task
+from taskboard.models.task_table import FIELDS, TaskTable
+from taskboard.storage.events_repository import events_fingerprint, load_events
+from taskboard.storage.schedule_cache import CachedSchedule, ScheduleCache, cache_key
+from taskboard.storage.tasks_repository import load_task_table, tasks_fingerprint
 
 
 def parse_time_string(time_str: str) -> time:
@@ -16,12 +30,286 @@ def parse_time_string(time_str: str) -> time:
         )
 
 
+def build_schedule(
+    tasks: List[Task],
+    events: List[Event],
+    day_start: datetime,
+    day_end: datetime,
+    buffer_minutes: int,
+    engine: str,
+    now: datetime,
+) -> CachedSchedule:
+    today = day_start.date()
+    todays_events = [e for e in events if e.start.date() == today]
+    events = [e for e in todays_events if e.end > now]  # Filter out past events
+
+    # Delegate active task handling to scheduler
+    schedule, unscheduled = generate_schedule(
+        tasks,
+        events,
+        day_start,
+        day_end,
+        buffer_minutes=buffer_minutes,
+        engine=engine,
+    )
+    all_blocks = schedule + event_blocks(events, now)
+    all_blocks.sort(key=lambda block: block.start_time)
+
+    # The output changes when an event starts or ends, and follows the clock
+    # once the active task runs over
+    changes_at = [t for e in todays_events for t in (e.start, e.end) if t > now]
+    for task in tasks:
+        if task.active_session_start is not None:
+            changes_at.append(
+                max(
+                    now,
+                    task.active_session_start
+                    + timedelta(minutes=task.duration_minutes),
+                )
+            )
+            break
+
+    return CachedSchedule(
+        blocks=all_blocks,
+        unscheduled=[(task.title, task.duration_minutes) for task in unscheduled],
+        valid_until=min(changes_at, default=None),
+    )
+
+
+def format_schedule(schedule: CachedSchedule) -> str:
+    lines = ["", "=== Today's Schedule ===", ""]
+
+    lines += [format_block(block) for block in schedule.blocks]
+    total_minutes = sum(block_minutes(block) for block in schedule.blocks)
+    lines += ["", f"Total scheduled time: {int(total_minutes)} minutes"]
+
+    if schedule.unscheduled:
+        lines += ["", "=== Unscheduled Tasks ===", ""]
+        for title, duration_minutes in schedule.unscheduled:
+            lines.append(f"- {title} ({duration_minutes} mins)")
+    return "\n".join(lines) + "\n"
+
+
+def print_schedule(schedule: CachedSchedule):
+    sys.stdout.write(format_schedule(schedule))
+
+
+# Fields that starting, stopping and completing a task change
+SESSION_FIELDS = ("is_completed", "work_sessions", "active_session_start")
+WATCH_DEBOUNCE_SECONDS = 0.2
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+
+
+class LiveSchedule:
+    # Today's schedule for --watch. The board is only read again when its
+    # fingerprints change, and then re-planned only as far as the changes reach;
+    # as the clock moves on, the plan is kept for as long as no block has to move.
+    def __init__(
+        self, start: Optional[time], end: time, buffer_minutes: int, engine: str
+    ):
+        self.start = start  # None follows the clock
+        self.end = end
+        self.buffer_minutes = buffer_minutes
+        self.engine = engine
+        self.day: Optional[date] = None
+        self.fingerprints: Optional[Tuple[bytes, bytes]] = None
+        self.table = TaskTable()
+        self.events: Dict[int, Event] = {}  # today's
+        self.plan: Optional[Plan] = None
+
+    def board_fingerprints(self) -> Tuple[bytes, bytes]:
+        return tasks_fingerprint(), events_fingerprint()
+
+    def refresh(self, now: datetime) -> str:
+        today = now.date()
+        start = self.start
+        if start is None:
+            start = now.time().replace(second=0, microsecond=0)
+        day_start = datetime.combine(today, start)
+        day_end = datetime.combine(today, self.end)
+        if day_end <= day_start:
+            return f"\nThe day is over: nothing left to plan before {self.end:%H:%M}.\n"
+
+        if today != self.day:
+            # Events are read a day at a time
+            self.day, self.fingerprints, self.plan = today, None, None
+        changes: Optional[ChangeSet] = ChangeSet()
+        fingerprints = self.board_fingerprints()
+        if fingerprints != self.fingerprints:
+            table = load_task_table()
+            events = [e for e in load_events(today, today) if e.start.date() == today]
+            changes = self._changes(table, events)
+            self.fingerprints = fingerprints
+            self.table = table
+            self.events = {event.id: event for event in events}
+
+        tasks = list(self.table)
+        events = [e for e in self.events.values() if e.end > now]
+        plan = None
+        if self.plan is not None and changes is not None:
+            plan = advance(self.plan, events, day_start)
+            if plan is not None:
+                plan = reschedule(plan, tasks, events, changes)
+        if plan is None:
+            plan = plan_schedule(
+                tasks, events, day_start, day_end, self.buffer_minutes, self.engine
+            )
+        self.plan = plan
+
+        blocks = plan.blocks + event_blocks(events, now)
+        blocks.sort(key=lambda block: block.start_time)
+        return format_schedule(
+            CachedSchedule(
+                blocks=blocks,
+                unscheduled=[(t.title, t.duration_minutes) for t in plan.unscheduled],
+                valid_until=None,
+            )
+        )
+
+    def _changes(self, table: TaskTable, events: List[Event]) -> Optional[ChangeSet]:
+        # The edits since the last read as reschedule takes them: tasks added,
+        # started, stopped or completed, and new events. None for any other
+        # edit, after which the day is planned again.
+        known = set(self.table.ids)
+        added = [task_id for task_id in table.ids if task_id not in known]
+        if len(table) - len(added) != len(self.table):
+            return None
+        changes = ChangeSet(added_tasks=added)
+        kept = table
+        if added and list(table.ids[len(self.table) :]) != added:
+            # Added between the tasks already there, as stores that keep the
+            # board sorted put them. Plans break ties by board position, and
+            # reschedule places new tasks after the others.
+            if _ties_with_later_tasks(table, set(added)):
+                return None
+            kept = TaskTable.from_tasks(
+                row.to_task() for row in table if row.id in known
+            )
+            if list(kept.ids) != list(self.table.ids):
+                return None
+        for row in self.table.changed_rows(kept):
+            old, task = self.table[row], kept[row]
+            if any(
+                getattr(task, name) != getattr(old, name)
+                for name in FIELDS
+                if name not in SESSION_FIELDS
+            ):
+                return None
+            started = task.active_session_start is not None
+            was_started = old.active_session_start is not None
+            if started and not was_started:
+                changes.started_tasks.append(task.id)
+            elif not started and (
+                was_started or (task.is_completed and not old.is_completed)
+            ):
+                changes.stopped_tasks.append(task.id)
+            else:
+                return None
+
+        for event in events:
+            old_event = self.events.get(event.id)
+            if old_event is None:
+                changes.added_events.append(event)
+            elif old_event != event:
+                return None
+        if len(events) - len(changes.added_events) != len(self.events):
+            return None
+        return changes
+
+
+def _ties_with_later_tasks(table: TaskTable, added: Set[int]) -> bool:
+    # Whether an added task sorts like a task after it on the board, so that
+    # only its position decides which of them is planned first
+    later = set()
+    for row in reversed(range(len(table))):
+        task = table[row]
+        key = (
+            task.flexible,
+            task.priority,
+            task.latest_end_time or time.min,
+            task.duration_minutes,
+        )
+        if task.id not in added:
+            later.add(key)
+        elif key in later:
+            return True
+    return False
+
+
+def redraw(out: TextIO, text: str, now: datetime) -> None:
+    # One write per frame, so the terminal never shows half a schedule
+    clear = CLEAR_SCREEN if out.isatty() else ""
+    out.write(f"{clear}{text}\nUpdated {now:%H:%M}; watching for changes.\n")
+    out.flush()
+
+
+async def watch_schedule(
+    live: LiveSchedule,
+    out: TextIO,
+    poll_seconds: float = 1.0,
+    debounce_seconds: float = WATCH_DEBOUNCE_SECONDS,
+) -> None:
+    # Redraws the schedule when the board changes and at every minute, since
+    # the active task and ongoing events follow the clock. Runs until cancelled.
+    import asyncio
+
+    wake = asyncio.Event()
+
+    async def board_changes():
+        while True:
+            await asyncio.sleep(poll_seconds)
+            current = live.board_fingerprints()
+            if current == live.fingerprints:
+                continue
+            # A command may write several files; re-plan once they settle
+            while True:
+                await asyncio.sleep(debounce_seconds)
+                latest = live.board_fingerprints()
+                if latest == current:
+                    break
+                current = latest
+            wake.set()
+
+    async def minute_ticks():
+        while True:
+            now = datetime.now()
+            await asyncio.sleep(60 - now.second - now.microsecond / 1e6)
+            wake.set()
+
+    watchers = [
+        asyncio.ensure_future(board_changes()),
+        asyncio.ensure_future(minute_ticks()),
+    ]
+    try:
+        while True:
+            now = datetime.now()
+            redraw(out, live.refresh(now), now)
+            await wake.wait()
+            wake.clear()
+    finally:
+        for watcher in watchers:
+            watcher.cancel()
+
+
+def print_cache_stats(cache: ScheduleCache):
+    stats = cache.stats()
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = stats["hits"] / lookups * 100 if lookups else 0.0
+    print(f"Cache hits: {stats['hits']}")
+    print(f"Cache misses: {stats['misses']}")
+    print(f"Hit rate: {hit_rate:.1f}% of {lookups} lookups")
+    print(f"Evictions: {stats['evictions']}")
+
+
 def main():
+    if run_via_daemon("run_today"):
+        return
+
     parser = argparse.ArgumentParser(description="Generate today's TaskBoard schedule.")
     parser.add_argument(
         "--start",
         type=parse_time_string,
-        default=datetime.now().time(),
+        default=None,
         help="Start time for scheduling (default: current time)",
     )
     parser.add_argument(
@@ -36,14 +324,62 @@ def main():
         default=0,
         help="Buffer time in minutes between tasks (default: 0)",
     )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="interval",
+        help="Scheduling engine; 'bitmap' needs numpy (default: interval)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always compute the schedule, without reading or writing the cache",
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Show schedule cache hit and miss counts and exit",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running, and redraw the schedule when the board changes and "
+        "as the day goes on",
+    )
+    parser.add_argument(
+        "--poll",
+        type=float,
+        default=1.0,
+        help="With --watch, seconds between checks for changes (default: 1)",
+    )
     args = parser.parse_args()
 
-    today = datetime.now().date()
+    cache = ScheduleCache()
+    if args.cache_stats:
+        print_cache_stats(cache)
+        return
 
-    if isinstance(args.start, str):
-        args.start = time.fromisoformat(args.start)
     if isinstance(args.end, str):
         args.end = time.fromisoformat(args.end)
+    if args.watch:
+        if args.start is not None and args.end <= args.start:
+            print("Error: End time must be after start time.")
+            return
+        import asyncio
+
+        live = LiveSchedule(args.start, args.end, args.buffer, args.engine)
+        try:
+            asyncio.run(watch_schedule(live, sys.stdout, args.poll))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    now = datetime.now()
+    today = now.date()
+
+    # The current minute, so that runs within a minute share a cache entry
+    if args.start is None:
+        args.start = now.time().replace(second=0, microsecond=0)
 
     day_start = datetime.combine(today, args.start)
     day_end = datetime.combine(today, args.end)
@@ -52,52 +388,33 @@ def main():
         print("Error: End time must be after start time.")
         return
 
-    tasks = load_tasks()
-    events = load_events()
-    events = [e for e in events if e.start.date() == today]
-    events = [e for e in events if e.end > datetime.now()]  # Filter out past events
-    event_blocks = []
-    now = datetime.now()
-    for e in events:
-        title = f"[EVENT] {e.title}"
-
-        if e.start <= now <= e.end:
-            title = f"[EVENT - ONGOING] {e.title}"
-
-        event_blocks.append(
-            ScheduledBlock(
-                id=e.id,
-                title=title,
-                start_time=e.start,
-                end_time=e.end,
-            )
-        )
-
-    # Delegate active task handling to scheduler
-    schedule, unscheduled = generate_schedule(
-        tasks, events, day_start, day_end, buffer_minutes=args.buffer
+    # Task contents include the active session. The fingerprints are taken
+    # before loading, so a board edited in between is cached under the old key,
+    # which is never looked up again.
+    key = cache_key(
+        tasks_fingerprint(),
+        events_fingerprint(),
+        f"{day_start.isoformat()}|{day_end.isoformat()}|{args.buffer}|{args.engine}".encode(),
     )
-    all_blocks = schedule + event_blocks
-    all_blocks.sort(key=lambda block: block.start_time)
-
-    print("\n=== Today's Schedule ===\n")
 
-    total_minutes = 0
-    for block in all_blocks:
-        duration = (block.end_time - block.start_time).total_seconds() / 60
-        total_minutes += duration
-
-        print(
-            f"{block.start_time.strftime('%H:%M')} - {block.end_time.strftime('%H:%M')}: "
-            f"{block.title} ({int(duration)} mins)"
+    schedule = None if args.no_cache else cache.get(key, now)
+    if schedule is None:
+        schedule = build_schedule(
+            list(load_task_table()),
+            load_events(today, today),
+            day_start,
+            day_end,
+            args.buffer,
+            args.engine,
+            now,
         )
+        # A schedule that already follows the clock is not worth keeping
+        if not args.no_cache and (
+            schedule.valid_until is None or schedule.valid_until > now
+        ):
+            cache.put(key, schedule)
 
-    print(f"\nTotal scheduled time: {int(total_minutes)} minutes")
-
-    if unscheduled:
-        print("\n=== Unscheduled Tasks ===\n")
-        for task in unscheduled:
-            print(f"- {task.title} ({task.duration_minutes} mins)")
+    print_schedule(schedule)
 
 
 if __name__ == "__main__":
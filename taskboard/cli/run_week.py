@@ -0,0 +1,146 @@
+import argparse
+import sys
+from datetime import date, datetime, time, timedelta
+
+from taskboard.core.scheduler import ENGINES, generate_schedule_range
+from taskboard.core.timeline import block_minutes, event_blocks, format_block
+from taskboard.daemon.handoff import run_via_daemon
+from taskboard.storage.events_repository import load_events
+from taskboard.storage.tasks_repository import load_task_table
+
+
+def parse_time_string(time_str: str) -> time:
+    try:
+        return time.fromisoformat(time_str)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid time format: '{time_str}'. Expected HH:MM."
+        )
+
+
+def parse_date_string(date_str: str) -> date:
+    try:
+        return date.fromisoformat(date_str)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid date format: '{date_str}'. Expected YYYY-MM-DD."
+        )
+
+
+def main():
+    if run_via_daemon("run_week"):
+        return
+
+    parser = argparse.ArgumentParser(
+        description="Generate a multi-day TaskBoard schedule."
+    )
+    parser.add_argument(
+        "--from",
+        dest="start_date",
+        type=parse_date_string,
+        default=date.today(),
+        help="First day to plan (default: today)",
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=7,
+        help="Number of days to plan (default: 7)",
+    )
+    parser.add_argument(
+        "--start",
+        type=parse_time_string,
+        default="09:00",
+        help="Start of each day (default: 09:00, or now when planning from today)",
+    )
+    parser.add_argument(
+        "--end",
+        type=parse_time_string,
+        default="23:59",
+        help="End of each day (default: 23:59)",
+    )
+    parser.add_argument(
+        "--buffer",
+        type=int,
+        default=0,
+        help="Buffer time in minutes between tasks (default: 0)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="interval",
+        help="Scheduling engine; 'bitmap' needs numpy (default: interval)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to plan independent days (default: 1)",
+    )
+    args = parser.parse_args()
+
+    if isinstance(args.start, str):
+        args.start = time.fromisoformat(args.start)
+    if isinstance(args.end, str):
+        args.end = time.fromisoformat(args.end)
+
+    if args.end <= args.start:
+        print("Error: End time must be after start time.")
+        return
+    if args.days < 1:
+        print("Error: Plan at least one day.")
+        return
+
+    now = datetime.now()
+    end_date = args.start_date + timedelta(days=args.days - 1)
+
+    # Today's plan starts now, like run_today
+    first_day_start = datetime.combine(args.start_date, args.start)
+    if args.start_date == now.date():
+        first_day_start = max(first_day_start, now)
+
+    tasks = list(load_task_table())
+    # Events over before the plan starts are left out. Only planning from
+    # today takes the clock's time; earlier days keep theirs.
+    plan_start = min(first_day_start, now)
+    events = [e for e in load_events(args.start_date, end_date) if e.end > plan_start]
+
+    plan, unscheduled = generate_schedule_range(
+        tasks,
+        events,
+        args.start_date,
+        end_date,
+        (args.start, args.end),
+        buffer_minutes=args.buffer,
+        first_day_start=first_day_start,
+        engine=args.engine,
+        workers=args.workers,
+    )
+
+    blocks_by_day = {}
+    for block in event_blocks(events, now):
+        blocks_by_day.setdefault(block.start_time.date(), []).append(block)
+
+    lines = []
+    total_minutes = 0
+    for day, schedule in plan.items():
+        all_blocks = schedule + blocks_by_day.get(day, [])
+        all_blocks.sort(key=lambda block: block.start_time)
+
+        lines += ["", f"=== {day.strftime('%a %Y-%m-%d')} ===", ""]
+        if not all_blocks:
+            lines.append("Nothing scheduled.")
+        lines += [format_block(block) for block in all_blocks]
+        total_minutes += sum(block_minutes(block) for block in all_blocks)
+
+    lines += ["", f"Total scheduled time: {int(total_minutes)} minutes"]
+
+    if unscheduled:
+        lines += ["", "=== Unscheduled Tasks ===", ""]
+        for task in unscheduled:
+            lines.append(f"- {task.title} ({task.duration_minutes} mins)")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
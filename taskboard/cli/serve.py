@@ -0,0 +1,34 @@
+import argparse
+
+from taskboard.daemon.client import request
+from taskboard.daemon.server import serve
+from taskboard.storage.settings import socket_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Keep the board in memory and run taskboard commands for "
+        "other terminals over a Unix socket"
+    )
+    parser.add_argument(
+        "--stop",
+        action="store_true",
+        help="Stop the running daemon",
+    )
+    args = parser.parse_args()
+
+    path = socket_path()
+    if args.stop:
+        if not request(path, "stop"):
+            print("No taskboard daemon is running.")
+        return
+
+    print(f"Serving the board on {path} (stop with --stop or Ctrl+C).")
+    try:
+        serve(path)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,22 @@
 from datetime import datetime
 
-from taskboard.storage.tasks_repository import load_tasks, save_tasks
+from taskboard.daemon.handoff import run_via_daemon
+from taskboard.storage.tasks_repository import get_active_task, iter_tasks, save_task
 
 
 def main():
-    tasks = load_tasks()
+    if run_via_daemon("start_task"):
+        return
 
-    active_tasks = [t for t in tasks if t.active_session_start is not None]
+    active_task = get_active_task()
 
-    if active_tasks:
+    if active_task is not None:
         print(
-            f"You are already working on '{active_tasks[0].title}'. Please complete it before starting a new task."
+            f"You are already working on '{active_task.title}'. Please complete it before starting a new task."
         )
         return
 
-    available_tasks = [t for t in tasks if not t.is_completed]
+    available_tasks = list(iter_tasks(completed=False))
 
     if not available_tasks:
         print("No incomplete tasks available to start.")
@@ -47,7 +49,7 @@ def main():
         start_time = datetime.now()
 
     selected_task.active_session_start = start_time
-    save_tasks(tasks)
+    save_task(selected_task)
 
     print(f"\nStarted '{selected_task.title}' at {start_time.strftime('%H:%M')}.")
 
@@ -1,19 +1,19 @@
 from datetime import datetime
 
-from taskboard.storage.tasks_repository import load_tasks, save_tasks
+from taskboard.daemon.handoff import run_via_daemon
+from taskboard.storage.tasks_repository import get_active_task, save_task
 
 
 def main():
-    tasks = load_tasks()
+    if run_via_daemon("stop_task"):
+        return
 
-    active_tasks = [t for t in tasks if t.active_session_start is not None]
+    task = get_active_task()
 
-    if not active_tasks:
+    if task is None:
         print("No active task to stop.")
         return
 
-    task = active_tasks[0]
-
     print(f"\nCurrently working on '{task.title}'.")
     assert task.active_session_start is not None  # For type checker
     print(f"Started at: {task.active_session_start.strftime('%Y-%m-%d %H:%M')}")
@@ -41,7 +41,7 @@ def main():
         task.is_completed = True
         print(f"Task '{task.title}' marked as completed.")
 
-    save_tasks(tasks)
+    save_task(task)
 
     print("Session stopped and saved successfully.")
 
@@ -0,0 +1,100 @@
+from typing import Iterator, List, Optional
+
+from taskboard.core.compiled import TICKS_PER_MINUTE, CompiledTasks, TickRange
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def is_available() -> bool:
+    return np is not None
+
+
+class MinuteBitmap:
+    # The day as 1440 minute slots (True = free), with the same interface as
+    # FreeTimeIndex. Free runs are found with a vectorized diff over the padded
+    # occupancy array and cached until the next split.
+
+    def __init__(self, intervals: List[TickRange]):
+        self._free = np.zeros(MINUTES_PER_DAY, dtype=np.bool_)
+        for start, end in intervals:
+            self._free[start // TICKS_PER_MINUTE : end // TICKS_PER_MINUTE] = True
+        self._runs: Optional[tuple] = None
+
+    def _free_runs(self):
+        if self._runs is None:
+            padded = np.concatenate(([False], self._free, [False])).astype(np.int8)
+            edges = np.diff(padded)
+            starts = np.flatnonzero(edges == 1).astype(np.int64) * TICKS_PER_MINUTE
+            ends = np.flatnonzero(edges == -1).astype(np.int64) * TICKS_PER_MINUTE
+            self._runs = (starts, ends)
+        return self._runs
+
+    def __len__(self) -> int:
+        return len(self._free_runs()[0])
+
+    def __iter__(self) -> Iterator[TickRange]:
+        starts, ends = self._free_runs()
+        return zip(starts.tolist(), ends.tolist())
+
+    def max_length(self) -> Optional[int]:
+        starts, ends = self._free_runs()
+        if not len(starts):
+            return None
+        return int((ends - starts).max())
+
+    def candidates(self, earliest: int, min_length: int) -> Iterator[TickRange]:
+        # Runs whose part at or after `earliest` is long enough, in start order
+        starts, ends = self._free_runs()
+        window_starts = np.maximum(starts, earliest)
+        fits = (ends - window_starts >= min_length) & (ends > window_starts)
+        for index in np.flatnonzero(fits).tolist():
+            yield int(starts[index]), int(ends[index])
+
+    def split(self, interval: TickRange, cut_start: int, cut_end: int) -> None:
+        free_start, free_end = interval
+        first = max(cut_start, free_start) // TICKS_PER_MINUTE
+        last = min(cut_end, free_end) // TICKS_PER_MINUTE
+        self._free[first:last] = False
+        self._runs = None
+
+
+def build_bitmap(
+    free_intervals: List[TickRange],
+    table: CompiledTasks,
+    day_start: int,
+    buffer: int,
+) -> Optional[MinuteBitmap]:
+    # The bitmap reproduces the interval engine only when every boundary it has to
+    # represent falls on a whole minute of the day, and placing a block always
+    # leaves a gap between the neighbouring free runs. Returns None otherwise.
+    if np is None:
+        return None
+
+    day_ticks = MINUTES_PER_DAY * TICKS_PER_MINUTE
+    if day_start % TICKS_PER_MINUTE or buffer % TICKS_PER_MINUTE:
+        return None
+
+    previous_end = None
+    for start, end in free_intervals:
+        if start % TICKS_PER_MINUTE or end % TICKS_PER_MINUTE:
+            return None
+        if start < 0 or end > day_ticks:
+            return None
+        # Touching intervals would merge into a single run
+        if previous_end is not None and start <= previous_end:
+            return None
+        previous_end = end
+
+    for row in range(len(table.duration)):
+        if table.duration[row] + buffer <= 0:
+            return None
+        for tick in (table.earliest[row], table.anchor[row]):
+            if tick is not None and tick % TICKS_PER_MINUTE:
+                return None
+
+    return MinuteBitmap(free_intervals)
@@ -0,0 +1,122 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from taskboard.models.event import Event
+from taskboard.models.task import Task
+
+# The placement engine works on integer ticks (microseconds since midnight of the
+# planned day). Microseconds rather than minutes keep conversions exact, since
+# day_start and active sessions carry the seconds of datetime.now().
+TICK = timedelta(microseconds=1)
+TICKS_PER_MINUTE = 60_000_000
+TICKS_PER_DAY = 24 * 60 * TICKS_PER_MINUTE
+
+TickRange = Tuple[int, int]
+
+
+def to_ticks(moment: datetime, day: date) -> int:
+    return (moment - datetime.combine(day, time())) // TICK
+
+
+def time_to_ticks(moment: time) -> int:
+    seconds = (moment.hour * 60 + moment.minute) * 60 + moment.second
+    return seconds * 1_000_000 + moment.microsecond
+
+
+def from_ticks(ticks: int, day: date) -> datetime:
+    return datetime.combine(day, time()) + timedelta(microseconds=ticks)
+
+
+@dataclass
+class CompiledTasks:
+    # One row per schedulable task, in input order
+    tasks: List[Task]
+    earliest: List[Optional[int]] = field(default_factory=list)
+    latest: List[Optional[int]] = field(default_factory=list)
+    duration: List[int] = field(default_factory=list)
+    keys: List[Tuple] = field(default_factory=list)
+    release: List[Optional[int]] = field(default_factory=list)  # date ordinal
+    depends_on: List[Tuple[int, ...]] = field(default_factory=list)  # rows
+    # Dependencies not yet met when compiled; deps outside the table never are
+    unmet: List[int] = field(default_factory=list)
+    dependents: Dict[int, List[int]] = field(default_factory=dict)
+    # Latest end of the dependencies that were already placed when compiled
+    anchor: List[Optional[int]] = field(default_factory=list)
+
+
+def compile_tasks(
+    tasks: List[Task],
+    task_map: Dict[int, Task],
+    anchored_ends: Dict[int, int],
+) -> CompiledTasks:
+    # anchored_ends maps ids of tasks that are already placed (the active task) to
+    # the tick their block ends at. Their dependents are unblocked but start after.
+    table = CompiledTasks([])
+    extend_table(table, {}, tasks, task_map, anchored_ends)
+    return table
+
+
+def extend_table(
+    table: CompiledTasks,
+    rows: Dict[int, int],
+    tasks: List[Task],
+    task_map: Dict[int, Task],
+    anchored_ends: Dict[int, int],
+) -> None:
+    # Append rows for `tasks`, which may depend on tasks already in the table.
+    # rows maps the ids in the table to their rows and is updated in place.
+    first_row = len(table.tasks)
+    table.tasks.extend(tasks)
+    rows.update((task.id, row) for row, task in enumerate(tasks, first_row))
+
+    for row, task in enumerate(tasks, first_row):
+        table.earliest.append(
+            time_to_ticks(task.earliest_start_time)
+            if task.earliest_start_time
+            else None
+        )
+        latest = time_to_ticks(task.latest_end_time) if task.latest_end_time else None
+        table.latest.append(latest)
+        table.duration.append(task.duration_minutes * TICKS_PER_MINUTE)
+        # Ties are broken by the task's position in the input list. No deadline
+        # sorts like midnight, as datetime.min.time() did.
+        table.keys.append(
+            (task.flexible, task.priority, latest or 0, -task.duration_minutes, row)
+        )
+        table.release.append(
+            task.scheduled_date.toordinal() if task.scheduled_date else None
+        )
+
+        depends_on = []
+        unmet = 0
+        anchor = None
+        for dep_id in set(task.depends_on):
+            if dep_id in anchored_ends:
+                if anchor is None or anchored_ends[dep_id] > anchor:
+                    anchor = anchored_ends[dep_id]
+                continue
+            dep_task = task_map.get(dep_id)
+            if not dep_task:
+                # Unknown ids, which include archived tasks, count as done
+                continue
+            dep_row = rows.get(dep_id)
+            if dep_row is not None:
+                depends_on.append(dep_row)
+            if dep_task.is_completed:
+                continue
+            unmet += 1
+            if dep_row is not None:
+                table.dependents.setdefault(dep_row, []).append(row)
+        table.depends_on.append(tuple(depends_on))
+        table.unmet.append(unmet)
+        table.anchor.append(anchor)
+
+
+def compile_events(events: Iterable[Event], day: date) -> List[TickRange]:
+    # Ranges of the day's events, in start order
+    todays_events = sorted(
+        (event for event in events if event.start.date() == day),
+        key=lambda e: e.start,
+    )
+    return [(to_ticks(e.start, day), to_ticks(e.end, day)) for e in todays_events]
@@ -0,0 +1,190 @@
+import random
+from typing import Any, Iterable, Iterator, List, Optional, Protocol, Tuple
+
+Interval = Tuple[Any, Any]
+
+
+class FreeTime(Protocol):
+    # What the placement loop needs from a free-time store
+    def max_length(self):
+        ...
+
+    def candidates(self, earliest, min_length) -> Iterator[Interval]:
+        ...
+
+    def split(self, interval: Interval, cut_start, cut_end) -> None:
+        ...
+
+
+class _Node:
+    __slots__ = ("start", "end", "length", "max_length", "priority", "left", "right")
+
+    def __init__(self, start, end, priority: float):
+        self.start = start
+        self.end = end
+        self.length = end - start
+        self.max_length = self.length
+        self.priority = priority
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+
+    def update(self) -> None:
+        max_length = self.length
+        if self.left is not None and self.left.max_length > max_length:
+            max_length = self.left.max_length
+        if self.right is not None and self.right.max_length > max_length:
+            max_length = self.right.max_length
+        self.max_length = max_length
+
+
+class FreeTimeIndex:
+    # Disjoint free intervals kept in a treap ordered by start time. Every node
+    # also tracks the longest gap in its subtree, so "earliest gap after T that
+    # is at least this long" is answered with a single O(log n) descent.
+    # Works with datetimes/timedeltas as well as plain integers.
+
+    def __init__(self, intervals: Iterable[Interval] = (), seed: int = 0):
+        self._random = random.Random(seed)
+        self._root: Optional[_Node] = None
+        self._size = 0
+        for start, end in intervals:
+            self.add(start, end)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Interval]:
+        stack: List[_Node] = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.start, node.end
+            node = node.right
+
+    def max_length(self):
+        return self._root.max_length if self._root is not None else None
+
+    def add(self, start, end) -> None:
+        # Empty intervals can never hold a block, so they are not stored
+        if not start < end:
+            return
+        left, right = _split(self._root, start)
+        node = _Node(start, end, self._random.random())
+        self._root = _merge(_merge(left, node), right)
+        self._size += 1
+
+    def remove(self, start) -> None:
+        self._root = _delete(self._root, start)
+        self._size -= 1
+
+    def split(self, interval: Interval, cut_start, cut_end) -> None:
+        # Replace an interval with the parts left over around [cut_start, cut_end)
+        free_start, free_end = interval
+        self.remove(free_start)
+        if free_start < cut_start:
+            self.add(free_start, cut_start)
+        if cut_end < free_end:
+            self.add(cut_end, free_end)
+
+    def floor(self, point) -> Optional[Interval]:
+        # Interval with the greatest start that is <= point
+        found = None
+        node = self._root
+        while node is not None:
+            if node.start <= point:
+                found = node
+                node = node.right
+            else:
+                node = node.left
+        return (found.start, found.end) if found is not None else None
+
+    def first_fit(self, after, min_length=None) -> Optional[Interval]:
+        # Earliest interval starting strictly after `after` that is at least min_length long
+        node = _first_fit(self._root, after, min_length)
+        return (node.start, node.end) if node is not None else None
+
+    def candidates(self, earliest, min_length) -> Iterator[Interval]:
+        # Intervals, in start order, that may hold min_length of free time at or after
+        # `earliest`. The interval containing `earliest` is yielded even if its
+        # remaining part is too short; callers clip and check it themselves.
+        interval = self.floor(earliest)
+        if interval is not None and interval[1] > earliest:
+            yield interval
+        after = earliest
+        while True:
+            interval = self.first_fit(after, min_length)
+            if interval is None:
+                return
+            yield interval
+            after = interval[0]
+
+    def overlapping(self, start, end) -> List[Interval]:
+        # Intervals that share any time with the open range (start, end)
+        found = []
+        interval = self.floor(start)
+        if interval is not None and interval[0] < end and interval[1] > start:
+            found.append(interval)
+        interval = self.first_fit(start)
+        while interval is not None and interval[0] < end:
+            found.append(interval)
+            interval = self.first_fit(interval[0])
+        return found
+
+
+def _split(node: Optional[_Node], key) -> Tuple[Optional[_Node], Optional[_Node]]:
+    # Split into nodes starting before key and nodes starting at or after key
+    if node is None:
+        return None, None
+    if node.start < key:
+        left, right = _split(node.right, key)
+        node.right = left
+        node.update()
+        return node, right
+    left, right = _split(node.left, key)
+    node.left = right
+    node.update()
+    return left, node
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.update()
+        return left
+    right.left = _merge(left, right.left)
+    right.update()
+    return right
+
+
+def _delete(node: Optional[_Node], key) -> Optional[_Node]:
+    if node is None:
+        raise KeyError(key)
+    if key < node.start:
+        node.left = _delete(node.left, key)
+    elif node.start < key:
+        node.right = _delete(node.right, key)
+    else:
+        return _merge(node.left, node.right)
+    node.update()
+    return node
+
+
+def _first_fit(node: Optional[_Node], after, min_length) -> Optional[_Node]:
+    if node is None:
+        return None
+    if min_length is not None and node.max_length < min_length:
+        return None
+    if node.start > after:
+        found = _first_fit(node.left, after, min_length)
+        if found is not None:
+            return found
+        if min_length is None or node.length >= min_length:
+            return node
+    return _first_fit(node.right, after, min_length)
@@ -0,0 +1,415 @@
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from taskboard.core.compiled import (
+    TICKS_PER_MINUTE,
+    CompiledTasks,
+    TickRange,
+    compile_events,
+    compile_tasks,
+    extend_table,
+    from_ticks,
+    to_ticks,
+)
+from taskboard.core.scheduler import (
+    ENGINES,
+    _build_free_time,
+    _handle_active_task,
+    _schedule_rows,
+    _to_blocks,
+)
+from taskboard.core.timeline import BlockIndex, ScheduledBlock
+from taskboard.models.event import Event
+from taskboard.models.task import Task
+
+
+@dataclass
+class ChangeSet:
+    # What happened to the board since a plan was made, by task id
+    added_tasks: List[int] = field(default_factory=list)  # new on the board
+    started_tasks: List[int] = field(default_factory=list)
+    stopped_tasks: List[int] = field(default_factory=list)  # stopped or completed
+    added_events: List[Event] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.added_tasks
+            or self.started_tasks
+            or self.stopped_tasks
+            or self.added_events
+        )
+
+
+@dataclass
+class Plan:
+    day_start: datetime  # as requested, before the active task pushes it back
+    day_end: datetime
+    buffer_minutes: int
+    engine: str
+    blocks: List[ScheduledBlock]
+    unscheduled: List[Task]
+    # Tick free time starts at after the active task, and where every other task
+    # was placed
+    start: int
+    placements: Dict[int, TickRange]
+    # Today's tasks and the active one, compiled once without anchors so that
+    # re-plans only patch the rows that changed
+    table: CompiledTasks = field(repr=False)
+    rows: Dict[int, int] = field(repr=False)
+    active_row: Optional[int] = None
+    completed_rows: FrozenSet[int] = frozenset()
+    # Ids the table's tasks depend on, to spot new tasks that others wait for
+    referenced_ids: FrozenSet[int] = field(default=frozenset(), repr=False)
+
+
+def plan_schedule(
+    tasks: List[Task],
+    events: List[Event],
+    day_start: datetime,
+    day_end: datetime,
+    buffer_minutes: int = 0,
+    engine: str = "interval",
+) -> Plan:
+    # Same schedule as generate_schedule, kept in a form reschedule can build on
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown scheduling engine: {engine!r}")
+
+    today = day_start.date()
+    active = next((t for t in tasks if t.active_session_start is not None), None)
+    pool = [t for t in tasks if t is active or _is_today(t, today)]
+    rows = {task.id: row for row, task in enumerate(pool)}
+
+    plan = Plan(
+        day_start,
+        day_end,
+        buffer_minutes,
+        engine,
+        [],
+        [],
+        0,
+        {},
+        compile_tasks(pool, {t.id: t for t in tasks}, {}),
+        rows,
+        rows[active.id] if active else None,
+        referenced_ids=frozenset(dep_id for t in pool for dep_id in t.depends_on),
+    )
+    return _place(plan, events, {}, None)
+
+
+def reschedule(
+    plan: Plan, tasks: List[Task], events: List[Event], changes: ChangeSet
+) -> Plan:
+    # Re-plan after `changes`, given the board with the changes applied. Blocks
+    # that end before the earliest time the changes can affect are kept as they
+    # are and only the rest of the day is planned again.
+    if not changes:
+        return plan
+
+    today = plan.day_start.date()
+    buffer = plan.buffer_minutes * TICKS_PER_MINUTE
+    changed_ids = (
+        set(changes.added_tasks)
+        | set(changes.started_tasks)
+        | set(changes.stopped_tasks)
+    )
+    changed = {t.id: t for t in tasks if t.id in changed_ids}
+
+    # Changes the compiled table cannot absorb: new tasks that others already
+    # waited on, and tasks that move in or out of today's table other than by
+    # being added, started, stopped or completed
+    for task_id, task in changed.items():
+        active = task.active_session_start is not None
+        if task_id in plan.rows:
+            absorbed = active or task.is_completed or _is_today(task, today)
+        else:
+            absorbed = (
+                task_id in changes.added_tasks
+                and task_id not in plan.referenced_ids
+                and not active
+            )
+        if not absorbed:
+            return plan_schedule(
+                tasks,
+                events,
+                plan.day_start,
+                plan.day_end,
+                plan.buffer_minutes,
+                plan.engine,
+            )
+
+    previous = plan
+    plan = _apply_changes(plan, tasks, changed, today)
+    start, _, _ = _start_after_active(plan)
+    cutoff = _earliest_affected(previous, plan, changes, changed, start, buffer)
+
+    kept = {
+        task_id: (block_start, block_end)
+        for task_id, (block_start, block_end) in plan.placements.items()
+        if start <= block_start < cutoff
+        and block_end + buffer <= cutoff
+        and task_id not in changed
+    }
+    # A block the cutoff runs through is planned again from its old start
+    replan_from = cutoff
+    for block_start, block_end in plan.placements.values():
+        if start <= block_start < cutoff < block_end + buffer:
+            replan_from = block_start
+
+    return _place(plan, events, kept, replan_from)
+
+
+def advance(plan: Plan, events: List[Event], day_start: datetime) -> Optional[Plan]:
+    # The plan from a later day_start, as the clock moves on. Taking away time
+    # no task was placed in leaves every block where it is, so this is only the
+    # active task's block catching up with the clock. None when the day has to
+    # be planned again: a block starts before the new start, or the start passed
+    # the end of an event whose buffer no longer applies.
+    moved = replace(plan, day_start=max(plan.day_start, day_start))
+    start, active_blocks, _ = _start_after_active(moved)
+    if any(block_start < start for block_start, _ in plan.placements.values()):
+        return None
+    if plan.buffer_minutes and any(
+        plan.start < event_end <= start
+        for _, event_end in compile_events(events, plan.day_start.date())
+    ):
+        return None
+    active_ids = {block.id for block in active_blocks}
+    blocks = [b for b in plan.blocks if b.id not in active_ids] + active_blocks
+    blocks.sort(key=lambda block: block.start_time)
+    return replace(moved, blocks=blocks, start=start)
+
+
+def _apply_changes(
+    plan: Plan, tasks: List[Task], changed: Dict[int, Task], today: date
+) -> Plan:
+    # Copy of the plan with the changed tasks swapped into its table
+    table = replace(plan.table, tasks=plan.table.tasks.copy())
+    rows = plan.rows
+    active_row = plan.active_row
+    completed_rows = set(plan.completed_rows)
+
+    added = [
+        task
+        for task_id, task in changed.items()
+        if task_id not in rows and _is_today(task, today)
+    ]
+    if added:
+        table = replace(
+            table,
+            earliest=table.earliest.copy(),
+            latest=table.latest.copy(),
+            duration=table.duration.copy(),
+            keys=table.keys.copy(),
+            release=table.release.copy(),
+            depends_on=table.depends_on.copy(),
+            unmet=table.unmet.copy(),
+            dependents=table.dependents.copy(),
+            anchor=table.anchor.copy(),
+        )
+        rows = rows.copy()
+        # Lists of dependents the new rows are appended to are shared with the
+        # previous plan
+        for task in added:
+            for dep_id in task.depends_on:
+                dep_row = rows.get(dep_id)
+                if dep_row in table.dependents:
+                    table.dependents[dep_row] = table.dependents[dep_row].copy()
+        extend_table(table, rows, added, {t.id: t for t in tasks}, {})
+
+    for task_id, task in changed.items():
+        row = rows.get(task_id)
+        if row is None:
+            continue
+        table.tasks[row] = task
+        if task.active_session_start is not None:
+            active_row = row
+        elif row == active_row:
+            active_row = None
+        if task.is_completed:
+            completed_rows.add(row)
+
+    return replace(
+        plan,
+        table=table,
+        rows=rows,
+        active_row=active_row,
+        completed_rows=frozenset(completed_rows),
+        referenced_ids=plan.referenced_ids.union(
+            dep_id for task in added for dep_id in task.depends_on
+        ),
+    )
+
+
+def _start_after_active(
+    plan: Plan,
+) -> Tuple[int, List[ScheduledBlock], Dict[int, int]]:
+    # Tick free time starts at, the active task's block and the tick it ends at
+    # by row
+    today = plan.day_start.date()
+    active = [] if plan.active_row is None else [plan.table.tasks[plan.active_row]]
+    blocks: List[ScheduledBlock] = []
+    blocks_map: Dict[int, ScheduledBlock] = {}
+    day_start = _handle_active_task(
+        active,
+        blocks,
+        blocks_map,
+        set(),
+        active.copy(),
+        plan.day_start,
+        plan.buffer_minutes,
+    )
+    ends = {
+        plan.rows[task_id]: to_ticks(block.end_time, today)
+        for task_id, block in blocks_map.items()
+    }
+    return to_ticks(day_start, today), blocks, ends
+
+
+def _place(
+    plan: Plan,
+    events: List[Event],
+    kept: Dict[int, TickRange],
+    replan_from: Optional[int],
+) -> Plan:
+    today = plan.day_start.date()
+    table = plan.table
+    buffer = plan.buffer_minutes * TICKS_PER_MINUTE
+    start, scheduled_blocks, placed_ends = _start_after_active(plan)
+    place_from = start if replan_from is None else replan_from
+
+    for task_id, (block_start, block_end) in kept.items():
+        row = plan.rows[task_id]
+        placed_ends[row] = block_end
+        scheduled_blocks.append(
+            ScheduledBlock(
+                id=task_id,
+                title=table.tasks[row].title,
+                start_time=from_ticks(block_start, today),
+                end_time=from_ticks(block_end, today),
+            )
+        )
+
+    # Placed and completed tasks unblock their dependents, the way compile_tasks
+    # treats the active task. Rows that are not to be placed get a negative count.
+    unmet_counts = table.unmet.copy()
+    anchors = table.anchor.copy()
+    for row, end in placed_ends.items():
+        unmet_counts[row] = -1
+        for dependent in table.dependents.get(row, ()):
+            unmet_counts[dependent] -= 1
+            if anchors[dependent] is None or end > anchors[dependent]:
+                anchors[dependent] = end
+    for row in plan.completed_rows:
+        unmet_counts[row] = -1
+        for dependent in table.dependents.get(row, ()):
+            unmet_counts[dependent] -= 1
+    table = replace(table, anchor=anchors)
+
+    free_time = _build_free_time(
+        table,
+        place_from,
+        to_ticks(plan.day_end, today),
+        compile_events(events, today),
+        buffer,
+        plan.engine,
+    )
+    block_index = BlockIndex(
+        (to_ticks(b.start_time, today), to_ticks(b.end_time, today))
+        for b in scheduled_blocks
+    )
+    placements, failed_rows = _schedule_rows(
+        table,
+        unmet_counts,
+        [row for row, unmet in enumerate(unmet_counts) if unmet == 0],
+        place_from,
+        free_time,
+        block_index,
+        buffer,
+    )
+    scheduled_blocks.extend(_to_blocks(table, placements, today))
+    scheduled_blocks.sort(key=lambda block: block.start_time)
+
+    # Rows that were never tried are still waiting on a dependency
+    unscheduled = [table.tasks[row] for row in failed_rows] + [
+        table.tasks[row] for row, unmet in enumerate(unmet_counts) if unmet > 0
+    ]
+
+    placed = dict(kept)
+    placed.update((table.tasks[row].id, (s, e)) for row, s, e in placements)
+    return replace(
+        plan,
+        blocks=scheduled_blocks,
+        unscheduled=unscheduled,
+        start=start,
+        placements=placed,
+    )
+
+
+def _earliest_affected(
+    previous: Plan,
+    plan: Plan,
+    changes: ChangeSet,
+    changed: Dict[int, Task],
+    start: int,
+    buffer: int,
+) -> int:
+    # Earliest tick at which the new plan may differ from the previous one
+    today = plan.day_start.date()
+    table = plan.table
+    affected = [to_ticks(plan.day_end, today)]
+
+    def earliest(row: int) -> int:
+        tick = table.earliest[row]
+        return start if tick is None else max(start, tick)
+
+    def waiting(row: int) -> bool:
+        return row != plan.active_row and row not in plan.completed_rows
+
+    # A stopped task frees up the time it was expected to take
+    if start < previous.start:
+        affected.append(start)
+
+    # Blocks the active task now runs into have to move
+    for task_id, (block_start, _) in plan.placements.items():
+        if block_start < start and task_id not in changed:
+            affected.append(start)
+            break
+
+    for task_id, task in changed.items():
+        row = plan.rows.get(task_id)
+        if row is None:
+            continue
+        placed = plan.placements.get(task_id)
+        if placed is not None and placed[1] + buffer > start:
+            # The task's old block is free again
+            affected.append(max(placed[0], start))
+
+        dependents = table.dependents.get(row, ())
+        if task.is_completed:
+            # Dependents no longer wait for it
+            affected.extend(earliest(d) for d in dependents if waiting(d))
+        elif task.active_session_start is not None:
+            # Dependents now wait for the active task, which ends before `start`
+            if placed is None or placed[1] > start:
+                affected.extend(earliest(d) for d in dependents if waiting(d))
+        else:
+            # New or returning task, which its dependents have to wait for again
+            affected.append(earliest(row))
+            for dependent in dependents:
+                dependent_placed = plan.placements.get(table.tasks[dependent].id)
+                if dependent_placed is not None:
+                    affected.append(max(dependent_placed[0], start))
+
+    for event in changes.added_events:
+        if event.start.date() == today:
+            affected.append(max(to_ticks(event.start, today) - buffer, start))
+
+    return min(affected)
+
+
+def _is_today(task: Task, today: date) -> bool:
+    # Whether generate_schedule would try to place the task today
+    return not task.is_completed and (
+        task.scheduled_date is None or task.scheduled_date <= today
+    )
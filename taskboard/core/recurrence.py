@@ -0,0 +1,276 @@
+import calendar
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterator, List, Optional, Tuple
+
+from taskboard.models.event import Event, external_event_id
+from taskboard.models.recurring_event import RecurringEvent
+
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+# The RRULE parts expand() follows. Rules with other parts (BYSETPOS, BYHOUR,
+# hourly frequencies, ...) are refused rather than expanded wrongly.
+PARTS = ("FREQ", "INTERVAL", "COUNT", "UNTIL", "BYDAY", "BYMONTHDAY", "BYMONTH", "WKST")
+
+
+@dataclass(frozen=True)
+class Rule:
+    freq: str
+    interval: int = 1
+    count: Optional[int] = None
+    # Last possible start, as wall time in the series' time zone
+    until: Optional[datetime] = None
+    # (ordinal, weekday): (0, 0) is every Monday, (-1, 4) the last Friday
+    by_day: Tuple[Tuple[int, int], ...] = ()
+    by_month_day: Tuple[int, ...] = ()
+    by_month: Tuple[int, ...] = ()
+    week_start: int = 0
+
+
+def zone_named(name: Optional[str]):
+    # The tzinfo for an IANA name; None (local time) for no name or one this
+    # system does not know, such as Windows zone names
+    if not name:
+        return None
+    if name.upper() in ("UTC", "Z"):
+        return timezone.utc
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def to_local(moment: datetime, zone) -> datetime:
+    # Wall time in `zone` as naive local time, which Events are stored in
+    if zone is None:
+        return moment
+    return moment.replace(tzinfo=zone).astimezone().replace(tzinfo=None)
+
+
+def _weekday(text: str) -> Tuple[int, int]:
+    match = re.fullmatch(rf"([+-]?[1-9][0-9]?)?({'|'.join(WEEKDAYS)})", text)
+    if match is None:
+        raise ValueError(f"Invalid RRULE weekday: {text!r}")
+    return int(match[1] or 0), WEEKDAYS.index(match[2])
+
+
+def _numbers(text: str, low: int, high: int) -> Tuple[int, ...]:
+    numbers = tuple(int(item) for item in text.split(","))
+    if not all(low <= abs(number) <= high for number in numbers):
+        raise ValueError(f"RRULE value out of range: {text!r}")
+    return numbers
+
+
+def _until(text: str, zone) -> datetime:
+    if len(text) == 8:
+        # A date: occurrences on that day still count
+        return datetime.combine(datetime.strptime(text, "%Y%m%d"), time.max)
+    moment = datetime.strptime(text.rstrip("Z"), "%Y%m%dT%H%M%S")
+    if not text.endswith("Z"):
+        return moment
+    moment = moment.replace(tzinfo=timezone.utc)
+    if zone is None:
+        return moment.astimezone().replace(tzinfo=None)
+    return moment.astimezone(zone).replace(tzinfo=None)
+
+
+def parse_rule(text: str, zone=None) -> Rule:
+    # An RRULE value; `zone` is the time zone of the series it belongs to, which
+    # a UTC UNTIL is converted into. Raises ValueError for rules expand()
+    # cannot follow.
+    parts = {}
+    for item in text.strip().split(";"):
+        if not item:
+            continue
+        name, sep, value = item.partition("=")
+        if not sep or not value:
+            raise ValueError(f"Malformed RRULE part: {item!r}")
+        parts[name.upper()] = value.upper()
+    unknown = sorted(set(parts) - set(PARTS))
+    if unknown:
+        raise ValueError(f"Unsupported RRULE parts: {', '.join(unknown)}")
+    freq = parts.get("FREQ")
+    if freq not in FREQUENCIES:
+        raise ValueError(f"Unsupported RRULE frequency: {freq!r}")
+
+    try:
+        rule = Rule(
+            freq=freq,
+            interval=int(parts.get("INTERVAL", "1")),
+            count=int(parts["COUNT"]) if "COUNT" in parts else None,
+            until=_until(parts["UNTIL"], zone) if "UNTIL" in parts else None,
+            by_day=tuple(
+                _weekday(day) for day in parts.get("BYDAY", "").split(",") if day
+            ),
+            by_month_day=_numbers(parts["BYMONTHDAY"], 1, 31)
+            if "BYMONTHDAY" in parts
+            else (),
+            by_month=_numbers(parts["BYMONTH"], 1, 12) if "BYMONTH" in parts else (),
+            week_start=WEEKDAYS.index(parts.get("WKST", "MO")),
+        )
+    except ValueError as error:
+        raise ValueError(f"Invalid RRULE {text!r}: {error}") from None
+    if rule.interval < 1 or rule.count is not None and rule.count < 1:
+        raise ValueError(f"Invalid RRULE {text!r}: INTERVAL and COUNT must be positive")
+    if any(month < 0 for month in rule.by_month):
+        raise ValueError(f"Invalid RRULE {text!r}: BYMONTH must be positive")
+    if freq in ("DAILY", "WEEKLY") and any(ordinal for ordinal, _ in rule.by_day):
+        raise ValueError(
+            f"Unsupported RRULE {text!r}: numbered BYDAY needs FREQ=MONTHLY or YEARLY"
+        )
+    if freq == "WEEKLY" and rule.by_month_day:
+        raise ValueError(
+            f"Unsupported RRULE {text!r}: BYMONTHDAY cannot be used with FREQ=WEEKLY"
+        )
+    if freq == "YEARLY" and (rule.by_day or rule.by_month_day) and not rule.by_month:
+        raise ValueError(
+            f"Unsupported RRULE {text!r}: yearly BYDAY or BYMONTHDAY needs BYMONTH"
+        )
+    return rule
+
+
+def _week_of(day: date, week_start: int) -> date:
+    return day - timedelta(days=(day.weekday() - week_start) % 7)
+
+
+def _periods_between(rule: Rule, first: date, day: date) -> int:
+    # Whole frequency periods (days, weeks, months or years) from the one
+    # holding `first` to the one holding `day`
+    if rule.freq == "DAILY":
+        return (day - first).days
+    if rule.freq == "WEEKLY":
+        return (
+            _week_of(day, rule.week_start) - _week_of(first, rule.week_start)
+        ).days // 7
+    if rule.freq == "MONTHLY":
+        return (day.year - first.year) * 12 + day.month - first.month
+    return day.year - first.year
+
+
+def _period_start(rule: Rule, first: date, periods: int) -> date:
+    if rule.freq == "DAILY":
+        return first + timedelta(days=periods)
+    if rule.freq == "WEEKLY":
+        return _week_of(first, rule.week_start) + timedelta(weeks=periods)
+    if rule.freq == "MONTHLY":
+        year, month = divmod(first.month - 1 + periods, 12)
+        return date(first.year + year, month + 1, 1)
+    return date(first.year + periods, 1, 1)
+
+
+def _month_days(rule: Rule, first: date, year: int, month: int) -> List[int]:
+    size = calendar.monthrange(year, month)[1]
+    month_days = [day if day > 0 else size + day + 1 for day in rule.by_month_day]
+    if not rule.by_day:
+        return sorted({day for day in month_days or [first.day] if 1 <= day <= size})
+
+    offset = calendar.monthrange(year, month)[0]
+    days = set()
+    for ordinal, weekday in rule.by_day:
+        matching = list(range(1 + (weekday - offset) % 7, size + 1, 7))
+        if not ordinal:
+            days.update(matching)
+        elif abs(ordinal) <= len(matching):
+            days.add(matching[ordinal - 1 if ordinal > 0 else ordinal])
+    if month_days:
+        days &= set(month_days)
+    return sorted(days)
+
+
+def _days(rule: Rule, first: date, period: date) -> List[date]:
+    # Days of the period that the rule picks, in order
+    if rule.freq == "DAILY":
+        weekdays = {weekday for _, weekday in rule.by_day}
+        size = calendar.monthrange(period.year, period.month)[1]
+        month_days = {day if day > 0 else size + day + 1 for day in rule.by_month_day}
+        if (
+            (not weekdays or period.weekday() in weekdays)
+            and (not month_days or period.day in month_days)
+            and (not rule.by_month or period.month in rule.by_month)
+        ):
+            return [period]
+        return []
+    if rule.freq == "WEEKLY":
+        weekdays = {weekday for _, weekday in rule.by_day} or {first.weekday()}
+        days = sorted(
+            period + timedelta(days=(weekday - rule.week_start) % 7)
+            for weekday in weekdays
+        )
+        return [day for day in days if not rule.by_month or day.month in rule.by_month]
+    if rule.freq == "MONTHLY":
+        if rule.by_month and period.month not in rule.by_month:
+            return []
+        return [
+            period.replace(day=day)
+            for day in _month_days(rule, first, period.year, period.month)
+        ]
+    return [
+        date(period.year, month, day)
+        for month in sorted(rule.by_month or (first.month,))
+        for day in _month_days(rule, first, period.year, month)
+    ]
+
+
+def expand(rule: Rule, first: datetime, start: date, end: date) -> Iterator[datetime]:
+    # Starts of the occurrences of a series beginning at `first` that fall on a
+    # day in [start, end], in order, generated one at a time. Periods before
+    # the window are skipped without being enumerated, unless the rule has a
+    # COUNT and they have to be counted.
+    index = 0
+    if rule.count is None:
+        index = max(0, _periods_between(rule, first.date(), start) // rule.interval)
+    counted = 0
+    while True:
+        period = _period_start(rule, first.date(), index * rule.interval)
+        if period > end or rule.until is not None and period > rule.until.date():
+            return
+        for day in _days(rule, first.date(), period):
+            moment = datetime.combine(day, first.time())
+            if moment < first:
+                continue
+            if rule.until is not None and moment > rule.until:
+                return
+            if rule.count is not None:
+                if counted == rule.count:
+                    return
+                counted += 1
+            if day > end:
+                return
+            if day >= start:
+                yield moment
+        index += 1
+
+
+def occurrence_id(uid: str, moment: datetime) -> str:
+    # The external id of one occurrence: the series' UID and its original start,
+    # as a RECURRENCE-ID would name it
+    return f"{uid}/{moment:%Y%m%dT%H%M%S}"
+
+
+def occurrences(series: RecurringEvent, start: date, end: date) -> Iterator[Event]:
+    # The series' occurrences starting on a local day in [start, end]
+    zone = zone_named(series.timezone)
+    rule = parse_rule(series.rule, zone)
+    duration = series.end - series.start
+    excluded = set(series.exdates)
+    # A day in another time zone can fall on either neighbouring local day
+    margin = timedelta(days=1 if zone is not None else 0)
+    for moment in expand(rule, series.start, start - margin, end + margin):
+        if moment in excluded:
+            continue
+        local_start = to_local(moment, zone)
+        if not start <= local_start.date() <= end:
+            continue
+        external_id = occurrence_id(series.uid, moment)
+        yield Event(
+            id=external_event_id(series.source, external_id),
+            title=series.title,
+            start=local_start,
+            end=to_local(moment + duration, zone),
+            description=series.description,
+            source=series.source,
+            external_id=external_id,
+        )
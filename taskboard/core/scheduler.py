@@ -1,11 +1,30 @@
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set, Tuple
-
-from taskboard.core.timeline import ScheduledBlock
+import heapq
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from taskboard.core.compiled import (
+    TICKS_PER_DAY,
+    TICKS_PER_MINUTE,
+    CompiledTasks,
+    TickRange,
+    compile_events,
+    compile_tasks,
+    from_ticks,
+    to_ticks,
+)
+from taskboard.core.free_time import FreeTime, FreeTimeIndex
+from taskboard.core.timeline import BlockIndex, ScheduledBlock
 from taskboard.models.event import Event
 from taskboard.models.task import Task
 
-FreeInterval = Tuple[datetime, datetime]
+# (row, start tick, end tick) of a placed task
+Placement = Tuple[int, int, int]
+
+# "interval" keeps free time in a FreeTimeIndex. "bitmap" uses a NumPy minute
+# occupancy array when numpy is installed and every boundary is minute aligned,
+# and falls back to the interval engine otherwise.
+ENGINES = ("interval", "bitmap")
 
 
 def generate_schedule(
@@ -14,9 +33,12 @@ def generate_schedule(
     day_start: datetime,
     day_end: datetime,
     buffer_minutes: int = 0,
+    engine: str = "interval",
 ) -> Tuple[List[ScheduledBlock], List[Task]]:
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown scheduling engine: {engine!r}")
+
     scheduled_blocks: List[ScheduledBlock] = []
-    unscheduled_tasks: List[Task] = []
 
     task_map = {t.id: t for t in tasks}
     scheduled_task_ids: Set[int] = set()
@@ -36,11 +58,6 @@ def generate_schedule(
         buffer_minutes,
     )
 
-    # Create free intervals for the day and block out events
-    free_intervals: List[FreeInterval] = [(day_start, day_end)]
-    buffer = timedelta(minutes=buffer_minutes)
-    free_intervals = _apply_event_blocking(free_intervals, events, today_date, buffer)
-
     # Filter incomplete tasks that are scheduled for today or have no scheduled date
     remaining_tasks = [
         t
@@ -49,48 +66,56 @@ def generate_schedule(
         and (t.scheduled_date is None or t.scheduled_date <= today_date)
     ]
 
-    # Main scheduling loop
-    while remaining_tasks:
-        # Get eligible tasks that are not blocked by dependencies
-        eligible_tasks = _get_eligible_tasks(
-            remaining_tasks, task_map, scheduled_task_ids
-        )
+    # Compile tasks, events and the day window into integer ticks
+    table = compile_tasks(
+        remaining_tasks,
+        task_map,
+        {
+            task_id: to_ticks(block.end_time, today_date)
+            for task_id, block in scheduled_blocks_map.items()
+        },
+    )
+    buffer = buffer_minutes * TICKS_PER_MINUTE
+    day_start_ticks = to_ticks(day_start, today_date)
 
-        if not eligible_tasks:
-            unscheduled_tasks.extend(remaining_tasks)
-            break
+    # Create free intervals for the day and block out events
+    free_time = _build_free_time(
+        table,
+        day_start_ticks,
+        to_ticks(day_end, today_date),
+        compile_events(events, today_date),
+        buffer,
+        engine,
+    )
 
-        # Sort eligible tasks by flexible, priority, latest_end_time, and duration
-        sorted_tasks = sorted(
-            eligible_tasks,
-            key=lambda t: (
-                t.flexible,
-                t.priority,
-                t.latest_end_time or datetime.min.time(),
-                -t.duration_minutes,
-            ),
-        )
+    # Index scheduled blocks by start time for buffer collision checks
+    block_index = BlockIndex(
+        (to_ticks(b.start_time, today_date), to_ticks(b.end_time, today_date))
+        for b in scheduled_blocks
+    )
 
-        # Try to place the highest priority eligible task
-        task = sorted_tasks[0]
-        placed_block = _try_place_task(
-            task,
-            free_intervals,
-            scheduled_blocks,
-            scheduled_blocks_map,
-            day_start,
-            buffer,
-        )
+    unmet_counts = table.unmet.copy()
+    placements, failed_rows = _schedule_rows(
+        table,
+        unmet_counts,
+        [row for row, unmet in enumerate(unmet_counts) if unmet == 0],
+        day_start_ticks,
+        free_time,
+        block_index,
+        buffer,
+    )
 
-        # If the task was placed, add it to the schedule and mark it as scheduled
-        if placed_block:
-            scheduled_blocks.append(placed_block)
-            scheduled_task_ids.add(task.id)
-            scheduled_blocks_map[task.id] = placed_block
-        else:
-            unscheduled_tasks.append(task)
+    # Convert placements back to datetimes
+    scheduled_blocks.extend(_to_blocks(table, placements, today_date))
 
-        remaining_tasks.remove(task)
+    # Tasks still blocked by dependencies cannot be scheduled
+    placed_rows = {row for row, _, _ in placements}
+    unscheduled_rows = set(failed_rows)
+    unscheduled_tasks = [table.tasks[row] for row in failed_rows] + [
+        task
+        for row, task in enumerate(table.tasks)
+        if row not in placed_rows and row not in unscheduled_rows
+    ]
 
     # Sort scheduled blocks by start time
     scheduled_blocks.sort(key=lambda block: block.start_time)
@@ -98,147 +123,435 @@ def generate_schedule(
     return scheduled_blocks, unscheduled_tasks
 
 
-def _get_eligible_tasks(
-    remaining_tasks: List[Task], task_map: Dict[int, Task], scheduled_task_ids: Set[int]
-) -> List[Task]:
-    eligible_tasks: List[Task] = []
+def generate_schedule_range(
+    tasks: List[Task],
+    events: List[Event],
+    start_date: date,
+    end_date: date,
+    day_window: Tuple[time, time],
+    buffer_minutes: int = 0,
+    first_day_start: Optional[datetime] = None,
+    engine: str = "interval",
+    workers: int = 1,
+) -> Tuple[Dict[date, List[ScheduledBlock]], List[Task]]:
+    # Plan every day from start_date to end_date inside day_window. Tasks join the
+    # pool on their scheduled_date and tasks that do not fit roll over to the next
+    # day. Returns the blocks per day and the tasks left over, in board order.
+    # With workers > 1, days that share no dependencies with other days are planned
+    # up front in a process pool; the result is identical to planning serially.
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown scheduling engine: {engine!r}")
+
+    window_start, window_end = day_window
+    task_map = {t.id: t for t in tasks}
+    active_blocks: List[ScheduledBlock] = []
+    scheduled_blocks_map: Dict[int, ScheduledBlock] = {}
+    remaining_tasks = tasks.copy()
+
+    # The active task only shifts the start of the first day
+    first_day_start = _handle_active_task(
+        tasks,
+        active_blocks,
+        scheduled_blocks_map,
+        set(),
+        remaining_tasks,
+        first_day_start or datetime.combine(start_date, window_start),
+        buffer_minutes,
+    )
 
-    for task in remaining_tasks:
-        deps = task.depends_on
-        blocked = False
-        for dep_id in deps:
-            dep_task = task_map.get(dep_id)
+    # One dependency graph for the whole horizon
+    table = compile_tasks(
+        [t for t in remaining_tasks if not t.is_completed],
+        task_map,
+        {
+            task_id: to_ticks(block.end_time, start_date)
+            for task_id, block in scheduled_blocks_map.items()
+        },
+    )
+    unmet_counts = table.unmet.copy()
+    buffer = buffer_minutes * TICKS_PER_MINUTE
+
+    # Partition events by date and tasks by the day they join the pool, once
+    events_by_day: Dict[date, List[Event]] = defaultdict(list)
+    for event in events:
+        events_by_day[event.start.date()].append(event)
+    first_ordinal = start_date.toordinal()
+    row_days = [
+        max(release or first_ordinal, first_ordinal) for release in table.release
+    ]
+    released_on: Dict[int, List[int]] = defaultdict(list)
+    for row, ordinal in enumerate(row_days):
+        released_on[ordinal].append(row)
+
+    days: List[date] = []
+    day_inputs: Dict[date, _DayInput] = {}
+    for offset in range((end_date - start_date).days + 1):
+        day = start_date + timedelta(days=offset)
+        day_start = (
+            first_day_start if offset == 0 else datetime.combine(day, window_start)
+        )
+        days.append(day)
+        day_inputs[day] = (
+            to_ticks(day_start, day),
+            to_ticks(datetime.combine(day, window_end), day),
+            compile_events(events_by_day.get(day, ()), day),
+            [
+                (to_ticks(b.start_time, day), to_ticks(b.end_time, day))
+                for b in (active_blocks if offset == 0 else ())
+            ],
+            offset * TICKS_PER_DAY,
+        )
 
-            if not dep_task:
-                continue
+    speculative: Dict[date, Tuple[List[Placement], List[int]]] = {}
+    if workers > 1:
+        speculative = _plan_independent_days(
+            table, row_days, released_on, days, day_inputs, buffer, engine, workers
+        )
 
-            if not dep_task.is_completed and dep_id not in scheduled_task_ids:
-                blocked = True
-                break
+    plan: Dict[date, List[ScheduledBlock]] = {}
+    placed_rows: Set[int] = set()
+    carried_rows: List[int] = []
+    for day in days:
+        if not carried_rows and day in speculative:
+            # Nothing rolled over into this day, so the pool's plan stands
+            placements, carried_rows = speculative[day]
+            for row, _, _ in placements:
+                for dependent in table.dependents.get(row, ()):
+                    unmet_counts[dependent] -= 1
+        else:
+            # Yesterday's overflow plus the tasks that become available today
+            ready_rows = carried_rows + [
+                row
+                for row in released_on.get(day.toordinal(), ())
+                if unmet_counts[row] == 0
+            ]
+            placements, carried_rows = _plan_day(
+                table,
+                unmet_counts,
+                ready_rows,
+                day_inputs[day],
+                buffer,
+                engine,
+                day.toordinal(),
+            )
+        placed_rows.update(row for row, _, _ in placements)
 
-        if not blocked:
-            eligible_tasks.append(task)
-    return eligible_tasks
+        plan[day] = sorted(
+            (active_blocks if day == start_date else [])
+            + _to_blocks(table, placements, day),
+            key=lambda block: block.start_time,
+        )
 
+    last_ordinal = end_date.toordinal()
+    unscheduled_tasks = [
+        task
+        for row, task in enumerate(table.tasks)
+        if row not in placed_rows
+        and (table.release[row] is None or table.release[row] <= last_ordinal)
+    ]
+    return plan, unscheduled_tasks
+
+
+# Day start, day end, event ranges, already placed blocks and the offset that
+# rebases the table's anchors onto the day, all in ticks of that day
+_DayInput = Tuple[int, int, List[TickRange], List[TickRange], int]
+
+
+def _plan_day(
+    table: CompiledTasks,
+    unmet_counts: List[int],
+    ready_rows: Iterable[int],
+    day_input: _DayInput,
+    buffer: int,
+    engine: str,
+    release_limit: Optional[int],
+) -> Tuple[List[Placement], List[int]]:
+    day_start, day_end, event_ranges, block_ranges, anchor_offset = day_input
+    free_time = _build_free_time(
+        table, day_start, day_end, event_ranges, buffer, engine
+    )
+    return _schedule_rows(
+        table,
+        unmet_counts,
+        ready_rows,
+        day_start,
+        free_time,
+        BlockIndex(block_ranges),
+        buffer,
+        release_limit=release_limit,
+        anchor_offset=anchor_offset,
+    )
 
-def _apply_event_blocking(
-    free_intervals: List[FreeInterval],
-    events: List[Event],
-    today_date,
-    buffer: timedelta,
-) -> List[FreeInterval]:
-    # Block events and update free intervals
-    events_sorted = sorted(events, key=lambda e: e.start)
-    for event in events_sorted:
-        if event.start.date() != today_date:
+
+def _plan_independent_days(
+    table: CompiledTasks,
+    row_days: List[int],
+    released_on: Dict[int, List[int]],
+    days: List[date],
+    day_inputs: Dict[date, _DayInput],
+    buffer: int,
+    engine: str,
+    workers: int,
+) -> Dict[date, Tuple[List[Placement], List[int]]]:
+    # A day is independent when none of the tasks joining on it depend on, or are
+    # depended on by, tasks joining on another day. Such a day can be planned
+    # from its own tasks alone, as long as nothing rolls over into it; the caller
+    # checks that while merging in day order.
+    linked_days: Set[int] = set()
+    first_ordinal = days[0].toordinal()
+    for row, dep_rows in enumerate(table.depends_on):
+        for dep_row in dep_rows:
+            if row_days[dep_row] != row_days[row]:
+                linked_days.update((row_days[row], row_days[dep_row]))
+        if table.anchor[row] is not None and row_days[row] != first_ordinal:
+            linked_days.add(row_days[row])
+
+    jobs = {}
+    for day in days:
+        rows = released_on.get(day.toordinal())
+        if rows and day.toordinal() not in linked_days:
+            jobs[day] = (_subtable(table, rows), day_inputs[day], buffer, engine)
+    if len(jobs) < 2:
+        return {}
+
+    try:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = dict(zip(jobs, pool.map(_plan_day_job, jobs.values())))
+    except (OSError, NotImplementedError, RuntimeError):
+        # No usable process pool here; plan every day serially instead
+        return {}
+
+    # Map rows of each sub-table back to rows of the full table
+    speculative = {}
+    for day, (placements, failed_rows) in results.items():
+        rows = released_on[day.toordinal()]
+        speculative[day] = (
+            [(rows[row], start, end) for row, start, end in placements],
+            [rows[row] for row in failed_rows],
+        )
+    return speculative
+
+
+def _subtable(table: CompiledTasks, rows: List[int]) -> CompiledTasks:
+    # Compact, picklable copy of some rows without the Task objects. Rows must not
+    # depend on rows outside the selection.
+    local = {row: index for index, row in enumerate(rows)}
+    subtable = CompiledTasks([])
+    for index, row in enumerate(rows):
+        subtable.earliest.append(table.earliest[row])
+        subtable.latest.append(table.latest[row])
+        subtable.duration.append(table.duration[row])
+        subtable.keys.append(table.keys[row][:-1] + (index,))
+        subtable.release.append(None)
+        subtable.depends_on.append(tuple(local[dep] for dep in table.depends_on[row]))
+        subtable.unmet.append(table.unmet[row])
+        subtable.anchor.append(table.anchor[row])
+        dependents = table.dependents.get(row)
+        if dependents:
+            subtable.dependents[index] = [local[dep] for dep in dependents]
+    return subtable
+
+
+def _plan_day_job(job) -> Tuple[List[Placement], List[int]]:
+    # Runs in a worker process
+    table, day_input, buffer, engine = job
+    unmet_counts = table.unmet.copy()
+    ready_rows = [row for row, unmet in enumerate(unmet_counts) if unmet == 0]
+    return _plan_day(table, unmet_counts, ready_rows, day_input, buffer, engine, None)
+
+
+def _build_free_time(
+    table: CompiledTasks,
+    day_start: int,
+    day_end: int,
+    event_ranges: List[TickRange],
+    buffer: int,
+    engine: str,
+) -> FreeTime:
+    free_time: FreeTime = _apply_event_blocking(
+        day_start, day_end, event_ranges, buffer
+    )
+    if engine == "bitmap":
+        # Imported lazily so numpy is only loaded when asked for
+        from taskboard.core.bitmap_engine import build_bitmap
+
+        bitmap = build_bitmap(list(free_time), table, day_start, buffer)
+        if bitmap is not None:
+            free_time = bitmap
+    return free_time
+
+
+def _to_blocks(
+    table: CompiledTasks, placements: List[Placement], day: date
+) -> List[ScheduledBlock]:
+    blocks: List[ScheduledBlock] = []
+    for row, start, end in placements:
+        task = table.tasks[row]
+        blocks.append(
+            ScheduledBlock(
+                id=task.id,
+                title=task.title,
+                start_time=from_ticks(start, day),
+                end_time=from_ticks(end, day),
+            )
+        )
+    return blocks
+
+
+def _schedule_rows(
+    table: CompiledTasks,
+    unmet_counts: List[int],
+    ready_rows: Iterable[int],
+    day_start: int,
+    free_time: FreeTime,
+    block_index: BlockIndex,
+    buffer: int,
+    release_limit: Optional[int] = None,
+    anchor_offset: int = 0,
+) -> Tuple[List[Placement], List[int]]:
+    # Place rows in priority order, unlocking dependents as their dependencies are
+    # placed. Dependents released after release_limit (a date ordinal) are left
+    # for a later day, and anchor_offset rebases the table's anchors onto that
+    # day. Returns the placements and the rows that did not fit.
+    placements: List[Placement] = []
+    failed_rows: List[int] = []
+    end_ticks: Dict[int, int] = {}
+    shortest = min(table.duration, default=0)
+
+    # Eligible tasks ordered by flexible, priority, latest_end_time, and duration
+    eligible_heap = [table.keys[row] for row in ready_rows]
+    heapq.heapify(eligible_heap)
+
+    while eligible_heap:
+        # Try to place the highest priority eligible task
+        row = heapq.heappop(eligible_heap)[-1]
+        placed = _try_place_task(
+            table,
+            row,
+            free_time,
+            block_index,
+            end_ticks,
+            day_start,
+            buffer,
+            anchor_offset,
+        )
+        if placed is None:
+            failed_rows.append(row)
             continue
 
-        new_intervals = []
-        for free_start, free_end in free_intervals:
-            # No overlap
-            if event.end <= free_start or event.start >= free_end:
-                new_intervals.append((free_start, free_end))
-                continue
+        start, end = placed
+        placements.append((row, start, end))
+        block_index.add(start, end)
+        end_ticks[row] = end
+
+        for dependent in table.dependents.get(row, ()):
+            unmet_counts[dependent] -= 1
+            release = table.release[dependent]
+            if unmet_counts[dependent] == 0 and (
+                release_limit is None or release is None or release <= release_limit
+            ):
+                heapq.heappush(eligible_heap, table.keys[dependent])
+
+        # Once no gap fits even the shortest task, every task left fails in turn
+        # and releases nothing, so fail them in heap order without trying each
+        longest_gap = free_time.max_length()
+        if longest_gap is None or longest_gap < shortest:
+            failed_rows.extend(key[-1] for key in sorted(eligible_heap))
+            break
 
-            # Before event
-            buffered_start = event.start - buffer
-            if free_start < buffered_start:
-                new_intervals.append((free_start, buffered_start))
+    return placements, failed_rows
 
-            # After event
-            buffered_end = event.end + buffer
-            if buffered_end < free_end:
-                new_intervals.append((buffered_end, free_end))
 
-        free_intervals = sorted(new_intervals, key=lambda x: x[0])
-    return free_intervals
+def _apply_event_blocking(
+    day_start: int,
+    day_end: int,
+    event_ranges: List[TickRange],
+    buffer: int,
+) -> FreeTimeIndex:
+    # Sweep events in start order. Everything before the last event's buffered start
+    # is final, so only the trailing free interval can still be cut by later events.
+    free_intervals: List[TickRange] = []
+    free_start, free_end = day_start, day_end
+    for event_start, event_end in event_ranges:
+        if event_start >= free_end:
+            break
 
+        # An event that ended before the free interval does not push it back
+        if event_end <= free_start:
+            continue
 
-def _try_place_task(
-    task: Task,
-    free_intervals: List[FreeInterval],
-    scheduled_blocks: List[ScheduledBlock],
-    scheduled_blocks_map: Dict[int, ScheduledBlock],
-    day_start: datetime,
-    buffer: timedelta,
-) -> Optional[ScheduledBlock]:
-    duration = timedelta(minutes=task.duration_minutes)
-
-    effective_task_start = (
-        datetime.combine(day_start.date(), task.earliest_start_time)
-        if task.earliest_start_time
-        else day_start
-    )
-    for dep_id in task.depends_on:
-        if dep_id in scheduled_blocks_map:
-            dep_block = scheduled_blocks_map[dep_id]
-            effective_task_start = max(effective_task_start, dep_block.end_time)
+        # Before event
+        buffered_start = event_start - buffer
+        if free_start < buffered_start:
+            free_intervals.append((free_start, buffered_start))
 
-    for i, (free_start, free_end) in enumerate(free_intervals):
-        window_start = free_start
-        window_end = free_end
+        # After event
+        free_start = event_end + buffer
+        if free_start >= free_end:
+            break
 
-        if effective_task_start:
-            window_start = max(
-                free_start,
-                effective_task_start,
-            )
-        if task.latest_end_time:
-            window_end = min(
-                free_end,
-                datetime.combine(day_start.date(), task.latest_end_time),
-            )
+    if free_start < free_end:
+        free_intervals.append((free_start, free_end))
 
-        if window_end <= window_start:
-            continue
+    return FreeTimeIndex(free_intervals)
 
-        if window_end - window_start >= duration:
-            start_time = window_start
-            end_time = start_time + duration
-
-            # Ensure end_time + buffer does not go into another scheduled block
-            task_placable = True
-            if buffer > timedelta(0):
-                for block in scheduled_blocks:
-                    if (
-                        block.start_time < end_time + buffer
-                        and block.end_time > end_time
-                    ):
-                        task_placable = False
-                        break
-
-            if not task_placable:
-                continue
-
-            placed_block = ScheduledBlock(
-                id=task.id,
-                title=task.title,
-                start_time=start_time,
-                end_time=end_time,
-            )
 
-            # Update free intervals
-            new_intervals = []
+def _try_place_task(
+    table: CompiledTasks,
+    row: int,
+    free_time: FreeTime,
+    block_index: BlockIndex,
+    end_ticks: Dict[int, int],
+    day_start: int,
+    buffer: int,
+    anchor_offset: int = 0,
+) -> Optional[TickRange]:
+    duration = table.duration[row]
+
+    effective_task_start = table.earliest[row]
+    if effective_task_start is None:
+        effective_task_start = day_start
+    anchor = table.anchor[row]
+    if anchor is not None and anchor - anchor_offset > effective_task_start:
+        effective_task_start = anchor - anchor_offset
+    for dep_row in table.depends_on[row]:
+        dep_end = end_ticks.get(dep_row)
+        if dep_end is not None and dep_end > effective_task_start:
+            effective_task_start = dep_end
+
+    latest_end = table.latest[row]
+
+    # Nothing can fit if no gap in the day is long enough
+    longest_gap = free_time.max_length()
+    if longest_gap is None or longest_gap < duration:
+        return None
+
+    for free_start, free_end in free_time.candidates(effective_task_start, duration):
+        window_start = max(free_start, effective_task_start)
+        window_end = free_end
 
-            # Before block
-            if free_start < start_time:
-                new_intervals.append((free_start, start_time))
+        if latest_end is not None:
+            # Later gaps start even later, so none of them can meet the deadline
+            if latest_end <= window_start or latest_end - window_start < duration:
+                break
+            window_end = min(free_end, latest_end)
 
-            # Buffer interval
-            buffered_end = end_time + buffer
+        if window_end <= window_start or window_end - window_start < duration:
+            continue
 
-            # After block
-            if buffered_end < free_end:
-                new_intervals.append((buffered_end, free_end))
+        start_time = window_start
+        end_time = start_time + duration
 
-            # Replace the current free interval with the new ones
-            free_intervals.pop(i)
-            free_intervals.extend(new_intervals)
+        # Ensure end_time + buffer does not go into another scheduled block
+        if buffer > 0 and block_index.collides(end_time, end_time + buffer):
+            continue
 
-            # Keep intervals sorted
-            free_intervals.sort(key=lambda x: x[0])
+        # Split the free interval around the block and its trailing buffer
+        free_time.split((free_start, free_end), start_time, end_time + buffer)
 
-            return placed_block
+        return start_time, end_time
 
     return None
 
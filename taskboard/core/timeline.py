@@ -1,10 +1,67 @@
+from bisect import bisect_left, insort
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Any, Iterable, List, Tuple
 
+from taskboard.models.event import Event
+from taskboard.models.slots import SLOTS
 
-@dataclass
+
+@dataclass(**SLOTS)
 class ScheduledBlock:
     id: int
     title: str
     start_time: datetime
     end_time: datetime
+
+
+def event_blocks(events: Iterable[Event], now: datetime) -> List[ScheduledBlock]:
+    blocks = []
+    for e in events:
+        title = f"[EVENT] {e.title}"
+
+        if e.start <= now <= e.end:
+            title = f"[EVENT - ONGOING] {e.title}"
+
+        blocks.append(
+            ScheduledBlock(
+                id=e.id,
+                title=title,
+                start_time=e.start,
+                end_time=e.end,
+            )
+        )
+    return blocks
+
+
+def block_minutes(block: ScheduledBlock) -> float:
+    return (block.end_time - block.start_time).total_seconds() / 60
+
+
+def format_block(block: ScheduledBlock) -> str:
+    return (
+        f"{block.start_time.strftime('%H:%M')} - {block.end_time.strftime('%H:%M')}: "
+        f"{block.title} ({int(block_minutes(block))} mins)"
+    )
+
+
+class BlockIndex:
+    # Start/end ranges of scheduled blocks kept sorted. Blocks never overlap, so
+    # their ends are sorted too and the only block that can collide with a range
+    # ending at `end` is the last one starting before it.
+
+    def __init__(self, ranges: Iterable[Tuple[Any, Any]] = ()):
+        self._ranges: List[Tuple[Any, Any]] = []
+        for start, end in ranges:
+            self.add(start, end)
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def add(self, start, end) -> None:
+        insort(self._ranges, (start, end))
+
+    def collides(self, end, buffer_end) -> bool:
+        # Whether any block starts before buffer_end and is still running at end
+        index = bisect_left(self._ranges, (buffer_end,))
+        return index > 0 and self._ranges[index - 1][1] > end
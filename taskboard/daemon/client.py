@@ -0,0 +1,88 @@
+import socket
+from pathlib import Path
+from typing import List, Optional, TextIO
+
+from taskboard.daemon.protocol import board_config, receive_frame, send_frame
+
+# Seconds to wait for the daemon to connect, and then to take or refuse a
+# command. Past that the command runs in the client's own process.
+CONNECT_TIMEOUT = 1.0
+
+
+def _connect(path: Path) -> Optional[socket.socket]:
+    if not hasattr(socket, "AF_UNIX") or not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def run_command(
+    path: Path,
+    command: str,
+    argv: List[str],
+    stdin: TextIO,
+    stdout: TextIO,
+    stderr: TextIO,
+) -> Optional[int]:
+    # The command's exit code once the daemon at `path` has run it, or None when
+    # no daemon is listening there or it will not run it for this board
+    try:
+        config = board_config()
+    except ValueError:
+        # A bad setting is for the command itself to report
+        return None
+    sock = _connect(path)
+    if sock is None:
+        return None
+    with sock:
+        try:
+            send_frame(
+                sock, {"op": "run", "config": config, "command": command, "argv": argv}
+            )
+            message = receive_frame(sock)
+        except OSError:
+            # The daemon shut down, or did not answer in time, before taking
+            # the command
+            return None
+        while True:
+            if message is None:
+                raise ConnectionError("The taskboard daemon closed the connection")
+            if "refused" in message:
+                return None
+            if "started" in message:
+                # Commands may wait on input for as long as the user takes
+                sock.settimeout(None)
+            elif "out" in message:
+                stdout.write(message["out"])
+                stdout.flush()
+            elif "err" in message:
+                stderr.write(message["err"])
+                stderr.flush()
+            elif "read" in message:
+                send_frame(sock, {"line": stdin.readline()})
+            elif "exit" in message:
+                return message["exit"]
+            message = receive_frame(sock)
+
+
+def request(path: Path, op: str) -> bool:
+    # Sends "ping" or "stop"; whether a daemon answered. A stop is answered once
+    # the daemon has saved the board and stopped listening.
+    sock = _connect(path)
+    if sock is None:
+        return False
+    if op == "stop":
+        # Answered only once the board is saved
+        sock.settimeout(None)
+    with sock:
+        try:
+            send_frame(sock, {"op": op})
+            return receive_frame(sock) is not None
+        except OSError:
+            return False
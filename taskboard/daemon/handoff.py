@@ -0,0 +1,46 @@
+import os
+import sys
+
+from taskboard.storage.settings import socket_path
+
+# Commands the daemon runs for its clients
+COMMANDS = (
+    "add_event",
+    "add_task",
+    "archive_tasks",
+    "display_events",
+    "display_tasks",
+    "run_today",
+    "run_week",
+    "start_task",
+    "stop_task",
+)
+
+# Options that keep a command running. The daemon serves one command at a time,
+# so those runs stay in their own process.
+LONG_RUNNING = {"run_today": "--watch"}
+
+
+def run_via_daemon(command: str) -> bool:
+    # Runs the command in the daemon when one serves this board, and exits with
+    # its exit code. False when the command should run here instead:
+    # TASKBOARD_DAEMON=off, an option that keeps it running, no daemon, one
+    # serving another board, or one busy with another client's command.
+    if os.environ.get("TASKBOARD_DAEMON", "auto") == "off":
+        return False
+    option = LONG_RUNNING.get(command)
+    # argparse also takes an unambiguous prefix of an option
+    if option and any(len(arg) > 2 and option.startswith(arg) for arg in sys.argv[1:]):
+        return False
+    path = socket_path()
+    if not path.exists():
+        # Without a daemon, commands do not import the client at all
+        return False
+    from taskboard.daemon.client import run_command
+
+    code = run_command(path, command, sys.argv[1:], sys.stdin, sys.stdout, sys.stderr)
+    if code is None:
+        return False
+    if code:
+        sys.exit(code)
+    return True
@@ -0,0 +1,70 @@
+import json
+import socket
+import struct
+from typing import Optional
+
+from taskboard.storage.settings import (
+    EVENTS_PATH,
+    TASKS_PATH,
+    backend_name,
+    db_path,
+    event_layout,
+    lazy_records,
+)
+
+# Messages are JSON objects, each sent as a frame: a 4-byte big-endian length,
+# then that many bytes of UTF-8 JSON.
+#
+# A client opens one connection per command and sends
+#   {"op": "run", "config": board_config(), "command": name, "argv": [...]}
+# The daemon answers {"refused": reason} when it holds a different board, does
+# not serve the command or is running another one, and otherwise answers
+# {"started": true} and streams the command's output as
+# {"out": text} and {"err": text}, asks for a line of input with {"read": true}
+# (answered with {"line": text}, "" at end of input), and ends with
+# {"exit": code}. {"op": "ping"} and {"op": "stop"} are answered with {"ok": true}.
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME = 64 * 1024 * 1024
+
+
+def board_config() -> dict:
+    # What decides which board a process reads; a client only uses a daemon
+    # whose board is the one it would have read itself
+    return {
+        "backend": backend_name(),
+        "event_layout": event_layout(),
+        "lazy": lazy_records(),
+        "db": str(db_path()),
+        "tasks": str(TASKS_PATH),
+        "events": str(EVENTS_PATH),
+    }
+
+
+def send_frame(sock: socket.socket, message: dict) -> None:
+    data = json.dumps(message, separators=(",", ":")).encode()
+    sock.sendall(FRAME_HEADER.pack(len(data)) + data)
+
+
+def _receive_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def receive_frame(sock: socket.socket) -> Optional[dict]:
+    # None once the other side has closed the connection
+    header = _receive_exactly(sock, FRAME_HEADER.size)
+    if header is None:
+        return None
+    (size,) = FRAME_HEADER.unpack(header)
+    if size > MAX_FRAME:
+        raise ValueError(f"frame of {size} bytes is too large")
+    data = _receive_exactly(sock, size)
+    if data is None:
+        return None
+    return json.loads(data)
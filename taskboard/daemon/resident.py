@@ -0,0 +1,212 @@
+import logging
+import threading
+import uuid
+from collections import deque
+from dataclasses import fields
+from datetime import date
+from typing import Callable, Deque, Iterator, List, Optional, Set
+
+from taskboard.models.event import Event
+from taskboard.models.task import Task
+from taskboard.models.task_table import FIELDS, TaskTable
+from taskboard.storage.events_repository import in_range, merge_changes
+from taskboard.storage.store import EventStore, TaskStore
+
+logger = logging.getLogger("taskboard.daemon")
+
+EVENT_FIELDS = tuple(f.name for f in fields(Event))
+
+
+def copy_task(task: Task) -> Task:
+    # A plain Task with its own lists, from any task-like record
+    copy = Task(*(getattr(task, name) for name in FIELDS))
+    copy.work_sessions = list(copy.work_sessions)
+    copy.depends_on = list(copy.depends_on)
+    return copy
+
+
+def copy_event(event: Event) -> Event:
+    return Event(*(getattr(event, name) for name in EVENT_FIELDS))
+
+
+class Persister:
+    # Runs writes to the backing stores on a background thread, one at a time
+    # and in the order they were submitted
+
+    def __init__(self):
+        self.jobs: Deque[Callable[[], None]] = deque()
+        self.condition = threading.Condition()
+        self.busy = False
+        threading.Thread(
+            target=self._run, name="taskboard-persist", daemon=True
+        ).start()
+
+    def submit(self, job: Callable[[], None]) -> None:
+        with self.condition:
+            self.jobs.append(job)
+            self.condition.notify_all()
+
+    def idle(self) -> bool:
+        with self.condition:
+            return not self.jobs and not self.busy
+
+    def flush(self) -> None:
+        with self.condition:
+            while self.jobs or self.busy:
+                self.condition.wait()
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while not self.jobs:
+                    self.condition.wait()
+                job = self.jobs.popleft()
+                self.busy = True
+            try:
+                job()
+            except Exception:
+                logger.exception("Could not save the board")
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
+
+
+class _Resident:
+    # A board held in memory in front of its store. Reads come from memory, as
+    # copies that commands may change freely; the records in memory are only
+    # ever replaced, never changed, so writes can hand them to the persister
+    # as they are. Writes reach the store through the persister. refresh()
+    # reads the store again when it was changed by another process. `copy`
+    # turns a record the store loaded into one the board can hold.
+
+    def __init__(self, store, persister: Persister, copy: Callable):
+        self.store = store
+        self.persister = persister
+        self.copy = copy
+        self.instance = uuid.uuid4().hex
+        self.revision = 0
+        self._read()
+
+    def _read(self) -> None:
+        self.records = self._load_store()
+        self.stored_fingerprint = self.store.fingerprint()
+        self.revision += 1
+
+    def _load_store(self) -> list:
+        return [self.copy(record) for record in self.store.load()]
+
+    def refresh(self) -> None:
+        if (
+            self.persister.idle()
+            and self.store.fingerprint() != self.stored_fingerprint
+        ):
+            self._read()
+
+    def fingerprint(self) -> bytes:
+        return f"resident:{self.instance}:{self.revision}".encode()
+
+    def _persist(self, write: Callable[[], None]) -> None:
+        self.revision += 1
+        expected = {record.id: record for record in self.records}
+
+        def job():
+            write()
+            # Another process may write between ours and the fingerprint, so
+            # the fingerprint is only adopted when the store holds exactly
+            # the board in memory; otherwise refresh() reads it again
+            fingerprint = self.store.fingerprint()
+            stored = {record.id: record for record in self._load_store()}
+            self.stored_fingerprint = fingerprint if stored == expected else None
+
+        self.persister.submit(job)
+
+
+class ResidentTaskStore(_Resident):
+    store: TaskStore
+
+    def __init__(self, store: TaskStore, persister: Persister):
+        super().__init__(store, persister, copy_task)
+
+    def load(self) -> List[Task]:
+        return [copy_task(task) for task in self.records]
+
+    def load_table(self) -> TaskTable:
+        return TaskTable.from_tasks(self.records)
+
+    def iter(
+        self, completed: Optional[bool] = None, scheduled_until: Optional[date] = None
+    ) -> Iterator[Task]:
+        for task in self.records:
+            if (completed is None or task.is_completed == completed) and (
+                scheduled_until is None
+                or (task.scheduled_date or date.today()) <= scheduled_until
+            ):
+                yield copy_task(task)
+
+    def active(self) -> Optional[Task]:
+        for task in self.records:
+            if task.active_session_start is not None:
+                return copy_task(task)
+        return None
+
+    def save(self, tasks: List[Task]) -> None:
+        tasks.sort(key=lambda t: (t.scheduled_date or date.today(), t.priority))
+        self.records = [copy_task(task) for task in tasks]
+        records = list(self.records)
+        self._persist(lambda: self.store.save(records))
+
+    def save_one(self, task: Task) -> None:
+        # As JsonTaskStore.save_one: replace or append, then a stable sort
+        task = copy_task(task)
+        for index, stored in enumerate(self.records):
+            if stored.id == task.id:
+                self.records[index] = task
+                break
+        else:
+            self.records.append(task)
+        self.records.sort(key=lambda t: (t.scheduled_date or date.today(), t.priority))
+        self._persist(lambda: self.store.save_one(task))
+
+
+class ResidentEventStore(_Resident):
+    store: EventStore
+
+    def __init__(self, store: EventStore, persister: Persister):
+        super().__init__(store, persister, copy_event)
+
+    def load(
+        self, start_date: Optional[date] = None, end_date: Optional[date] = None
+    ) -> List[Event]:
+        return list(self.iter(start_date, end_date))
+
+    def iter(
+        self, start_date: Optional[date] = None, end_date: Optional[date] = None
+    ) -> Iterator[Event]:
+        for event in self.records:
+            if in_range(event, start_date, end_date):
+                yield copy_event(event)
+
+    def save(self, events: List[Event]) -> None:
+        events.sort(key=lambda e: (e.start, e.title))
+        self.records = [copy_event(event) for event in events]
+        records = list(self.records)
+        self._persist(lambda: self.store.save(records))
+
+    def save_one(self, event: Event) -> None:
+        event = copy_event(event)
+        for index, stored in enumerate(self.records):
+            if stored.id == event.id:
+                self.records[index] = event
+                break
+        else:
+            self.records.append(event)
+        self.records.sort(key=lambda e: (e.start, e.title))
+        self._persist(lambda: self.store.save_one(event))
+
+    def save_changes(self, events: List[Event], removed: Set[int]) -> None:
+        events = [copy_event(event) for event in events]
+        self.records = merge_changes(self.records, events, removed)
+        self.records.sort(key=lambda e: (e.start, e.title))
+        removed = set(removed)
+        self._persist(lambda: self.store.save_changes(events, removed))
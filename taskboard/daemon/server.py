@@ -0,0 +1,238 @@
+import importlib
+import io
+import os
+import signal
+import socket
+import sys
+import threading
+import traceback
+from pathlib import Path
+from typing import List, Optional
+
+from taskboard.daemon.handoff import COMMANDS
+from taskboard.daemon.protocol import board_config, receive_frame, send_frame
+from taskboard.daemon.resident import Persister, ResidentEventStore, ResidentTaskStore
+from taskboard.storage import events_repository, tasks_repository
+
+
+class _Output(io.TextIOBase):
+    # Text written by a command, sent to the client whenever it is flushed
+    def __init__(self, connection: socket.socket, kind: str):
+        self.connection = connection
+        self.kind = kind
+        self.buffer: List[str] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self.buffer.append(text)
+        return len(text)
+
+    def flush(self) -> None:
+        if self.buffer:
+            send_frame(self.connection, {self.kind: "".join(self.buffer)})
+            self.buffer.clear()
+
+
+class _Input(io.TextIOBase):
+    # Lines typed at the client, asked for one at a time
+    def __init__(self, connection: socket.socket, outputs: List[_Output]):
+        self.connection = connection
+        self.outputs = outputs
+
+    def readable(self) -> bool:
+        return True
+
+    def readline(self, size: int = -1) -> str:
+        for output in self.outputs:
+            output.flush()
+        send_frame(self.connection, {"read": True})
+        reply = receive_frame(self.connection)
+        return reply.get("line", "") if reply else ""
+
+
+def _run_command(connection: socket.socket, command: str, argv: List[str]) -> int:
+    # Runs the command's main() here, with its arguments, input and output
+    # going to and from the client
+    tasks_repository.resident_store.refresh()
+    events_repository.resident_store.refresh()
+    module = importlib.import_module(f"taskboard.cli.{command}")
+    stdout = _Output(connection, "out")
+    stderr = _Output(connection, "err")
+    saved = sys.argv, sys.stdin, sys.stdout, sys.stderr
+    sys.argv = [module.__file__] + argv
+    sys.stdin, sys.stdout, sys.stderr = (
+        _Input(connection, [stdout, stderr]),
+        stdout,
+        stderr,
+    )
+    code = 0
+    try:
+        module.main()
+    except SystemExit as exit:
+        if isinstance(exit.code, str):
+            print(exit.code, file=sys.stderr)
+            code = 1
+        else:
+            code = exit.code or 0
+    except Exception:
+        traceback.print_exc()
+        code = 1
+    finally:
+        sys.argv, sys.stdin, sys.stdout, sys.stderr = saved
+    stdout.flush()
+    stderr.flush()
+    return code
+
+
+# Seconds a client has to send its request once connected
+REQUEST_TIMEOUT = 5.0
+
+
+class _Runner:
+    # Runs one command at a time on a thread of its own, so that the accept
+    # loop keeps answering while a command waits on its client. Commands share
+    # sys.argv, sys.stdin and sys.stdout, so they cannot run side by side.
+
+    def __init__(self):
+        self.thread: Optional[threading.Thread] = None
+        self.running = threading.Event()
+
+    def busy(self) -> bool:
+        return self.running.is_set()
+
+    def start(self, connection: socket.socket, command: str, argv: List[str]) -> None:
+        # The runner gets a copy of the connection, which stays open until it
+        # closes it
+        self.running.set()
+        self.thread = threading.Thread(
+            target=self._run,
+            args=(connection.dup(), command, argv),
+            name="taskboard-command",
+            daemon=True,
+        )
+        self.thread.start()
+
+    def wait(self) -> None:
+        if self.thread is not None:
+            self.thread.join()
+
+    def _run(self, connection: socket.socket, command: str, argv: List[str]) -> None:
+        with connection:
+            try:
+                # No time limit from here on: commands wait on input for as
+                # long as the user takes
+                connection.settimeout(None)
+                send_frame(connection, {"started": True})
+                code = _run_command(connection, command, argv)
+                # Free before the client hears the command is done, so that
+                # its next command is taken
+                self.running.clear()
+                send_frame(connection, {"exit": code})
+            except (OSError, ValueError):
+                # The client went away or sent something that is not a frame
+                pass
+            finally:
+                self.running.clear()
+
+
+def _handle(connection: socket.socket, runner: _Runner) -> bool:
+    # Answers one connection, handing a command to the runner; False when
+    # asked to stop, which is answered once the daemon has shut down
+    connection.settimeout(REQUEST_TIMEOUT)
+    request = receive_frame(connection)
+    if request is None:
+        return True
+    op = request.get("op")
+    if op == "stop":
+        return False
+    if op == "ping":
+        send_frame(connection, {"ok": True})
+    elif op != "run" or request.get("command") not in COMMANDS:
+        send_frame(
+            connection, {"refused": f"unknown request: {op} {request.get('command')}"}
+        )
+    elif request.get("config") != board_config():
+        send_frame(connection, {"refused": "the daemon serves a different board"})
+    elif runner.busy():
+        # The client runs the command itself rather than waiting on another
+        # client, which may be sitting at a prompt
+        send_frame(connection, {"refused": "the daemon is running another command"})
+    else:
+        runner.start(connection, request["command"], request.get("argv", []))
+    return True
+
+
+def _bind(path: Path) -> socket.socket:
+    if path.exists():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(path))
+        except OSError:
+            # Left behind by a daemon that did not shut down cleanly
+            path.unlink()
+        else:
+            raise RuntimeError(f"A taskboard daemon is already serving {path}")
+        finally:
+            probe.close()
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Created private, so no other user can connect before it is listening
+    umask = os.umask(0o177)
+    try:
+        listener.bind(str(path))
+    finally:
+        os.umask(umask)
+    listener.listen(16)
+    return listener
+
+
+def serve(path: Path, ready: Optional[threading.Event] = None) -> None:
+    # Holds the board in memory and runs commands for clients until stopped.
+    # Commands run one at a time, and are refused while another one runs;
+    # commands run inside the daemon use the resident board rather than going
+    # back to the daemon.
+    os.environ["TASKBOARD_DAEMON"] = "off"
+    persister = Persister()
+    tasks_repository.resident_store = ResidentTaskStore(
+        tasks_repository.get_task_store(), persister
+    )
+    events_repository.resident_store = ResidentEventStore(
+        events_repository.get_event_store(), persister
+    )
+    for command in COMMANDS:
+        importlib.import_module(f"taskboard.cli.{command}")
+
+    listener = _bind(path)
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    if ready is not None:
+        ready.set()
+    runner = _Runner()
+    stop_request = None
+    try:
+        while stop_request is None:
+            connection, _ = listener.accept()
+            try:
+                if not _handle(connection, runner):
+                    stop_request = connection
+                    continue
+            except (OSError, ValueError):
+                # The client went away or sent something that is not a frame
+                pass
+            connection.close()
+    finally:
+        listener.close()
+        path.unlink(missing_ok=True)
+        if stop_request is not None:
+            # A stop lets the command being run finish and save
+            runner.wait()
+        persister.flush()
+        tasks_repository.resident_store = None
+        events_repository.resident_store = None
+        if stop_request is not None:
+            with stop_request:
+                try:
+                    send_frame(stop_request, {"ok": True})
+                except OSError:
+                    pass
@@ -2,8 +2,10 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+from taskboard.models.slots import SLOTS
 
-@dataclass
+
+@dataclass(**SLOTS)
 class Event:
     id: int
     title: str
@@ -13,3 +15,12 @@ class Event:
 
     source: str = "manual"  # "manual", "google", "outlook", etc.
     external_id: Optional[str] = None  # ID from external calendar if applicable
+
+
+def external_event_id(source: str, external_id: str) -> int:
+    # A stable id for an event from an external calendar, so importing the same
+    # event again gives it the same id
+    from hashlib import blake2b
+
+    digest = blake2b(f"{source}\0{external_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") >> 1
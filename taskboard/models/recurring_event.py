@@ -0,0 +1,22 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from taskboard.models.slots import SLOTS
+
+
+@dataclass(**SLOTS)
+class RecurringEvent:
+    # A repeating event from an imported calendar. It is stored as its rule and
+    # expanded into Events only for the days being read.
+    uid: str  # the calendar's UID, shared by all occurrences
+    title: str
+    # The first occurrence, as wall time in `timezone` (local time when None)
+    start: datetime
+    end: datetime
+    rule: str  # the RRULE value, e.g. "FREQ=WEEKLY;BYDAY=MO,WE"
+    description: Optional[str] = None
+    source: str = "ics"
+    timezone: Optional[str] = None  # IANA name, e.g. "Europe/Berlin"
+    # Starts of occurrences that were cancelled or moved, in the same wall time
+    exdates: List[datetime] = field(default_factory=list)
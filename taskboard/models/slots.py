@@ -0,0 +1,5 @@
+import sys
+
+# Keyword arguments for @dataclass that give instances __slots__ instead of a
+# __dict__ where the running Python supports it (3.10+)
+SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
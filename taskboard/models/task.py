@@ -2,8 +2,10 @@ from dataclasses import dataclass, field
 from datetime import date, datetime, time
 from typing import List, Optional, Tuple
 
+from taskboard.models.slots import SLOTS
 
-@dataclass
+
+@dataclass(**SLOTS)
 class Task:
     id: int
     title: str
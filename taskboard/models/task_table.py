@@ -0,0 +1,260 @@
+from array import array
+from dataclasses import fields
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from taskboard.models.task import Task
+
+FIELDS = tuple(f.name for f in fields(Task))
+
+# Columns of small integers and flags, stored unboxed
+INT_COLUMNS = ("duration_minutes", "priority", "energy_level")
+FLAG_COLUMNS = ("flexible", "is_completed")
+# Columns holding one object reference per row. Times and dates repeat across a
+# board, so equal values share one object.
+OBJECT_COLUMNS = (
+    "title",
+    "earliest_start_time",
+    "latest_end_time",
+    "description",
+    "scheduled_date",
+    "deadline",
+    "active_session_start",
+)
+SHARED_COLUMNS = ("earliest_start_time", "latest_end_time", "scheduled_date")
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+class TaskTable:
+    # A board stored column by column instead of as one Task object per task.
+    # Ids sit in a 64-bit array until one does not fit. Work sessions are
+    # microsecond pairs in one array with per-row offsets, and dependency ids
+    # likewise, so tasks without any cost no list objects.
+    #
+    # Iterating or indexing the table gives TaskRow views that read and write
+    # the columns and can stand in for Task objects. Their work_sessions and
+    # depends_on are new lists on every read; assign them to change a row.
+    def __init__(self):
+        self.ids = array("q")
+        self.columns: Dict[str, object] = {}
+        for name in INT_COLUMNS:
+            self.columns[name] = array("l")
+        for name in FLAG_COLUMNS:
+            self.columns[name] = array("b")
+        for name in OBJECT_COLUMNS:
+            self.columns[name] = []
+        self.sessions = array("q")
+        self.session_offsets = array("l", [0])
+        self.depends = array("q")
+        self.depend_offsets = array("l", [0])
+        # Rows whose lists were assigned after the row was added, or that hold
+        # values the arrays cannot (aware datetimes, ids past 64 bits)
+        self.overrides: Dict[Tuple[str, int], list] = {}
+        self._shared: Dict[object, object] = {}
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Task]) -> "TaskTable":
+        table = cls()
+        for task in tasks:
+            table.append(task)
+        return table
+
+    @classmethod
+    def from_columns(
+        cls,
+        ids: array,
+        columns: Dict[str, object],
+        sessions: array,
+        session_offsets: array,
+        depends: array,
+        depend_offsets: array,
+    ) -> "TaskTable":
+        # Columns as __init__ lays them out, all of the same length
+        table = cls()
+        table.ids = ids
+        table.columns = columns
+        table.sessions = sessions
+        table.session_offsets = session_offsets
+        table.depends = depends
+        table.depend_offsets = depend_offsets
+        return table
+
+    def append(self, task: Task) -> None:
+        row = len(self)
+        try:
+            self.ids.append(task.id)
+        except OverflowError:
+            self.ids = list(self.ids)
+            self.ids.append(task.id)
+
+        columns = self.columns
+        for name in INT_COLUMNS + FLAG_COLUMNS:
+            columns[name].append(getattr(task, name))
+        for name in OBJECT_COLUMNS:
+            value = getattr(task, name)
+            if value is not None and name in SHARED_COLUMNS:
+                value = self._shared.setdefault(value, value)
+            columns[name].append(value)
+
+        if task.work_sessions:
+            try:
+                self.sessions.extend(
+                    [
+                        (moment - EPOCH) // MICROSECOND
+                        for pair in task.work_sessions
+                        for moment in pair
+                    ]
+                )
+            except TypeError:
+                self.overrides["work_sessions", row] = list(task.work_sessions)
+        self.session_offsets.append(len(self.sessions))
+
+        if task.depends_on:
+            try:
+                self.depends.extend(array("q", task.depends_on))
+            except OverflowError:
+                self.overrides["depends_on", row] = list(task.depends_on)
+        self.depend_offsets.append(len(self.depends))
+
+    def work_sessions(self, row: int) -> List[Tuple[datetime, datetime]]:
+        if ("work_sessions", row) in self.overrides:
+            return list(self.overrides["work_sessions", row])
+        micros = self.sessions[
+            self.session_offsets[row] : self.session_offsets[row + 1]
+        ]
+        return [
+            (
+                EPOCH + timedelta(microseconds=micros[i]),
+                EPOCH + timedelta(microseconds=micros[i + 1]),
+            )
+            for i in range(0, len(micros), 2)
+        ]
+
+    def depends_on(self, row: int) -> List[int]:
+        if ("depends_on", row) in self.overrides:
+            return list(self.overrides["depends_on", row])
+        return self.depends[
+            self.depend_offsets[row] : self.depend_offsets[row + 1]
+        ].tolist()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, row: int) -> "TaskRow":
+        if not -len(self) <= row < len(self):
+            raise IndexError("task table row out of range")
+        return TaskRow(self, row % len(self))
+
+    def __iter__(self) -> Iterator["TaskRow"]:
+        for row in range(len(self)):
+            yield TaskRow(self, row)
+
+    def to_tasks(self) -> List[Task]:
+        return [row.to_task() for row in self]
+
+    def changed_rows(self, other: "TaskTable") -> List[int]:
+        # Rows both tables have where the tasks differ. Whole columns are
+        # compared first, so only the columns a change touched are gone through
+        # row by row.
+        size = min(len(self), len(other))
+        candidates = {
+            row
+            for overrides in (self.overrides, other.overrides)
+            for _, row in overrides
+            if row < size
+        }
+        pairs = [(self.ids, other.ids)]
+        pairs += [
+            (column, other.columns[name]) for name, column in self.columns.items()
+        ]
+        for mine, theirs in pairs:
+            mine, theirs = mine[:size], theirs[:size]
+            if mine != theirs:
+                candidates.update(
+                    row for row, (a, b) in enumerate(zip(mine, theirs)) if a != b
+                )
+        for values, offsets, other_values, other_offsets in (
+            (
+                self.sessions,
+                self.session_offsets,
+                other.sessions,
+                other.session_offsets,
+            ),
+            (self.depends, self.depend_offsets, other.depends, other.depend_offsets),
+        ):
+            if (
+                offsets[: size + 1] != other_offsets[: size + 1]
+                or values[: offsets[size]] != other_values[: other_offsets[size]]
+            ):
+                candidates.update(
+                    row
+                    for row in range(size)
+                    if values[offsets[row] : offsets[row + 1]]
+                    != other_values[other_offsets[row] : other_offsets[row + 1]]
+                )
+        return sorted(row for row in candidates if self[row] != other[row])
+
+
+def _column(name: str):
+    def get(self):
+        return self.table.columns[name][self.row]
+
+    def set(self, value):
+        self.table.columns[name][self.row] = value
+
+    return property(get, set)
+
+
+def _flag_column(name: str):
+    def get(self):
+        return bool(self.table.columns[name][self.row])
+
+    def set(self, value):
+        self.table.columns[name][self.row] = value
+
+    return property(get, set)
+
+
+def _list_column(name: str):
+    def get(self):
+        return getattr(self.table, name)(self.row)
+
+    def set(self, value):
+        self.table.overrides[name, self.row] = list(value)
+
+    return property(get, set)
+
+
+class TaskRow:
+    # One row of a TaskTable with the attributes of a Task
+    __slots__ = ("table", "row")
+
+    def __init__(self, table: TaskTable, row: int):
+        self.table = table
+        self.row = row
+
+    @property
+    def id(self) -> int:
+        return self.table.ids[self.row]
+
+    def to_task(self) -> Task:
+        return Task(*(getattr(self, name) for name in FIELDS))
+
+    def __eq__(self, other):
+        if not isinstance(other, (Task, TaskRow)):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in FIELDS)
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in FIELDS)
+        return f"TaskRow({values})"
+
+
+for _name in INT_COLUMNS + OBJECT_COLUMNS:
+    setattr(TaskRow, _name, _column(_name))
+for _name in FLAG_COLUMNS:
+    setattr(TaskRow, _name, _flag_column(_name))
+for _name in ("work_sessions", "depends_on"):
+    setattr(TaskRow, _name, _list_column(_name))
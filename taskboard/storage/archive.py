@@ -0,0 +1,129 @@
+import gzip
+import json
+import os
+import zlib
+from datetime import date, timedelta
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Tuple
+
+from taskboard.models.task import Task
+from taskboard.storage import tasks_repository
+from taskboard.storage.tasks_repository import (
+    _deserialize_task,
+    _serialize_task,
+    load_tasks,
+    save_tasks,
+)
+from taskboard.storage.write_log import log_write
+
+# Completed tasks are archived once they have been done for this many days
+DEFAULT_ARCHIVE_AFTER_DAYS = 30
+
+
+def archive_path() -> Path:
+    # Next to tasks.json, whichever backend holds the hot tasks
+    return tasks_repository.DATA_PATH.with_name("tasks.archive.jsonl.gz")
+
+
+def _finished_on(task: Task) -> date:
+    # Day the task was last worked on, or its scheduled day if it never was
+    if task.work_sessions:
+        return max(end for _, end in task.work_sessions).date()
+    return task.scheduled_date or date.today()
+
+
+def split_archivable(
+    tasks: List[Task], today: date, older_than_days: int
+) -> Tuple[List[Task], List[Task]]:
+    # (tasks to keep, completed tasks finished more than older_than_days ago)
+    cutoff = today - timedelta(days=older_than_days)
+    keep, archive = [], []
+    for task in tasks:
+        if task.is_completed and _finished_on(task) < cutoff:
+            archive.append(task)
+        else:
+            keep.append(task)
+    return keep, archive
+
+
+def archive_completed_tasks(
+    today: date, older_than_days: int = DEFAULT_ARCHIVE_AFTER_DAYS
+) -> int:
+    # Moves old completed tasks from the task store to the archive and returns
+    # how many moved. The archive is written and synced before the tasks leave
+    # the store, so a crash in between leaves a task in both places rather than
+    # in neither; readers skip archived copies of tasks that are still hot.
+    keep, archive = split_archivable(load_tasks(), today, older_than_days)
+    if not archive:
+        return 0
+    append_to_archive(archive)
+    save_tasks(keep)
+    return len(archive)
+
+
+def _complete_length(f: BinaryIO) -> int:
+    # Bytes taken by the gzip members at the start of the file that are
+    # complete: a member torn by a crash, and anything after it, is past this
+    f.seek(0)
+    complete = offset = 0
+    member = zlib.decompressobj(wbits=31)
+    while True:
+        chunk = f.read(1 << 20)
+        if not chunk:
+            return complete
+        while chunk:
+            try:
+                member.decompress(chunk)
+            except zlib.error:
+                return complete
+            if not member.eof:
+                offset += len(chunk)
+                break
+            offset += len(chunk) - len(member.unused_data)
+            complete = offset
+            chunk = member.unused_data
+            member = zlib.decompressobj(wbits=31)
+
+
+def append_to_archive(tasks: List[Task]) -> None:
+    # Each call adds a gzip member; readers see the members as one stream.
+    # Readers stop at a member torn by a crash, so anything added after one
+    # would never be read: the tear is cut off first, and the tasks that could
+    # still be read from it are archived again with these.
+    path = archive_path()
+    with open(path, "ab") as raw:
+        if raw.tell():
+            with open(path, "rb") as f:
+                complete = _complete_length(f)
+                if complete < raw.tell():
+                    f.seek(complete)
+                    tasks = list(_read_tasks(f)) + tasks
+                    raw.truncate(complete)
+                    raw.seek(complete)
+        start = raw.tell()
+        with gzip.GzipFile(fileobj=raw, mode="wb") as f:
+            for task in tasks:
+                f.write(json.dumps(_serialize_task(task)).encode() + b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+        log_write(path, raw.tell() - start)
+
+
+def _read_tasks(f: BinaryIO) -> Iterator[Task]:
+    with gzip.GzipFile(fileobj=f, mode="rb") as archive:
+        try:
+            for line in archive:
+                yield _deserialize_task(json.loads(line))
+        except (EOFError, ValueError, zlib.error, gzip.BadGzipFile):
+            # A member cut short or garbled by a crash while archiving
+            return
+
+
+def iter_archived_tasks() -> Iterator[Task]:
+    # Archived tasks one at a time, oldest archive run first, without reading
+    # the whole archive into memory
+    path = archive_path()
+    if not path.exists():
+        return
+    with open(path, "rb") as f:
+        yield from _read_tasks(f)
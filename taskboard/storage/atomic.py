@@ -0,0 +1,41 @@
+import os
+from pathlib import Path
+
+from taskboard.storage.write_log import log_skip, log_write
+
+
+def _fsync_directory(path: Path) -> None:
+    # Makes a rename in the directory durable; not possible on Windows
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    # Readers, and the file after a crash, see either the old or the new
+    # contents, never a truncated file
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(temp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    _fsync_directory(path.parent)
+    log_write(path, len(data))
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    # As write_atomic, but leaves the file alone when it already holds `data`.
+    # Returns whether it wrote.
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            log_skip(path)
+            return False
+    except FileNotFoundError:
+        pass
+    write_atomic(path, data)
+    return True
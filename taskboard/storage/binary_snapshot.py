@@ -0,0 +1,538 @@
+import struct
+import sys
+from array import array
+from datetime import date, datetime, time, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from taskboard.models.task import Task
+from taskboard.models.task_table import TaskTable
+from taskboard.storage.atomic import write_atomic
+from taskboard.storage.lazy_records import LazyTask
+
+# A binary copy of tasks.json that loads without parsing JSON or ISO strings.
+# Layout, little-endian:
+#   header   magic, size and mtime of the tasks.json it was made from, counts
+#   strings  character length of every string, then all of them as one UTF-8 blob
+#   tasks    one fixed-size record per task
+#   sessions start/end pairs of every task's work sessions, in task order
+#   depends  dependency ids of every task, in task order
+# Datetimes are microseconds since the naive Unix epoch and times microseconds
+# since midnight. Ids take two unsigned 64-bit halves.
+MAGIC = b"TBTASKS1"
+HEADER = struct.Struct("<8sQqIIII")
+RECORD = struct.Struct("<QQiiiqqBIIiqqII")
+
+FLEXIBLE = 1
+COMPLETED = 2
+HAS_EARLIEST = 4
+HAS_LATEST = 8
+HAS_DEADLINE = 16
+HAS_ACTIVE = 32
+HAS_DESCRIPTION = 64
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+ID_LIMIT = 1 << 128
+LOW_MASK = (1 << 64) - 1
+
+
+def _time_to_micros(moment: time) -> int:
+    seconds = (moment.hour * 60 + moment.minute) * 60 + moment.second
+    return seconds * 1_000_000 + moment.microsecond
+
+
+def _micros_to_time(micros: int) -> time:
+    seconds, microsecond = divmod(micros, 1_000_000)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return time(hour, minute, second, microsecond)
+
+
+def _datetime_to_micros(moment: datetime) -> int:
+    if moment.tzinfo is not None:
+        raise ValueError("aware datetimes are not supported")
+    return (moment - EPOCH) // MICROSECOND
+
+
+class _SnapshotSource:
+    # What the lazy tasks of one snapshot decode their fields from
+    __slots__ = ("sessions", "times", "dates")
+
+    def __init__(self, sessions: array, times: dict, dates: dict):
+        self.sessions = sessions
+        self.times = times
+        self.dates = dates
+
+
+class SnapshotTask(LazyTask):
+    # A task read from a snapshot record. Its times, dates and work sessions
+    # stay as the record's integers until read.
+    __slots__ = ("_source",)
+
+    def __init__(
+        self,
+        source: _SnapshotSource,
+        task_id: int,
+        title: str,
+        duration_minutes: int,
+        priority: int,
+        earliest: Optional[int],
+        latest: Optional[int],
+        flags: int,
+        description: Optional[str],
+        scheduled_date: int,
+        deadline: Optional[int],
+        energy_level: int,
+        sessions: Optional[tuple],
+        active: Optional[int],
+        depends_on: List[int],
+    ):
+        self.id = task_id
+        self.title = title
+        self.duration_minutes = duration_minutes
+        self.priority = priority
+        self.flexible = bool(flags & FLEXIBLE)
+        self.is_completed = bool(flags & COMPLETED)
+        self.description = description
+        self.energy_level = energy_level
+        self.depends_on = depends_on
+        self._earliest_start_time = earliest
+        self._latest_end_time = latest
+        self._scheduled_date = scheduled_date
+        self._deadline = deadline
+        self._work_sessions = sessions
+        self._active_session_start = active
+        self._decoded = 0
+        self._source = source
+
+    def _decode(self, name: str, stored):
+        if name == "work_sessions":
+            if stored is None:
+                return []
+            first, count = stored
+            sessions = self._source.sessions
+            return [
+                (
+                    EPOCH + timedelta(microseconds=sessions[index]),
+                    EPOCH + timedelta(microseconds=sessions[index + 1]),
+                )
+                for index in range(first, first + 2 * count, 2)
+            ]
+        if stored is None:
+            return None
+        if name == "scheduled_date":
+            day = self._source.dates.get(stored)
+            if day is None:
+                day = self._source.dates[stored] = date.fromordinal(stored)
+            return day
+        if name in ("earliest_start_time", "latest_end_time"):
+            moment = self._source.times.get(stored)
+            if moment is None:
+                moment = self._source.times[stored] = _micros_to_time(stored)
+            return moment
+        return EPOCH + timedelta(microseconds=stored)
+
+
+def encode_tasks(tasks: List[Task], source_size: int, source_mtime_ns: int) -> bytes:
+    # Raises ValueError, OverflowError or struct.error for tasks the format
+    # cannot hold (aware datetimes, ids outside 0..2**128, non-integer fields)
+    strings: List[str] = []
+    string_ids = {}
+
+    def intern(value: str) -> int:
+        index = string_ids.get(value)
+        if index is None:
+            index = string_ids[value] = len(strings)
+            strings.append(value)
+        return index
+
+    records = []
+    sessions: List[int] = []
+    depends: List[int] = []
+    for task in tasks:
+        if not 0 <= task.id < ID_LIMIT:
+            raise OverflowError(f"task id {task.id} does not fit")
+        flags = 0
+        if task.flexible:
+            flags |= FLEXIBLE
+        if task.is_completed:
+            flags |= COMPLETED
+        if task.earliest_start_time is not None:
+            flags |= HAS_EARLIEST
+        if task.latest_end_time is not None:
+            flags |= HAS_LATEST
+        if task.deadline is not None:
+            flags |= HAS_DEADLINE
+        if task.active_session_start is not None:
+            flags |= HAS_ACTIVE
+        if task.description is not None:
+            flags |= HAS_DESCRIPTION
+
+        records.append(
+            RECORD.pack(
+                task.id >> 64,
+                task.id & LOW_MASK,
+                task.duration_minutes,
+                task.priority,
+                task.energy_level,
+                _time_to_micros(task.earliest_start_time)
+                if task.earliest_start_time
+                else 0,
+                _time_to_micros(task.latest_end_time) if task.latest_end_time else 0,
+                flags,
+                intern(task.title),
+                intern(task.description) if task.description is not None else 0,
+                # Saved files give every task a date, as tasks.json does
+                (task.scheduled_date or date.today()).toordinal(),
+                _datetime_to_micros(task.deadline) if task.deadline else 0,
+                _datetime_to_micros(task.active_session_start)
+                if task.active_session_start
+                else 0,
+                len(task.work_sessions),
+                len(task.depends_on),
+            )
+        )
+        for start, end in task.work_sessions:
+            sessions.append(_datetime_to_micros(start))
+            sessions.append(_datetime_to_micros(end))
+        for dep_id in task.depends_on:
+            if not 0 <= dep_id < ID_LIMIT:
+                raise OverflowError(f"dependency id {dep_id} does not fit")
+            depends.append(dep_id >> 64)
+            depends.append(dep_id & LOW_MASK)
+
+    blob = "".join(strings).encode("utf-8")
+    return b"".join(
+        [
+            HEADER.pack(
+                MAGIC,
+                source_size,
+                source_mtime_ns,
+                len(tasks),
+                len(strings),
+                len(sessions),
+                len(depends),
+            ),
+            struct.pack(f"<{len(strings)}I", *(len(s) for s in strings)),
+            struct.pack("<Q", len(blob)),
+            blob,
+            *records,
+            struct.pack(f"<{len(sessions)}q", *sessions),
+            struct.pack(f"<{len(depends)}Q", *depends),
+        ]
+    )
+
+
+def _sections(data: bytes):
+    # (task count, strings, record bytes, offset of the sessions, session count,
+    # dependency ids as high/low halves)
+    (
+        magic,
+        _,
+        _,
+        task_count,
+        string_count,
+        session_count,
+        depend_count,
+    ) = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a task snapshot")
+    offset = HEADER.size
+
+    lengths = struct.unpack_from(f"<{string_count}I", data, offset)
+    offset += 4 * string_count
+    (blob_size,) = struct.unpack_from("<Q", data, offset)
+    offset += 8
+    text = data[offset : offset + blob_size].decode("utf-8")
+    offset += blob_size
+    strings = []
+    position = 0
+    for length in lengths:
+        strings.append(text[position : position + length])
+        position += length
+
+    records_end = offset + RECORD.size * task_count
+    records = data[offset:records_end]
+    sessions_offset = records_end
+    offset = records_end + 8 * session_count
+    depends = struct.unpack_from(f"<{depend_count}Q", data, offset)
+    return task_count, strings, records, sessions_offset, session_count, depends
+
+
+def _session_array(data: bytes, offset: int, count: int) -> array:
+    sessions = array("q")
+    sessions.frombytes(data[offset : offset + 8 * count])
+    if sys.byteorder != "little":
+        sessions.byteswap()
+    return sessions
+
+
+def iter_tasks(data: bytes, lazy: bool = False) -> Iterator[Task]:
+    _, strings, records, sessions_offset, session_count, depends = _sections(data)
+    records = RECORD.iter_unpack(records)
+    if lazy:
+        # Sessions stay in one array until a task's are read
+        sessions = _session_array(data, sessions_offset, session_count)
+    else:
+        sessions = struct.unpack_from(f"<{session_count}q", data, sessions_offset)
+
+    # Boards repeat the same few times of day and dates, so each is built once
+    times = {}
+    dates = {}
+    next_session = 0
+    next_depend = 0
+    if lazy:
+        source = _SnapshotSource(sessions, times, dates)
+    for (
+        id_high,
+        id_low,
+        duration_minutes,
+        priority,
+        energy_level,
+        earliest,
+        latest,
+        flags,
+        title,
+        description,
+        scheduled_date,
+        deadline,
+        active,
+        n_sessions,
+        n_depends,
+    ) in records:
+        depends_on = []
+        if n_depends:
+            end = next_depend + 2 * n_depends
+            for index in range(next_depend, end, 2):
+                depends_on.append((depends[index] << 64) | depends[index + 1])
+            next_depend = end
+
+        if lazy:
+            yield (
+                SnapshotTask(
+                    source,
+                    (id_high << 64) | id_low,
+                    strings[title],
+                    duration_minutes,
+                    priority,
+                    earliest if flags & HAS_EARLIEST else None,
+                    latest if flags & HAS_LATEST else None,
+                    flags,
+                    strings[description] if flags & HAS_DESCRIPTION else None,
+                    scheduled_date,
+                    deadline if flags & HAS_DEADLINE else None,
+                    energy_level,
+                    (next_session, n_sessions) if n_sessions else None,
+                    active if flags & HAS_ACTIVE else None,
+                    depends_on,
+                )
+            )
+            next_session += 2 * n_sessions
+            continue
+
+        work_sessions = []
+        if n_sessions:
+            end = next_session + 2 * n_sessions
+            for index in range(next_session, end, 2):
+                work_sessions.append(
+                    (
+                        EPOCH + timedelta(microseconds=sessions[index]),
+                        EPOCH + timedelta(microseconds=sessions[index + 1]),
+                    )
+                )
+            next_session = end
+
+        if flags & HAS_EARLIEST:
+            earliest_time = times.get(earliest)
+            if earliest_time is None:
+                earliest_time = times[earliest] = _micros_to_time(earliest)
+        else:
+            earliest_time = None
+        if flags & HAS_LATEST:
+            latest_time = times.get(latest)
+            if latest_time is None:
+                latest_time = times[latest] = _micros_to_time(latest)
+        else:
+            latest_time = None
+        day = dates.get(scheduled_date)
+        if day is None:
+            day = dates[scheduled_date] = date.fromordinal(scheduled_date)
+
+        # Positional, in Task's field order, which is faster than keywords
+        yield (
+            Task(
+                (id_high << 64) | id_low,
+                strings[title],
+                duration_minutes,
+                priority,
+                earliest_time,
+                latest_time,
+                bool(flags & FLEXIBLE),
+                bool(flags & COMPLETED),
+                strings[description] if flags & HAS_DESCRIPTION else None,
+                day,
+                EPOCH + timedelta(microseconds=deadline)
+                if flags & HAS_DEADLINE
+                else None,
+                energy_level,
+                work_sessions,
+                EPOCH + timedelta(microseconds=active) if flags & HAS_ACTIVE else None,
+                depends_on,
+            )
+        )
+
+
+def decode_tasks(data: bytes, lazy: bool = False) -> List[Task]:
+    return list(iter_tasks(data, lazy))
+
+
+def decode_task_table(data: bytes) -> TaskTable:
+    # Straight into columns, without building a Task per record. The session
+    # array is copied as it is, since the snapshot already holds sessions as
+    # microseconds since the epoch.
+    task_count, strings, records, sessions_offset, session_count, depends = _sections(
+        data
+    )
+    if not task_count:
+        return TaskTable()
+    (
+        id_high,
+        id_low,
+        duration_minutes,
+        priority,
+        energy_level,
+        earliest,
+        latest,
+        flags,
+        title,
+        description,
+        scheduled_date,
+        deadline,
+        active,
+        n_sessions,
+        n_depends,
+    ) = zip(*RECORD.iter_unpack(records))
+
+    if any(id_high) or any(depends[0::2]):
+        # Ids past 64 bits take the slower path through Task objects
+        return TaskTable.from_tasks(iter_tasks(data))
+    try:
+        ids = array("q", id_low)
+        depend_ids = array("q", depends[1::2])
+    except OverflowError:
+        return TaskTable.from_tasks(iter_tasks(data))
+
+    times = {}
+    dates = {}
+
+    def time_of(micros: int, flag: int, present: int) -> Optional[time]:
+        if not flag & present:
+            return None
+        moment = times.get(micros)
+        if moment is None:
+            moment = times[micros] = _micros_to_time(micros)
+        return moment
+
+    def date_of(ordinal: int) -> date:
+        day = dates.get(ordinal)
+        if day is None:
+            day = dates[ordinal] = date.fromordinal(ordinal)
+        return day
+
+    def datetime_of(micros: int, flag: int, present: int) -> Optional[datetime]:
+        return EPOCH + timedelta(microseconds=micros) if flag & present else None
+
+    columns = {
+        "duration_minutes": array("l", duration_minutes),
+        "priority": array("l", priority),
+        "energy_level": array("l", energy_level),
+        "flexible": array("b", [flag & FLEXIBLE and 1 for flag in flags]),
+        "is_completed": array("b", [flag & COMPLETED and 1 for flag in flags]),
+        "title": [strings[index] for index in title],
+        "earliest_start_time": [
+            time_of(m, f, HAS_EARLIEST) for m, f in zip(earliest, flags)
+        ],
+        "latest_end_time": [time_of(m, f, HAS_LATEST) for m, f in zip(latest, flags)],
+        "description": [
+            strings[index] if flag & HAS_DESCRIPTION else None
+            for index, flag in zip(description, flags)
+        ],
+        "scheduled_date": [date_of(ordinal) for ordinal in scheduled_date],
+        "deadline": [datetime_of(m, f, HAS_DEADLINE) for m, f in zip(deadline, flags)],
+        "active_session_start": [
+            datetime_of(m, f, HAS_ACTIVE) for m, f in zip(active, flags)
+        ],
+    }
+    return TaskTable.from_columns(
+        ids,
+        columns,
+        _session_array(data, sessions_offset, session_count),
+        array("l", accumulate((2 * n for n in n_sessions), initial=0)),
+        depend_ids,
+        array("l", accumulate(n_depends, initial=0)),
+    )
+
+
+def write_snapshot(path: Path, tasks: List[Task], source: Path) -> None:
+    # Snapshot of `tasks`, which were just written to `source`. Boards the
+    # format cannot hold get no snapshot, and any old one is removed.
+    stat = source.stat()
+    try:
+        data = encode_tasks(tasks, stat.st_size, stat.st_mtime_ns)
+    except (ValueError, OverflowError, TypeError, struct.error):
+        path.unlink(missing_ok=True)
+        return
+    write_atomic(path, data)
+
+
+def _read_current(path: Path, source: Path) -> Optional[bytes]:
+    # The snapshot if it was made from `source` as it is now, else None
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        stat = source.stat()
+    except FileNotFoundError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, size, mtime_ns = HEADER.unpack_from(data)[:3]
+    if magic != MAGIC or (size, mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+        return None
+    return data
+
+
+def snapshot_is_current(path: Path, source: Path) -> bool:
+    # Whether the snapshot was made from `source` as it is now, from its header
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+        stat = source.stat()
+    except FileNotFoundError:
+        return False
+    if len(header) < HEADER.size:
+        return False
+    magic, size, mtime_ns = HEADER.unpack(header)[:3]
+    return magic == MAGIC and (size, mtime_ns) == (stat.st_size, stat.st_mtime_ns)
+
+
+def read_snapshot(path: Path, source: Path, lazy: bool = False) -> Optional[List[Task]]:
+    data = _read_current(path, source)
+    if data is None:
+        return None
+    try:
+        return decode_tasks(data, lazy)
+    except (ValueError, struct.error):
+        return None
+
+
+def read_snapshot_table(path: Path, source: Path) -> Optional[TaskTable]:
+    # As read_snapshot, but into a TaskTable
+    data = _read_current(path, source)
+    if data is None:
+        return None
+    try:
+        return decode_task_table(data)
+    except (ValueError, struct.error):
+        return None
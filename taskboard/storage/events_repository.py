@@ -1,11 +1,30 @@
+import heapq
 import json
-from datetime import datetime
+from dataclasses import dataclass, replace
+from datetime import date, datetime
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Set
 
 from taskboard.models.event import Event
+from taskboard.models.slots import SLOTS
+from taskboard.storage.atomic import write_if_changed
+from taskboard.storage.lazy_records import JsonEvent
+from taskboard.storage.settings import (
+    EVENTS_PATH,
+    RECURRING_PATH,
+    SYNC_STATE_PATH,
+    backend_name,
+    db_path,
+    event_layout,
+    lazy_records,
+)
+from taskboard.storage.store import EventStore
+from taskboard.storage.write_log import log_skip
 
-DATA_PATH = Path(__file__).parent / "events.json"
+DATA_PATH = EVENTS_PATH
+
+# Set by the daemon (taskboard.cli.serve) to the events it holds in memory
+resident_store: Optional[EventStore] = None
 
 
 def _serialize_event(event: Event) -> dict:
@@ -32,16 +51,289 @@ def _deserialize_event(data: dict) -> Event:
     )
 
 
-def load_events() -> List[Event]:
-    if not DATA_PATH.exists():
+def in_range(
+    event: Event, start_date: Optional[date], end_date: Optional[date]
+) -> bool:
+    # Whether the event starts within [start_date, end_date]; None is unbounded
+    day = event.start.date()
+    return (start_date is None or day >= start_date) and (
+        end_date is None or day <= end_date
+    )
+
+
+def merge_changes(
+    stored: List[Event], events: List[Event], removed: Set[int]
+) -> List[Event]:
+    # The stored events with `events` in place of those with the same id, the
+    # new ones after them, and the removed ones left out
+    changed = {event.id: event for event in events}
+    merged = [changed.pop(e.id, e) for e in stored if e.id not in removed]
+    return merged + list(changed.values())
+
+
+class JsonEventStore:
+    # All events in one JSON file, rewritten on every save. With lazy, loaded
+    # events parse their start and end on first read.
+    def __init__(self, path: Path, lazy: bool = False):
+        self.path = path
+        self.lazy = lazy
+
+    def load(
+        self, start_date: Optional[date] = None, end_date: Optional[date] = None
+    ) -> List[Event]:
+        if not self.path.exists():
+            return []
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        decode = JsonEvent if self.lazy else _deserialize_event
+        events = [decode(item) for item in data]
+        if start_date or end_date:
+            events = [e for e in events if in_range(e, start_date, end_date)]
+        return events
+
+    def save(self, events: List[Event]) -> None:
+        # Sort events by start time, then by title. Unchanged boards are not
+        # written again.
+        events.sort(key=lambda e: (e.start, e.title))
+        data = json.dumps([_serialize_event(event) for event in events], indent=2)
+        write_if_changed(self.path, data.encode())
+
+    def save_one(self, event: Event) -> None:
+        events = self.load()
+        for index, stored in enumerate(events):
+            if stored.id == event.id:
+                if stored == event:
+                    log_skip(self.path, f"event {event.id} unchanged")
+                    return
+                events[index] = event
+                break
+        else:
+            events.append(event)
+        self.save(events)
+
+    def save_changes(self, events: List[Event], removed: Set[int]) -> None:
+        self.save(merge_changes(self.load(), events, removed))
+
+    def fingerprint(self) -> bytes:
+        return self.path.read_bytes() if self.path.exists() else b""
+
+
+def get_event_store() -> EventStore:
+    if resident_store is not None:
+        return resident_store
+    backend = backend_name()
+    if backend == "sqlite":
+        from taskboard.storage.sqlite_store import SqliteEventStore
+
+        return SqliteEventStore(db_path())
+    if backend == "jsonl":
+        from taskboard.storage.jsonl_store import JsonlEventStore
+
+        return JsonlEventStore(
+            DATA_PATH.with_name("events.jsonl"),
+            seed_path=DATA_PATH,
+            lazy=lazy_records(),
+        )
+    if event_layout() == "monthly":
+        from taskboard.storage.partitioned_events import PartitionedEventStore
+
+        return PartitionedEventStore(DATA_PATH.with_name("events"), seed_path=DATA_PATH)
+    return JsonEventStore(DATA_PATH, lazy=lazy_records())
+
+
+def get_recurring_store():
+    from taskboard.storage.recurring_events import RecurringEventStore
+
+    return RecurringEventStore(RECURRING_PATH)
+
+
+def _occurrences(start_date: Optional[date], end_date: Optional[date]) -> List[Event]:
+    # Occurrences of imported repeating events. Only reads of a date range
+    # expand them; without a calendar import, nothing more is imported.
+    if start_date is None or end_date is None or not RECURRING_PATH.exists():
         return []
-    with open(DATA_PATH, "r") as f:
-        data = json.load(f)
-    return [_deserialize_event(item) for item in data]
+    return get_recurring_store().occurrences(start_date, end_date)
+
+
+def load_events(
+    start_date: Optional[date] = None, end_date: Optional[date] = None
+) -> List[Event]:
+    # Events starting on a day in [start_date, end_date], or all stored events
+    events = get_event_store().load(start_date, end_date)
+    occurrences = _occurrences(start_date, end_date)
+    if occurrences:
+        events = sorted(events + occurrences, key=lambda e: (e.start, e.title))
+    return events
+
+
+def iter_events(
+    start_date: Optional[date] = None, end_date: Optional[date] = None
+) -> Iterator[Event]:
+    # As load_events, in stored order (by start time, then title), with
+    # occurrences of repeating events merged in. Stores that can stream (jsonl)
+    # yield each event as soon as it is read.
+    store = get_event_store()
+    if hasattr(store, "iter"):
+        events = store.iter(start_date, end_date)
+    else:
+        events = iter(store.load(start_date, end_date))
+    if not RECURRING_PATH.exists():
+        return events
+    return heapq.merge(
+        events,
+        _occurrences(start_date, end_date),
+        key=lambda e: (e.start, e.title),
+    )
 
 
 def save_events(events: List[Event]):
-    # Sort events by start time, then by title
-    events.sort(key=lambda e: (e.start, e.title))
-    with open(DATA_PATH, "w") as f:
-        json.dump([_serialize_event(event) for event in events], f, indent=2)
+    get_event_store().save(events)
+
+
+def save_event(event: Event):
+    # Insert or update a single event
+    get_event_store().save_one(event)
+
+
+def events_fingerprint() -> bytes:
+    fingerprint = get_event_store().fingerprint()
+    if RECURRING_PATH.exists():
+        fingerprint += b"\0" + RECURRING_PATH.read_bytes()
+    return fingerprint
+
+
+@dataclass(**SLOTS)
+class SyncResult:
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    # The source's sync token matched the last sync's, so nothing was read
+    up_to_date: bool = False
+
+
+def _digest(data: bytes, size: int = 16) -> str:
+    from hashlib import blake2b
+
+    return blake2b(data, digest_size=size).hexdigest()
+
+
+def _content_hash(event: Event) -> str:
+    # Everything a calendar can change about an event; the id is ours. Hashed
+    # for every event of every sync, so kept to one f-string (json.dumps took
+    # 40% longer).
+    fields = f"{event.title}\0{event.start}\0{event.end}\0{event.description!r}"
+    return _digest(fields.encode(), 8)
+
+
+def _read_sync_state() -> dict:
+    try:
+        with open(SYNC_STATE_PATH, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _current_sources(store: EventStore) -> Dict[str, dict]:
+    # The sync index of each source; none can be trusted once something else
+    # wrote to the store
+    state = _read_sync_state()
+    if state.get("store") != _digest(store.fingerprint()):
+        return {}
+    return state.get("sources", {})
+
+
+def _write_sync_state(store: EventStore, sources: Dict[str, dict]) -> None:
+    state = {"store": _digest(store.fingerprint()), "sources": sources}
+    write_if_changed(SYNC_STATE_PATH, json.dumps(state, separators=(",", ":")).encode())
+
+
+def is_synced(source: str, token: str) -> bool:
+    # Whether the last sync of `source` was made from `token` and nothing has
+    # written to the store since
+    previous = _current_sources(get_event_store()).get(source)
+    return previous is not None and previous["token"] == token
+
+
+def record_sync_token(source: str, token: str) -> None:
+    # Marks the last sync of `source` as made from `token`, for callers that
+    # write more than the events before the sync counts as done
+    store = get_event_store()
+    sources = _current_sources(store)
+    if source in sources:
+        sources[source]["token"] = token
+        _write_sync_state(store, sources)
+
+
+def sync_events(
+    source: str, events: Iterable[Event], token: Optional[str] = None
+) -> SyncResult:
+    # Makes the stored events of `source` match `events`, a full listing of the
+    # calendar, matched by external_id: new ones are added, changed ones
+    # updated in place (keeping their ids) and missing ones removed, in one
+    # store write that touches only those events. Stored events of the source
+    # without an external_id are left alone. A listing that repeats an
+    # external_id raises ValueError before anything is written.
+    #
+    # Matching goes through a hash index of the source's events, external_id
+    # -> [id, content hash], kept in SYNC_STATE_PATH from the last sync along
+    # with its sync token. A sync does not read the stored events, and does not
+    # read `events` at all when `token` (a calendar's sync token, or a digest
+    # of an export) is unchanged. The index is built from the store again when
+    # something else wrote to it since.
+    store = get_event_store()
+    sources = _current_sources(store)
+    previous = sources.get(source)
+    if previous is not None:
+        if token is not None and previous["token"] == token:
+            return SyncResult(unchanged=len(previous["events"]), up_to_date=True)
+        known = previous["events"]
+    else:
+        known = {
+            event.external_id: [event.id, _content_hash(event)]
+            for event in store.load()
+            if event.source == source and event.external_id is not None
+        }
+
+    result = SyncResult()
+    index: Dict[str, list] = {}
+    changed: Dict[str, Event] = {}
+    repeated: List[str] = []
+    for event in events:
+        if event.source != source or event.external_id is None:
+            raise ValueError(
+                f"Cannot sync event {event.title!r} into {source!r}: it needs "
+                f"source {source!r} and an external_id"
+            )
+        if event.external_id in index:
+            # Keeping either copy would hide a broken listing
+            repeated.append(event.external_id)
+            continue
+        digest = _content_hash(event)
+        stored = known.get(event.external_id)
+        if stored is not None and stored[0] != event.id:
+            event = replace(event, id=stored[0])
+        index[event.external_id] = [event.id, digest]
+        if stored is None or stored[1] != digest:
+            changed[event.external_id] = event
+    if repeated:
+        shown = ", ".join(repr(external_id) for external_id in repeated[:3])
+        raise ValueError(
+            f"Cannot sync {source!r}: {len(repeated)} events repeat an "
+            f"external_id listed before them ({shown}"
+            f"{', ...' if len(repeated) > 3 else ''})"
+        )
+    removed = {
+        stored[0] for external_id, stored in known.items() if external_id not in index
+    }
+
+    result.added = sum(1 for key in changed if key not in known)
+    result.updated = len(changed) - result.added
+    result.removed = len(removed)
+    result.unchanged = len(index) - len(changed)
+    if changed or removed:
+        store.save_changes(list(changed.values()), removed)
+
+    sources[source] = {"token": token, "events": index}
+    _write_sync_state(store, sources)
+    return result
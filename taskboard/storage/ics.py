@@ -0,0 +1,255 @@
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from taskboard.core.recurrence import occurrence_id, parse_rule, to_local, zone_named
+from taskboard.models.event import Event, external_event_id
+from taskboard.models.recurring_event import RecurringEvent
+
+# A property's parameters and value, e.g. ({"TZID": "Europe/Berlin"}, "20261019T090000")
+Property = Tuple[Dict[str, str], str]
+# The properties of one component by name, each in the order they appear
+Component = Dict[str, List[Property]]
+
+DURATION = re.compile(
+    r"([+-]?)P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?"
+)
+# Everything before the colon that ends a property's name and parameters
+PROPERTY_HEAD = re.compile(r'(?:[^:"]|"[^"]*")*')
+TEXT_ESCAPES = {"n": "\n", "N": "\n", ",": ",", ";": ";", "\\": "\\"}
+
+
+def unfold(lines: Iterable[str]) -> Iterator[str]:
+    # Content lines with folding undone: a line starting with a space or a tab
+    # continues the one before it
+    current = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def parse_property(line: str) -> Tuple[str, Dict[str, str], str]:
+    # NAME;PARAM=value;PARAM="quoted:value":value
+    position = line.find(":")
+    if position < 0:
+        raise ValueError(f"Not an iCalendar content line: {line[:60]!r}")
+    head = line[:position]
+    if ";" not in head:
+        return head.upper(), {}, line[position + 1 :]
+    if '"' in head:
+        # A quoted parameter value may hold the colon
+        match = PROPERTY_HEAD.match(line)
+        if match is None or match.end() == len(line):
+            raise ValueError(f"Not an iCalendar content line: {line[:60]!r}")
+        position = match.end()
+        head = line[:position]
+    name, *params = re.findall(r'(?:[^;"]|"[^"]*")+', head)
+    parameters = {}
+    for param in params:
+        key, _, value = param.partition("=")
+        parameters[key.upper()] = value.strip('"')
+    return name.upper(), parameters, line[position + 1 :]
+
+
+def iter_components(lines: Iterable[str], kind: str = "VEVENT") -> Iterator[Component]:
+    # Components of one kind, each yielded as soon as its END line is read, so
+    # only one is held at a time. Properties of components nested inside it
+    # (an event's VALARMs) are left out.
+    component: Optional[Component] = None
+    depth = 0
+    for line in unfold(lines):
+        name, params, value = parse_property(line)
+        if component is None:
+            if name == "BEGIN" and value.upper() == kind:
+                component = {}
+            continue
+        if name == "BEGIN":
+            depth += 1
+        elif name == "END" and depth:
+            depth -= 1
+        elif name == "END":
+            yield component
+            component = None
+        elif not depth:
+            component.setdefault(name, []).append((params, value))
+
+
+def unescape(text: str) -> str:
+    if "\\" not in text:
+        return text
+    return re.sub(r"\\(.)", lambda match: TEXT_ESCAPES.get(match[1], match[1]), text)
+
+
+def _basic_format(value: str) -> datetime:
+    # 20261019 or 20261019T090000, read by position: strptime would be most of
+    # the time spent reading a large calendar
+    if not value.isascii() or len(value) not in (8, 15) or value[8:9] not in ("", "T"):
+        raise ValueError(f"Invalid date or time: {value!r}")
+    fields = [
+        value[0:4],
+        value[4:6],
+        value[6:8],
+        value[9:11],
+        value[11:13],
+        value[13:15],
+    ]
+    return datetime(*(int(field) for field in fields if field))
+
+
+def parse_moment(
+    params: Dict[str, str], value: str
+) -> Tuple[datetime, Optional[str], bool]:
+    # A DATE or DATE-TIME value as (wall time, time zone name, whether it is a
+    # date). UTC times come back with the zone "UTC"; floating ones with None.
+    value = value.strip()
+    if params.get("VALUE", "").upper() == "DATE" or len(value) == 8:
+        return _basic_format(value), None, True
+    if value.endswith("Z"):
+        return _basic_format(value[:-1]), "UTC", False
+    return _basic_format(value), params.get("TZID"), False
+
+
+def parse_duration(value: str) -> timedelta:
+    match = DURATION.fullmatch(value.strip())
+    if match is None or not any(match.groups()[1:]):
+        raise ValueError(f"Invalid DURATION: {value!r}")
+    weeks, days, hours, minutes, seconds = (
+        int(part or 0) for part in match.groups()[1:]
+    )
+    duration = timedelta(
+        weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds
+    )
+    return -duration if match[1] == "-" else duration
+
+
+def _in_zone(
+    moment: datetime, zone_name: Optional[str], target: Optional[str]
+) -> datetime:
+    # Wall time in one zone as wall time in another, for EXDATEs and
+    # RECURRENCE-IDs given in a different zone than their series
+    if zone_name == target:
+        return moment
+    zone, target_zone = zone_named(zone_name), zone_named(target)
+    if zone is None and target_zone is None:
+        return moment
+    aware = moment.replace(tzinfo=zone) if zone is not None else moment.astimezone()
+    return aware.astimezone(target_zone).replace(tzinfo=None)
+
+
+def _text(component: Component, name: str) -> Optional[str]:
+    values = component.get(name)
+    return unescape(values[0][1]) if values else None
+
+
+class IcsReader:
+    # Reads the events of an .ics file line by line. Iterating gives an Event
+    # for every single event as soon as it is read, then a RecurringEvent for
+    # every repeating one: those are held back until the end of the file,
+    # because the VEVENTs that move or cancel one of their occurrences may come
+    # after them. Moved occurrences are single Events with the external id of
+    # the occurrence they replace.
+    #
+    # Events marked free (TRANSP:TRANSPARENT) or cancelled are left out, since
+    # the planner treats every event as busy. Events it cannot read are left
+    # out too, with the reason in `skipped`.
+
+    def __init__(self, path: Path, source: str = "ics"):
+        self.path = path
+        self.source = source
+        self.skipped: List[str] = []
+
+    def __iter__(self) -> Iterator[Union[Event, RecurringEvent]]:
+        series: Dict[str, RecurringEvent] = {}
+        exdates: Dict[str, List[Tuple[datetime, Optional[str]]]] = {}
+        with open(self.path, encoding="utf-8", errors="replace", newline="") as f:
+            for component in iter_components(f):
+                uid = _text(component, "UID") or ""
+                try:
+                    event = self._read(component, uid, exdates)
+                except ValueError as error:
+                    self.skipped.append(f"{uid or 'event without UID'}: {error}")
+                    continue
+                if isinstance(event, RecurringEvent):
+                    series[uid] = event
+                elif event is not None:
+                    yield event
+
+        for uid, event in series.items():
+            for moment, zone_name in exdates.get(uid, ()):
+                event.exdates.append(_in_zone(moment, zone_name, event.timezone))
+            yield event
+
+    def _read(
+        self, component: Component, uid: str, exdates
+    ) -> Union[Event, RecurringEvent, None]:
+        if not uid:
+            raise ValueError("no UID")
+        if "DTSTART" not in component:
+            raise ValueError("no DTSTART")
+        start, zone_name, all_day = parse_moment(*component["DTSTART"][0])
+        recurrence_id = None
+        if "RECURRENCE-ID" in component:
+            moment, moment_zone, _ = parse_moment(*component["RECURRENCE-ID"][0])
+            recurrence_id = (moment, moment_zone)
+            # Moved or cancelled, this occurrence no longer comes from the rule
+            exdates.setdefault(uid, []).append(recurrence_id)
+
+        status = (_text(component, "STATUS") or "").upper()
+        transparency = (_text(component, "TRANSP") or "").upper()
+        if status == "CANCELLED" or transparency == "TRANSPARENT":
+            return None
+
+        if "DTEND" in component:
+            end, end_zone, _ = parse_moment(*component["DTEND"][0])
+            end = _in_zone(end, end_zone, zone_name)
+        elif "DURATION" in component:
+            end = start + parse_duration(component["DURATION"][0][1])
+        else:
+            # An all-day event without an end lasts the day
+            end = start + timedelta(days=1 if all_day else 0)
+        if end <= start:
+            raise ValueError("ends before it starts")
+
+        title = _text(component, "SUMMARY") or "(no title)"
+        description = _text(component, "DESCRIPTION")
+        if "RRULE" in component and recurrence_id is None:
+            # Checked now, so that a rule that cannot be expanded is reported
+            # here rather than failing every later read
+            parse_rule(component["RRULE"][0][1], zone_named(zone_name))
+            series = RecurringEvent(
+                uid=uid,
+                title=title,
+                start=start,
+                end=end,
+                rule=component["RRULE"][0][1],
+                description=description,
+                source=self.source,
+                timezone=zone_name,
+            )
+            for params, value in component.get("EXDATE", ()):
+                for item in value.split(","):
+                    moment, moment_zone, _ = parse_moment(params, item)
+                    series.exdates.append(_in_zone(moment, moment_zone, zone_name))
+            return series
+
+        external_id = uid
+        if recurrence_id is not None:
+            external_id = occurrence_id(uid, _in_zone(*recurrence_id, zone_name))
+        zone = zone_named(zone_name)
+        return Event(
+            id=external_event_id(self.source, external_id),
+            title=title,
+            start=to_local(start, zone),
+            end=to_local(end, zone),
+            description=description,
+            source=self.source,
+            external_id=external_id,
+        )
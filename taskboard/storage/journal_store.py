@@ -0,0 +1,186 @@
+import json
+import os
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from taskboard.models.task import Task
+from taskboard.storage.atomic import write_atomic
+from taskboard.storage.tasks_repository import (
+    JsonTaskStore,
+    _deserialize_task,
+    _serialize_task,
+)
+from taskboard.storage.write_log import log_skip, log_write
+
+# Once the journal grows past this many bytes it is folded into the snapshot
+COMPACT_BYTES = 256 * 1024
+
+
+def _sort_key(task: Task) -> tuple:
+    # The order JsonTaskStore.save sorts by
+    return (task.scheduled_date or date.today(), task.priority)
+
+
+class JournalTaskStore:
+    # A snapshot of the board plus an append-only journal of the tasks saved
+    # since. save_one() appends one fsync'd record, so its cost does not depend
+    # on the size of the board. Every snapshot starts a new generation and the
+    # journal only counts when its header names the snapshot's generation; a
+    # crash between writing a snapshot and resetting the journal therefore
+    # never replays records twice.
+
+    def __init__(
+        self,
+        snapshot_path: Path,
+        journal_path: Path,
+        seed_path: Optional[Path] = None,
+        compact_bytes: int = COMPACT_BYTES,
+    ):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        # Board to start from before the first snapshot (the JSON store's file)
+        self.seed_path = seed_path
+        self.compact_bytes = compact_bytes
+
+    def fingerprint(self) -> bytes:
+        if not self.snapshot_path.exists() and self.seed_path is not None:
+            return JsonTaskStore(self.seed_path).fingerprint()
+        parts = []
+        for path in (self.snapshot_path, self.journal_path):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                parts.append("-")
+                continue
+            parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+        return f"journal:{':'.join(parts)}".encode()
+
+    def load(self) -> List[Task]:
+        generation, tasks = self._read_snapshot()
+        records = self._read_journal(generation)
+        if not records:
+            return tasks
+
+        # Replays each record the way JsonTaskStore.save_one would apply it: the
+        # task replaces its old copy, then a stable sort moves it among the tasks
+        # that share its sort key. Rather than sorting after every record, each
+        # task gets a position within its key: an unchanged key keeps it, a key
+        # that went up puts the task before the others, and a new task or a key
+        # that went down puts it after them.
+        by_id: Dict[int, Task] = {}
+        placed: Dict[int, Tuple[tuple, int]] = {}
+        bounds: Dict[tuple, List[int]] = {}
+        for position, task in enumerate(tasks):
+            key = _sort_key(task)
+            by_id[task.id] = task
+            placed[task.id] = (key, position)
+            bounds.setdefault(key, [position, position])[1] = position
+
+        for record in records:
+            task = _deserialize_task(record["task"])
+            key = _sort_key(task)
+            low, high = bounds.setdefault(key, [0, 0])
+            old_key, old_position = placed.get(task.id, (None, None))
+            if old_key == key:
+                position = old_position
+            elif old_key is not None and old_key < key:
+                position = low - 1
+                bounds[key][0] = position
+            else:
+                position = high + 1
+                bounds[key][1] = position
+            by_id[task.id] = task
+            placed[task.id] = (key, position)
+
+        return sorted(by_id.values(), key=lambda task: placed[task.id])
+
+    def save(self, tasks: List[Task]) -> None:
+        # Sort tasks by scheduled date and priority before saving
+        tasks.sort(key=_sort_key)
+        generation, stored = self._read_snapshot()
+        if (
+            self.snapshot_path.exists()
+            and stored == tasks
+            and not self._read_journal(generation)
+        ):
+            log_skip(self.snapshot_path)
+            return
+        self._write_generation(generation + 1, tasks)
+
+    def save_one(self, task: Task) -> None:
+        if not self.snapshot_path.exists():
+            # Pin the seed board down first, so later edits to it do not slip
+            # under the journal
+            _, tasks = self._read_snapshot()
+            self._write_generation(1, tasks)
+        elif not self.journal_path.exists():
+            generation, _ = self._read_snapshot()
+            write_atomic(self.journal_path, _journal_header(generation))
+
+        record = json.dumps({"op": "save", "task": _serialize_task(task)}).encode()
+        with open(self.journal_path, "a+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            # A record torn by a crash has no newline; start on a fresh line
+            if size:
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    record = b"\n" + record
+            f.write(record + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        log_write(self.journal_path, len(record) + 1)
+
+        if size > self.compact_bytes:
+            self.compact()
+
+    def compact(self) -> None:
+        self.save(self.load())
+
+    def _write_generation(self, generation: int, tasks: List[Task]) -> None:
+        snapshot = {
+            "generation": generation,
+            "tasks": [_serialize_task(task) for task in tasks],
+        }
+        write_atomic(self.snapshot_path, json.dumps(snapshot, indent=2).encode())
+        write_atomic(self.journal_path, _journal_header(generation))
+
+    def _read_snapshot(self) -> Tuple[int, List[Task]]:
+        if not self.snapshot_path.exists():
+            seed = JsonTaskStore(self.seed_path).load() if self.seed_path else []
+            return 0, seed
+        with open(self.snapshot_path, "r") as f:
+            snapshot = json.load(f)
+        return snapshot["generation"], [
+            _deserialize_task(item) for item in snapshot["tasks"]
+        ]
+
+    def _read_journal(self, generation: int) -> List[dict]:
+        try:
+            with open(self.journal_path, "rb") as f:
+                lines = f.read().split(b"\n")
+        except FileNotFoundError:
+            return []
+
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            return []
+        if header.get("generation") != generation:
+            return []
+
+        records = []
+        for line in lines[1:]:
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # Torn by a crash while being appended
+                continue
+        return records
+
+
+def _journal_header(generation: int) -> bytes:
+    return json.dumps({"generation": generation}).encode() + b"\n"
@@ -0,0 +1,445 @@
+import json
+import os
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from taskboard.models.event import Event
+from taskboard.models.task import Task
+from taskboard.storage.atomic import write_atomic, write_if_changed
+from taskboard.storage.events_repository import (
+    JsonEventStore,
+    _deserialize_event,
+    _serialize_event,
+)
+from taskboard.storage.lazy_records import JsonEvent, JsonTask
+from taskboard.storage.tasks_repository import (
+    JsonTaskStore,
+    _deserialize_task,
+    _serialize_task,
+)
+from taskboard.storage.write_log import log_write
+
+# Index name -> key -> byte offsets of the records with that key
+Index = Dict[str, Dict[str, List[int]]]
+
+
+def _task_sort_key(task: Task) -> tuple:
+    # The order JsonTaskStore.save sorts by
+    return (task.scheduled_date or date.today(), task.priority)
+
+
+def _event_sort_key(event: Event) -> tuple:
+    # The order JsonEventStore.save sorts by
+    return (event.start, event.title)
+
+
+def _raw_task_sort_key(raw: dict) -> tuple:
+    # _task_sort_key on a stored line; ISO dates sort as the dates do
+    return (raw["scheduled_date"] or date.today().isoformat(), raw["priority"])
+
+
+def _raw_event_sort_key(raw: dict) -> tuple:
+    return (raw["start"], raw["title"])
+
+
+def _encode(record: dict) -> bytes:
+    return json.dumps(record, separators=(",", ":")).encode() + b"\n"
+
+
+class _JsonLines:
+    # One JSON object per line, sorted as the JSON store would sort them,
+    # except that records added by save_one() are appended at the end. load()
+    # sorts with a stable sort, which puts each appended record where a full
+    # save would have, so all backends load the same order. Changing a record
+    # that is already stored rewrites the file.
+    #
+    # Next to the file sits a secondary index, `<name>.idx`: for each key that
+    # index_keys() gives a record, the byte offsets of the records with that
+    # key, so filtered reads seek to the matching lines only. Under "order" it
+    # keeps where the appended records start, so that ordered() can stream
+    # the sorted part of the file and merge the few appended records into it.
+    # It is rewritten on every save. It holds the size and mtime of the file
+    # it describes and is rebuilt by one scan when they no longer match (after
+    # a hand edit, or a crash between writing the file and its index).
+
+    def __init__(
+        self,
+        path: Path,
+        seed: Callable[[], list],
+        serialize: Callable[[object], dict],
+        sort_key: Callable[[object], tuple],
+        raw_sort_key: Callable[[dict], tuple],
+        index_keys: Callable[[dict], Dict[str, Optional[str]]],
+    ):
+        self.path = path
+        self.index_path = path.with_name(f"{path.name}.idx")
+        # Records to start from before the first write (the JSON store's file)
+        self.seed = seed
+        self.serialize = serialize
+        self.sort_key = sort_key
+        self.raw_sort_key = raw_sort_key
+        self.index_keys = index_keys
+
+    def lines(self) -> Iterator[dict]:
+        # Stored records in file order, parsed one line at a time. A line torn
+        # by a crash while appending is skipped.
+        if not self.path.exists():
+            for record in self.seed():
+                yield self.serialize(record)
+            return
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def lines_at(self, offsets: Iterable[int]) -> Iterator[dict]:
+        with open(self.path, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                yield json.loads(f.readline())
+
+    def _lines_between(self, start: int, end: Optional[int]) -> Iterator[dict]:
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if end is not None and offset >= end:
+                    return
+                offset += len(line)
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def ordered(
+        self, index: Index, offsets: Optional[Iterable[int]] = None
+    ) -> Iterator[dict]:
+        # The stored records, or those at `offsets`, in sort order. The sorted
+        # part of the file is yielded as it is read; the appended records
+        # after it are read first, sorted and merged in where load() would
+        # put them.
+        appended_from = index["order"]["appended"][0]
+        if offsets is None:
+            head = self._lines_between(0, appended_from)
+            appended = list(self._lines_between(appended_from, None))
+        else:
+            offsets = sorted(offsets)
+            head = self.lines_at(o for o in offsets if o < appended_from)
+            appended = list(self.lines_at(o for o in offsets if o >= appended_from))
+        if not appended:
+            return head
+        appended.sort(key=self.raw_sort_key)
+        return self._merge(head, appended)
+
+    def _merge(self, head: Iterator[dict], appended: List[dict]) -> Iterator[dict]:
+        # A stored record goes before an appended one with the same key, as
+        # in load()'s stable sort
+        key = self.raw_sort_key
+        position, next_key = 0, key(appended[0])
+        for raw in head:
+            if next_key is not None:
+                raw_key = key(raw)
+                while next_key is not None and next_key < raw_key:
+                    yield appended[position]
+                    position += 1
+                    next_key = (
+                        key(appended[position]) if position < len(appended) else None
+                    )
+            yield raw
+        yield from appended[position:]
+
+    def index(self) -> Optional[Index]:
+        # None until the file is first written
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        try:
+            with open(self.index_path, "rb") as f:
+                stored = json.load(f)
+            # Indexes written before "order" was kept are rebuilt
+            if (
+                stored["source"] == [stat.st_size, stat.st_mtime_ns]
+                and "order" in stored["keys"]
+            ):
+                return stored["keys"]
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+
+        index: Index = {}
+        offset = 0
+        # Records past the first one out of order are taken as appended
+        appended_from, last = None, None
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    raw = json.loads(line)
+                except ValueError:
+                    offset += len(line)
+                    continue
+                self._add(index, raw, offset)
+                if appended_from is None:
+                    key = self.raw_sort_key(raw)
+                    if last is not None and key < last:
+                        appended_from = offset
+                    last = key
+                offset += len(line)
+        appended_from = offset if appended_from is None else appended_from
+        index["order"] = {"appended": [appended_from]}
+        try:
+            self._write_index(index)
+        except OSError:
+            # Read-only data still reads, just without a saved index
+            pass
+        return index
+
+    def offsets(
+        self, index: Index, name: str, match: Callable[[str], bool]
+    ) -> Set[int]:
+        # Offsets of the records whose `name` key passes `match`
+        return {
+            offset
+            for key, offsets in index.get(name, {}).items()
+            if match(key)
+            for offset in offsets
+        }
+
+    def _add(self, index: Index, raw: dict, offset: int) -> None:
+        for name, key in self.index_keys(raw).items():
+            if key is not None:
+                index.setdefault(name, {}).setdefault(key, []).append(offset)
+
+    def _write_index(self, index: Index) -> None:
+        stat = self.path.stat()
+        data = {"source": [stat.st_size, stat.st_mtime_ns], "keys": index}
+        write_atomic(self.index_path, json.dumps(data, separators=(",", ":")).encode())
+
+    def save(self, records: list) -> None:
+        records.sort(key=self.sort_key)
+        index: Index = {}
+        lines = []
+        offset = 0
+        for record in records:
+            raw = self.serialize(record)
+            self._add(index, raw, offset)
+            lines.append(_encode(raw))
+            offset += len(lines[-1])
+        index["order"] = {"appended": [offset]}
+        if write_if_changed(self.path, b"".join(lines)):
+            self._write_index(index)
+
+    def _contains(self, ids: Set[int]) -> bool:
+        # Lines are written with the id first, so finding records only needs
+        # each line's first bytes, not a parse
+        prefixes = tuple(b'{"id":%d,' % id for id in ids)
+        with open(self.path, "rb") as f:
+            return any(line.startswith(prefixes) for line in f)
+
+    def save_one(self, record, load: Callable[[], list]) -> None:
+        self.save_changes([record], set(), load)
+
+    def save_changes(
+        self, records: list, removed: Set[int], load: Callable[[], list]
+    ) -> None:
+        # New records are appended in one write; changing or removing stored
+        # ones rewrites the file
+        if not self.path.exists():
+            self.save(self.seed())
+        if not records and not removed:
+            return
+        if removed or self._contains({record.id for record in records}):
+            changed = {record.id: record for record in records}
+            stored = [changed.pop(r.id, r) for r in load() if r.id not in removed]
+            self.save(stored + list(changed.values()))
+            return
+
+        index = self.index() or {}
+        raws = [self.serialize(record) for record in records]
+        lines = [_encode(raw) for raw in raws]
+        data = b"".join(lines)
+        with open(self.path, "a+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            # A record torn by a crash has no newline; start on a fresh line
+            if size:
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+                    size += 1
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        log_write(self.path, len(data))
+        for raw, line in zip(raws, lines):
+            self._add(index, raw, size)
+            size += len(line)
+        self._write_index(index)
+
+    def fingerprint(self, seed_fingerprint: Callable[[], bytes]) -> bytes:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return seed_fingerprint()
+        return f"jsonl:{stat.st_mtime_ns}:{stat.st_size}".encode()
+
+
+def _task_keys(raw: dict) -> Dict[str, Optional[str]]:
+    return {
+        "date": raw["scheduled_date"],
+        "state": "completed" if raw.get("is_completed") else "open",
+        "active": "active" if raw.get("active_session_start") else None,
+    }
+
+
+def _event_keys(raw: dict) -> Dict[str, Optional[str]]:
+    return {"day": raw["start"][:10]}
+
+
+class JsonlTaskStore:
+    # Tasks as JSON Lines. iter() yields tasks while the file is still being
+    # read and skips the ones it filters out before decoding them.
+
+    def __init__(
+        self, path: Path, seed_path: Optional[Path] = None, lazy: bool = False
+    ):
+        self.seed_path = seed_path
+        self.lazy = lazy
+        self.file = _JsonLines(
+            path,
+            self._seed,
+            _serialize_task,
+            _task_sort_key,
+            _raw_task_sort_key,
+            _task_keys,
+        )
+
+    def _seed(self) -> List[Task]:
+        return JsonTaskStore(self.seed_path).load() if self.seed_path else []
+
+    def iter(
+        self, completed: Optional[bool] = None, scheduled_until: Optional[date] = None
+    ) -> Iterator[Task]:
+        # Tasks in stored order, as load() sorts them; only completed or open
+        # ones if `completed` is set, and only those scheduled on or before
+        # `scheduled_until`
+        decode = JsonTask if self.lazy else _deserialize_task
+        last = scheduled_until.isoformat() if scheduled_until else None
+        index = self.file.index()
+        if index is None:
+            for raw in self.file.lines():
+                if (
+                    completed is None or raw.get("is_completed", False) == completed
+                ) and (last is None or raw["scheduled_date"] <= last):
+                    yield decode(raw)
+            return
+        if completed is None and last is None:
+            for raw in self.file.ordered(index):
+                yield decode(raw)
+            return
+
+        offsets = None
+        if last is not None:
+            offsets = self.file.offsets(index, "date", lambda day: day <= last)
+        if completed is not None:
+            state = "completed" if completed else "open"
+            matching = self.file.offsets(index, "state", lambda key: key == state)
+            offsets = matching if offsets is None else offsets & matching
+        for raw in self.file.ordered(index, offsets):
+            yield decode(raw)
+
+    def active(self) -> Optional[Task]:
+        # The task with a running session, looked up in the index
+        index = self.file.index()
+        if index is None:
+            raws = (raw for raw in self.file.lines() if raw.get("active_session_start"))
+        else:
+            raws = self.file.lines_at(sorted(index.get("active", {}).get("active", [])))
+        raw = next(raws, None)
+        if raw is None:
+            return None
+        return JsonTask(raw) if self.lazy else _deserialize_task(raw)
+
+    def load(self) -> List[Task]:
+        tasks = list(self.iter())
+        tasks.sort(key=_task_sort_key)
+        return tasks
+
+    def save(self, tasks: List[Task]) -> None:
+        self.file.save(tasks)
+
+    def save_one(self, task: Task) -> None:
+        self.file.save_one(task, self.load)
+
+    def fingerprint(self) -> bytes:
+        return self.file.fingerprint(
+            lambda: JsonTaskStore(self.seed_path).fingerprint()
+            if self.seed_path
+            else b""
+        )
+
+
+class JsonlEventStore:
+    # Events as JSON Lines. iter() compares the date part of each stored start
+    # with the range before decoding the event.
+
+    def __init__(
+        self, path: Path, seed_path: Optional[Path] = None, lazy: bool = False
+    ):
+        self.seed_path = seed_path
+        self.lazy = lazy
+        self.file = _JsonLines(
+            path,
+            self._seed,
+            _serialize_event,
+            _event_sort_key,
+            _raw_event_sort_key,
+            _event_keys,
+        )
+
+    def _seed(self) -> List[Event]:
+        return JsonEventStore(self.seed_path).load() if self.seed_path else []
+
+    def iter(
+        self, start_date: Optional[date] = None, end_date: Optional[date] = None
+    ) -> Iterator[Event]:
+        # Events in stored order, as load() sorts them, that start on a day in
+        # [start_date, end_date]
+        first = start_date.isoformat() if start_date else ""
+        last = end_date.isoformat() if end_date else "9999-12-31"
+        decode = JsonEvent if self.lazy else _deserialize_event
+        index = self.file.index()
+        if index is None:
+            for raw in self.file.lines():
+                if first <= raw["start"][:10] <= last:
+                    yield decode(raw)
+            return
+        offsets = None
+        if start_date is not None or end_date is not None:
+            offsets = self.file.offsets(index, "day", lambda day: first <= day <= last)
+        for raw in self.file.ordered(index, offsets):
+            yield decode(raw)
+
+    def load(
+        self, start_date: Optional[date] = None, end_date: Optional[date] = None
+    ) -> List[Event]:
+        events = list(self.iter(start_date, end_date))
+        events.sort(key=_event_sort_key)
+        return events
+
+    def save(self, events: List[Event]) -> None:
+        self.file.save(events)
+
+    def save_one(self, event: Event) -> None:
+        self.file.save_one(event, self.load)
+
+    def save_changes(self, events: List[Event], removed: Set[int]) -> None:
+        self.file.save_changes(events, removed, self.load)
+
+    def fingerprint(self) -> bytes:
+        return self.file.fingerprint(
+            lambda: JsonEventStore(self.seed_path).fingerprint()
+            if self.seed_path
+            else b""
+        )
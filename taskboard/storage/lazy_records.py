@@ -0,0 +1,143 @@
+from dataclasses import fields
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Optional
+
+from taskboard.models.event import Event
+from taskboard.models.task import Task
+
+# Boards repeat the same few times of day and dates, so parsed ones are shared
+_parse_time = lru_cache(maxsize=4096)(time.fromisoformat)
+_parse_date = lru_cache(maxsize=4096)(date.fromisoformat)
+
+
+class _Decoded:
+    # A field held in its stored form, in the record attribute named after it
+    # with a leading underscore, until first read; it is then decoded by the
+    # record's _decode() and the result stored in its place. Assigning the
+    # field stores the value as already decoded.
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.stored = "_" + name
+        self.bit = 1 << len(owner.LAZY_FIELDS)
+        owner.LAZY_FIELDS = owner.LAZY_FIELDS + (name,)
+
+    def __get__(self, record, owner=None):
+        if record is None:
+            return self
+        value = getattr(record, self.stored)
+        if record._decoded & self.bit:
+            return value
+        value = record._decode(self.name, value)
+        setattr(record, self.stored, value)
+        record._decoded |= self.bit
+        return value
+
+    def __set__(self, record, value):
+        setattr(record, self.stored, value)
+        record._decoded |= self.bit
+
+
+def _values(record) -> tuple:
+    return tuple(getattr(record, f.name) for f in fields(record))
+
+
+class LazyTask(Task):
+    # A Task whose times, dates and work sessions are decoded from the stored
+    # record on first read. Subclasses set every other field and the stored
+    # form of these, in this order, in __init__, then _decoded = 0.
+    __slots__ = (
+        "_earliest_start_time",
+        "_latest_end_time",
+        "_scheduled_date",
+        "_deadline",
+        "_work_sessions",
+        "_active_session_start",
+        "_decoded",
+    )
+    LAZY_FIELDS: tuple = ()
+    earliest_start_time = _Decoded()
+    latest_end_time = _Decoded()
+    scheduled_date = _Decoded()
+    deadline = _Decoded()
+    work_sessions = _Decoded()
+    active_session_start = _Decoded()
+
+    def __eq__(self, other):
+        # The dataclass __eq__ only matches instances of the exact same class
+        if not isinstance(other, Task):
+            return NotImplemented
+        return _values(self) == _values(other)
+
+
+class LazyEvent(Event):
+    # An Event whose start and end are decoded from the stored record on first
+    # read; subclasses define _decode(name, stored) as for LazyTask
+    __slots__ = ("_start", "_end", "_decoded")
+    LAZY_FIELDS: tuple = ()
+    start = _Decoded()
+    end = _Decoded()
+
+    def __eq__(self, other):
+        if not isinstance(other, Event):
+            return NotImplemented
+        return _values(self) == _values(other)
+
+
+def _parse_optional(name: str, stored: Optional[str]):
+    if not stored:
+        return None
+    if name in ("earliest_start_time", "latest_end_time"):
+        return _parse_time(stored)
+    return datetime.fromisoformat(stored)
+
+
+class JsonTask(LazyTask):
+    # A task read from its tasks.json dict, which is not kept
+    __slots__ = ()
+
+    def __init__(self, raw: dict):
+        self.id = raw["id"]
+        self.title = raw["title"]
+        self.duration_minutes = raw["duration_minutes"]
+        self.priority = raw["priority"]
+        self.flexible = raw["flexible"]
+        self.is_completed = raw.get("is_completed", False)
+        self.description = raw.get("description")
+        self.energy_level = raw.get("energy_level", 2)
+        self.depends_on = raw.get("depends_on", [])
+        self._earliest_start_time = raw["earliest_start_time"]
+        self._latest_end_time = raw["latest_end_time"]
+        self._scheduled_date = raw.get("scheduled_date")
+        self._deadline = raw["deadline"]
+        self._work_sessions = raw.get("work_sessions")
+        self._active_session_start = raw.get("active_session_start")
+        self._decoded = 0
+
+    def _decode(self, name: str, stored):
+        if name == "scheduled_date":
+            return _parse_date(stored) if stored else date.today()
+        if name == "work_sessions":
+            return [
+                (datetime.fromisoformat(start), datetime.fromisoformat(end))
+                for start, end in stored or []
+            ]
+        return _parse_optional(name, stored)
+
+
+class JsonEvent(LazyEvent):
+    # An event read from its events.json dict, which is not kept
+    __slots__ = ()
+
+    def __init__(self, raw: dict):
+        self.id = raw["id"]
+        self.title = raw["title"]
+        self.description = raw.get("description")
+        self.source = raw["source"]
+        self.external_id = raw.get("external_id")
+        self._start = raw["start"]
+        self._end = raw["end"]
+        self._decoded = 0
+
+    def _decode(self, name: str, stored):
+        return datetime.fromisoformat(stored)
@@ -0,0 +1,206 @@
+import hashlib
+import json
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from taskboard.models.event import Event
+from taskboard.storage.atomic import write_atomic
+from taskboard.storage.events_repository import (
+    JsonEventStore,
+    _deserialize_event,
+    _serialize_event,
+    in_range,
+    merge_changes,
+)
+
+MANIFEST = "manifest.json"
+# Event id -> partition, only read when a single event is saved
+INDEX = "index.json"
+
+
+def partition_of(moment: date) -> str:
+    return f"{moment.year:04d}-{moment.month:02d}"
+
+
+def _sort_key(event: Event) -> tuple:
+    # The order JsonEventStore.save sorts by
+    return (event.start, event.title)
+
+
+class PartitionedEventStore:
+    # Events split into one JSON file per month of their start, each in the
+    # order events.json would have them, plus a manifest listing the partitions
+    # with their size and content hash. Range loads open only the months they
+    # overlap, and saves rewrite only the partitions whose contents changed.
+
+    def __init__(self, directory: Path, seed_path: Optional[Path] = None):
+        self.directory = directory
+        # Events to start from before the first save (the JSON store's file)
+        self.seed_path = seed_path
+
+    def fingerprint(self) -> bytes:
+        manifest_path = self.directory / MANIFEST
+        if not manifest_path.exists():
+            if self.seed_path is not None:
+                return JsonEventStore(self.seed_path).fingerprint()
+            return b""
+        return manifest_path.read_bytes()
+
+    def load(
+        self, start_date: Optional[date] = None, end_date: Optional[date] = None
+    ) -> List[Event]:
+        manifest = self._read_manifest()
+        if manifest is None:
+            seed = JsonEventStore(self.seed_path) if self.seed_path else None
+            return seed.load(start_date, end_date) if seed else []
+
+        first = partition_of(start_date) if start_date else None
+        last = partition_of(end_date) if end_date else None
+        events = []
+        for name in sorted(manifest):
+            if (first and name < first) or (last and name > last):
+                continue
+            events.extend(self._read_partition(name))
+        if start_date or end_date:
+            events = [e for e in events if in_range(e, start_date, end_date)]
+        return events
+
+    def save(self, events: List[Event]) -> None:
+        # Sort events by start time, then by title
+        events.sort(key=_sort_key)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        partitions: Dict[str, List[Event]] = {}
+        for event in events:
+            partitions.setdefault(partition_of(event.start), []).append(event)
+
+        old_manifest = self._read_manifest() or {}
+        manifest = {}
+        for name, partition in partitions.items():
+            manifest[name] = self._write_partition(
+                name, partition, old_manifest.get(name)
+            )
+        self._write_index(
+            {str(event.id): name for name, part in partitions.items() for event in part}
+        )
+        self._write_manifest(manifest)
+        for name in old_manifest.keys() - manifest.keys():
+            (self.directory / f"{name}.json").unlink(missing_ok=True)
+
+    def save_one(self, event: Event) -> None:
+        manifest = self._read_manifest()
+        if manifest is None:
+            # The first write lays out the whole seed board
+            self.save(self.load())
+            manifest = self._read_manifest() or {}
+        index = self._read_index()
+
+        name = partition_of(event.start)
+        old_name = index.get(str(event.id))
+        if old_name is not None and old_name != name:
+            # The event moved to another month
+            remaining = [e for e in self._read_partition(old_name) if e.id != event.id]
+            if remaining:
+                manifest[old_name] = self._write_partition(
+                    old_name, remaining, manifest[old_name]
+                )
+            else:
+                del manifest[old_name]
+                (self.directory / f"{old_name}.json").unlink(missing_ok=True)
+
+        partition = self._read_partition(name) if name in manifest else []
+        for position, stored in enumerate(partition):
+            if stored.id == event.id:
+                partition[position] = event
+                break
+        else:
+            partition.append(event)
+        partition.sort(key=_sort_key)
+        manifest[name] = self._write_partition(name, partition, manifest.get(name))
+
+        if old_name != name:
+            index[str(event.id)] = name
+            self._write_index(index)
+        self._write_manifest(manifest)
+
+    def save_changes(self, events: List[Event], removed: Set[int]) -> None:
+        # Reads and rewrites only the months the changed events were or are in
+        manifest = self._read_manifest()
+        if manifest is None:
+            self.save(merge_changes(self.load(), events, removed))
+            return
+        if not events and not removed:
+            return
+        index = self._read_index()
+        changed = {event.id: event for event in events}
+        names = {partition_of(event.start) for event in events}
+        names.update(
+            index[str(event_id)]
+            for event_id in changed.keys() | removed
+            if str(event_id) in index
+        )
+
+        placed = set()
+        for name in sorted(names):
+            partition = []
+            for stored in self._read_partition(name) if name in manifest else []:
+                event = changed.get(stored.id, stored)
+                if stored.id in removed or partition_of(event.start) != name:
+                    continue
+                partition.append(event)
+                placed.add(event.id)
+            partition.extend(
+                event
+                for event in changed.values()
+                if event.id not in placed and partition_of(event.start) == name
+            )
+            partition.sort(key=_sort_key)
+            if partition:
+                manifest[name] = self._write_partition(
+                    name, partition, manifest.get(name)
+                )
+            elif name in manifest:
+                del manifest[name]
+                (self.directory / f"{name}.json").unlink(missing_ok=True)
+
+        for event_id in removed:
+            index.pop(str(event_id), None)
+        index.update({str(event.id): partition_of(event.start) for event in events})
+        self._write_index(index)
+        self._write_manifest(manifest)
+
+    def _read_manifest(self) -> Optional[Dict[str, dict]]:
+        try:
+            with open(self.directory / MANIFEST, "r") as f:
+                return json.load(f)["partitions"]
+        except FileNotFoundError:
+            return None
+
+    def _write_manifest(self, manifest: Dict[str, dict]) -> None:
+        data = {"partitions": dict(sorted(manifest.items()))}
+        write_atomic(self.directory / MANIFEST, json.dumps(data, indent=2).encode())
+
+    def _read_index(self) -> Dict[str, str]:
+        try:
+            with open(self.directory / INDEX, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write_index(self, index: Dict[str, str]) -> None:
+        write_atomic(self.directory / INDEX, json.dumps(index).encode())
+
+    def _read_partition(self, name: str) -> List[Event]:
+        with open(self.directory / f"{name}.json", "r") as f:
+            return [_deserialize_event(item) for item in json.load(f)]
+
+    def _write_partition(
+        self, name: str, events: List[Event], entry: Optional[dict]
+    ) -> dict:
+        # Returns the partition's manifest entry; unchanged contents are not
+        # written again
+        data = json.dumps([_serialize_event(e) for e in events], indent=2).encode()
+        digest = hashlib.sha256(data).hexdigest()
+        if entry is None or entry["sha256"] != digest:
+            write_atomic(self.directory / f"{name}.json", data)
+        return {"count": len(events), "sha256": digest}
@@ -0,0 +1,124 @@
+import json
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+from taskboard.core.recurrence import occurrences
+from taskboard.models.event import Event
+from taskboard.models.recurring_event import RecurringEvent
+from taskboard.storage.atomic import write_atomic, write_if_changed
+from taskboard.storage.events_repository import _deserialize_event, _serialize_event
+
+# Days of expanded occurrences the window cache keeps; the days expanded longest
+# ago go first
+MAX_CACHED_DAYS = 92
+
+
+def _serialize_series(series: RecurringEvent) -> dict:
+    return {
+        "uid": series.uid,
+        "title": series.title,
+        "start": series.start.isoformat(),
+        "end": series.end.isoformat(),
+        "rule": series.rule,
+        "description": series.description,
+        "source": series.source,
+        "timezone": series.timezone,
+        "exdates": [moment.isoformat() for moment in series.exdates],
+    }
+
+
+def _deserialize_series(data: dict) -> RecurringEvent:
+    return RecurringEvent(
+        uid=data["uid"],
+        title=data["title"],
+        start=datetime.fromisoformat(data["start"]),
+        end=datetime.fromisoformat(data["end"]),
+        rule=data["rule"],
+        description=data.get("description"),
+        source=data["source"],
+        timezone=data.get("timezone"),
+        exdates=[datetime.fromisoformat(moment) for moment in data["exdates"]],
+    )
+
+
+class RecurringEventStore:
+    # Repeating events from imported calendars, kept as their rules in one JSON
+    # file and expanded only for the days a read asks for. A series that runs
+    # for years costs its occurrences in the window, not its whole history.
+    #
+    # Expanded days are cached next to the file, in `<name>.windows`: for each
+    # day, the occurrences starting on it. Like the jsonl index it holds the
+    # size and mtime of the file it was expanded from, and is dropped when they
+    # no longer match. Reading a day again, as every run of run_today does,
+    # then reads the cache instead of parsing and expanding every rule.
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.cache_path = path.with_name(f"{path.name}.windows")
+
+    def load(self) -> List[RecurringEvent]:
+        if not self.path.exists():
+            return []
+        with open(self.path, "r") as f:
+            return [_deserialize_series(item) for item in json.load(f)]
+
+    def save(self, series: List[RecurringEvent]) -> None:
+        series.sort(key=lambda s: (s.source, s.uid))
+        data = json.dumps([_serialize_series(s) for s in series], indent=2)
+        write_if_changed(self.path, data.encode())
+
+    def fingerprint(self) -> bytes:
+        return self.path.read_bytes() if self.path.exists() else b""
+
+    def occurrences(self, start_date: date, end_date: date) -> List[Event]:
+        # Occurrences starting on a day in [start_date, end_date], sorted as
+        # the event stores sort
+        if not self.path.exists() or end_date < start_date:
+            return []
+        days = [
+            (start_date + timedelta(days=offset)).isoformat()
+            for offset in range((end_date - start_date).days + 1)
+        ]
+        stamp = self._stamp()
+        cache = self._read_cache(stamp) if len(days) <= MAX_CACHED_DAYS else {}
+        missing = [day for day in days if day not in cache]
+        if missing:
+            expanded: Dict[str, List[dict]] = {day: [] for day in missing}
+            first, last = date.fromisoformat(missing[0]), date.fromisoformat(
+                missing[-1]
+            )
+            for series in self.load():
+                for event in occurrences(series, first, last):
+                    day = event.start.date().isoformat()
+                    if day in expanded:
+                        expanded[day].append(_serialize_event(event))
+            cache.update(expanded)
+            if len(days) <= MAX_CACHED_DAYS:
+                self._write_cache(stamp, cache, days)
+
+        events = [_deserialize_event(item) for day in days for item in cache[day]]
+        events.sort(key=lambda e: (e.start, e.title))
+        return events
+
+    def _stamp(self) -> list:
+        stat = self.path.stat()
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _read_cache(self, stamp: list) -> Dict[str, List[dict]]:
+        try:
+            with open(self.cache_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data["days"] if data.get("source") == stamp else {}
+
+    def _write_cache(
+        self, stamp: list, cache: Dict[str, List[dict]], used: List[str]
+    ) -> None:
+        # The days just read move to the end, so eviction takes others first
+        for day in used:
+            cache[day] = cache.pop(day)
+        days = dict(list(cache.items())[-MAX_CACHED_DAYS:])
+        data = json.dumps({"source": stamp, "days": days}, separators=(",", ":"))
+        write_atomic(self.cache_path, data.encode())
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from taskboard.core.timeline import ScheduledBlock
+from taskboard.storage.atomic import write_atomic
+
+CACHE_DIR = Path(__file__).parent / "schedule_cache"
+MAX_CACHE_BYTES = 1024 * 1024
+STATS_FILE = "stats.json"
+
+
+@dataclass
+class CachedSchedule:
+    blocks: List[ScheduledBlock]  # tasks and events, in start order
+    unscheduled: List[Tuple[str, int]]  # title and duration in minutes
+    # The rendered schedule depends on the clock (ongoing events, an overrunning
+    # active task); it is only reused before this moment
+    valid_until: Optional[datetime] = None
+
+
+def cache_key(*parts: bytes) -> str:
+    # Length-prefixed so that moving bytes between parts changes the key
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def _serialize_entry(entry: CachedSchedule) -> dict:
+    return {
+        "blocks": [
+            {
+                "id": block.id,
+                "title": block.title,
+                "start_time": block.start_time.isoformat(),
+                "end_time": block.end_time.isoformat(),
+            }
+            for block in entry.blocks
+        ],
+        "unscheduled": [list(item) for item in entry.unscheduled],
+        "valid_until": entry.valid_until.isoformat() if entry.valid_until else None,
+    }
+
+
+def _deserialize_entry(data: dict) -> CachedSchedule:
+    return CachedSchedule(
+        blocks=[
+            ScheduledBlock(
+                id=item["id"],
+                title=item["title"],
+                start_time=datetime.fromisoformat(item["start_time"]),
+                end_time=datetime.fromisoformat(item["end_time"]),
+            )
+            for item in data["blocks"]
+        ],
+        unscheduled=[(title, duration) for title, duration in data["unscheduled"]],
+        valid_until=datetime.fromisoformat(data["valid_until"])
+        if data["valid_until"]
+        else None,
+    )
+
+
+class ScheduleCache:
+    # One JSON file per key in `directory`. Hits refresh the file's mtime, and
+    # once the entries take up more than max_bytes the least recently used are
+    # removed. Hit and miss counters are kept next to the entries.
+
+    def __init__(
+        self, directory: Optional[Path] = None, max_bytes: int = MAX_CACHE_BYTES
+    ):
+        self.directory = Path(directory) if directory is not None else CACHE_DIR
+        self.max_bytes = max_bytes
+
+    def get(self, key: str, now: datetime) -> Optional[CachedSchedule]:
+        path = self.directory / f"{key}.json"
+        try:
+            with open(path, "r") as f:
+                entry = _deserialize_entry(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            entry = None
+
+        if (
+            entry is not None
+            and entry.valid_until is not None
+            and now >= entry.valid_until
+        ):
+            entry = None
+        if entry is not None:
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                # Evicted by another run since it was read; still a hit
+                pass
+        self._count("hits" if entry is not None else "misses")
+        return entry
+
+    def put(self, key: str, entry: CachedSchedule) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{key}.json"
+        # Written aside and renamed so a concurrent run never reads half an entry
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, "w") as f:
+            json.dump(_serialize_entry(entry), f)
+        os.replace(temp_path, path)
+        self._evict(keep=path)
+
+    def stats(self) -> Dict[str, int]:
+        try:
+            with open(self.directory / STATS_FILE, "r") as f:
+                stats = json.load(f)
+        except (OSError, ValueError):
+            stats = {}
+        return {name: stats.get(name, 0) for name in ("hits", "misses", "evictions")}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        stats = self.stats()
+        stats[name] += amount
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Replaced rather than rewritten, so a concurrent run never reads a
+        # truncated file and writes the counters back as zero
+        write_atomic(self.directory / STATS_FILE, json.dumps(stats).encode())
+
+    def _evict(self, keep: Path) -> None:
+        entries = []
+        for path in self.directory.glob("*.json"):
+            if path.name == STATS_FILE:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Evicted by another run while listing
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        # Least recently used first; the entry just written always stays
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+                evicted += 1
+            except FileNotFoundError:
+                # Another run evicted it first
+                pass
+            total -= size
+        if evicted:
+            self._count("evictions", evicted)
@@ -0,0 +1,56 @@
+import os
+from pathlib import Path
+
+# Which store the repositories use is picked per process from the environment:
+# TASKBOARD_BACKEND=json (default), sqlite, journal or jsonl, and TASKBOARD_DB
+# for the SQLite file. The journal backend only covers tasks; events stay in
+# JSON, as one file or, with TASKBOARD_EVENT_LAYOUT=monthly, one file per month.
+# TASKBOARD_LAZY=1 makes the JSON stores load records that decode their dates
+# and times on first read.
+#
+# Kept free of the models and stores, so that a command can tell which board it
+# would read (and ask the daemon for it) without importing them.
+BACKENDS = ("json", "sqlite", "journal", "jsonl")
+EVENT_LAYOUTS = ("file", "monthly")
+DEFAULT_DB_PATH = Path(__file__).parent / "taskboard.db"
+TASKS_PATH = Path(__file__).parent / "tasks.json"
+EVENTS_PATH = Path(__file__).parent / "events.json"
+# Repeating events from imported calendars, for every backend
+RECURRING_PATH = Path(__file__).parent / "recurring_events.json"
+# What the last sync_events() of each calendar source stored
+SYNC_STATE_PATH = Path(__file__).parent / "event_sync.json"
+# Where the daemon (taskboard serve) listens; TASKBOARD_SOCKET moves it
+DEFAULT_SOCKET_PATH = Path(__file__).parent / "taskboard.sock"
+
+
+def backend_name() -> str:
+    name = os.environ.get("TASKBOARD_BACKEND", "json").lower()
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown storage backend: {name!r} (expected one of {', '.join(BACKENDS)})"
+        )
+    return name
+
+
+def event_layout() -> str:
+    name = os.environ.get("TASKBOARD_EVENT_LAYOUT", "file").lower()
+    if name not in EVENT_LAYOUTS:
+        raise ValueError(
+            f"Unknown event layout: {name!r} (expected one of {', '.join(EVENT_LAYOUTS)})"
+        )
+    return name
+
+
+def db_path() -> Path:
+    return Path(os.environ.get("TASKBOARD_DB", DEFAULT_DB_PATH))
+
+
+def lazy_records() -> bool:
+    value = os.environ.get("TASKBOARD_LAZY", "0")
+    if value not in ("0", "1"):
+        raise ValueError(f"Unknown TASKBOARD_LAZY value: {value!r} (expected 0 or 1)")
+    return value == "1"
+
+
+def socket_path() -> Path:
+    return Path(os.environ.get("TASKBOARD_SOCKET", DEFAULT_SOCKET_PATH))
@@ -0,0 +1,591 @@
+import sqlite3
+import uuid
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from taskboard.models.event import Event
+from taskboard.models.task import Task
+from taskboard.storage.write_log import log_rows
+
+# Ids are 128-bit uuid4 integers, too wide for SQLite integers, so they are
+# stored as text. position keeps the order the JSON files would have, which the
+# scheduler uses to break ties.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    duration_minutes INTEGER NOT NULL,
+    priority INTEGER NOT NULL,
+    earliest_start_time TEXT,
+    latest_end_time TEXT,
+    flexible INTEGER NOT NULL,
+    is_completed INTEGER NOT NULL,
+    description TEXT,
+    scheduled_date TEXT NOT NULL,
+    deadline TEXT,
+    energy_level INTEGER NOT NULL,
+    active_session_start TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_scheduled_date
+    ON tasks (scheduled_date, priority, position);
+CREATE INDEX IF NOT EXISTS tasks_is_completed ON tasks (is_completed);
+CREATE INDEX IF NOT EXISTS tasks_active_session_start ON tasks (active_session_start);
+CREATE TABLE IF NOT EXISTS work_sessions (
+    task_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    PRIMARY KEY (task_id, position)
+);
+CREATE TABLE IF NOT EXISTS task_dependencies (
+    task_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    depends_on TEXT NOT NULL,
+    PRIMARY KEY (task_id, position)
+);
+CREATE INDEX IF NOT EXISTS task_dependencies_depends_on
+    ON task_dependencies (depends_on);
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    description TEXT,
+    source TEXT NOT NULL,
+    external_id TEXT
+);
+CREATE INDEX IF NOT EXISTS events_start_time ON events (start_time, title, position);
+"""
+
+TASK_COLUMNS = (
+    "id",
+    "position",
+    "title",
+    "duration_minutes",
+    "priority",
+    "earliest_start_time",
+    "latest_end_time",
+    "flexible",
+    "is_completed",
+    "description",
+    "scheduled_date",
+    "deadline",
+    "energy_level",
+    "active_session_start",
+)
+EVENT_COLUMNS = (
+    "id",
+    "position",
+    "title",
+    "start_time",
+    "end_time",
+    "description",
+    "source",
+    "external_id",
+)
+
+_connections: Dict[Path, sqlite3.Connection] = {}
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    # One connection per database for the life of the process
+    path = Path(path).resolve()
+    connection = _connections.get(path)
+    if connection is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # The daemon writes from a background thread, never at the same time as
+        # its main thread reads
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.executescript(SCHEMA)
+        with connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('instance', ?), ('revision', 0)",
+                (uuid.uuid4().hex,),
+            )
+        _connections[path] = connection
+    return connection
+
+
+def _upsert_sql(table: str, columns: Tuple[str, ...]) -> str:
+    updates = ", ".join(f"{column} = excluded.{column}" for column in columns[1:])
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)}) "
+        f"ON CONFLICT (id) DO UPDATE SET {updates}"
+    )
+
+
+def _position(
+    connection: sqlite3.Connection,
+    table: str,
+    sort_columns: Tuple[str, str],
+    row_id: str,
+    sort_key: tuple,
+) -> int:
+    # The JSON files are rewritten with a stable sort on sort_columns, so a
+    # saved row lands among the rows sharing its sort key the same way: a new row
+    # or one whose key went down goes after them, one whose key went up goes
+    # before them, and an unchanged key keeps its place. Only the relative
+    # order within a key matters, so positions may go negative.
+    first, second = sort_columns
+    stored = connection.execute(
+        f"SELECT {first}, {second}, position FROM {table} WHERE id = ?", (row_id,)
+    ).fetchone()
+    if stored is not None and tuple(stored[:2]) == sort_key:
+        return stored[2]
+    if stored is not None and tuple(stored[:2]) < sort_key:
+        (position,) = connection.execute(
+            f"SELECT COALESCE(MIN(position), 1) - 1 FROM {table} WHERE {first} = ? AND {second} = ?",
+            sort_key,
+        ).fetchone()
+    else:
+        (position,) = connection.execute(
+            f"SELECT COALESCE(MAX(position), -1) + 1 FROM {table} WHERE {first} = ? AND {second} = ?",
+            sort_key,
+        ).fetchone()
+    return position
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _task_row(task: Task, position: int) -> tuple:
+    return (
+        str(task.id),
+        position,
+        task.title,
+        task.duration_minutes,
+        task.priority,
+        _iso(task.earliest_start_time),
+        _iso(task.latest_end_time),
+        int(task.flexible),
+        int(task.is_completed),
+        task.description,
+        (task.scheduled_date or date.today()).isoformat(),
+        _iso(task.deadline),
+        task.energy_level,
+        _iso(task.active_session_start),
+    )
+
+
+def _event_row(event: Event, position: int) -> tuple:
+    return (
+        str(event.id),
+        position,
+        event.title,
+        event.start.isoformat(),
+        event.end.isoformat(),
+        event.description,
+        event.source,
+        event.external_id,
+    )
+
+
+def _diff_rows(
+    connection: sqlite3.Connection,
+    table: str,
+    columns: Tuple[str, ...],
+    rows: List[tuple],
+    sort_columns: Tuple[str, str],
+) -> Tuple[List[tuple], List[str]]:
+    # Rows, in saved order, that are new or differ from the stored ones, and the
+    # ids no longer present. Only the order of positions within a sort key
+    # matters, so each row keeps its stored position while those still increase
+    # and the rest take the next free one; adding, moving or removing a row
+    # then rewrites only the rows it has to.
+    stored = {
+        row[0]: row
+        for row in connection.execute(f"SELECT {', '.join(columns)} FROM {table}")
+    }
+    first, second = (columns.index(name) for name in sort_columns)
+    last_position: Dict[tuple, int] = {}
+    written = []
+    for row in rows:
+        key = (row[first], row[second])
+        previous = stored.get(row[0])
+        position = last_position.get(key)
+        if previous is not None and (position is None or previous[1] > position):
+            position = previous[1]
+        else:
+            position = 0 if position is None else position + 1
+        last_position[key] = position
+        row = row[:1] + (position,) + row[2:]
+        if row != previous:
+            written.append(row)
+    ids = {row[0] for row in rows}
+    removed = [row_id for row_id in stored if row_id not in ids]
+    return written, removed
+
+
+def _children_of(connection: sqlite3.Connection, query: str) -> Dict[str, list]:
+    # Child rows by parent id, in position order, without the parent id
+    children: Dict[str, list] = {}
+    for row in connection.execute(f"{query} ORDER BY task_id, position"):
+        children.setdefault(row[0], []).append(tuple(row[1:]))
+    return children
+
+
+def _fingerprint(connection: sqlite3.Connection) -> bytes:
+    # Any write to the database bumps the revision; the instance id tells apart
+    # a database that was deleted and created again
+    values = dict(connection.execute("SELECT key, value FROM meta"))
+    return f"sqlite:{values['instance']}:{values['revision']}".encode()
+
+
+def _bump_revision(connection: sqlite3.Connection) -> None:
+    connection.execute("UPDATE meta SET value = value + 1 WHERE key = 'revision'")
+
+
+class SqliteTaskStore:
+    # save() rewrites the tables the way the JSON file is rewritten; save_one()
+    # touches a single row and its child rows
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.connection = _connect(path)
+
+    def fingerprint(self) -> bytes:
+        return _fingerprint(self.connection)
+
+    def load(self) -> List[Task]:
+        return self._select("", ())
+
+    def iter(
+        self, completed: Optional[bool] = None, scheduled_until: Optional[date] = None
+    ) -> Iterator[Task]:
+        # Filtered in SQL on the scheduled_date and is_completed indexes
+        conditions, params = [], []
+        if completed is not None:
+            conditions.append("is_completed = ?")
+            params.append(int(completed))
+        if scheduled_until is not None:
+            conditions.append("scheduled_date <= ?")
+            params.append(scheduled_until.isoformat())
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return iter(self._select(where, params))
+
+    def active(self) -> Optional[Task]:
+        tasks = self._select("WHERE active_session_start IS NOT NULL", ())
+        return tasks[0] if tasks else None
+
+    def _select(self, where: str, params: Sequence) -> List[Task]:
+        # Tasks matching `where`, in saved order, with their child rows
+        children = f"WHERE task_id IN (SELECT id FROM tasks {where}) " if where else ""
+        sessions: Dict[str, List[Tuple[datetime, datetime]]] = {}
+        for task_id, start, end in self.connection.execute(
+            "SELECT task_id, start_time, end_time FROM work_sessions "
+            f"{children}ORDER BY task_id, position",
+            params,
+        ):
+            sessions.setdefault(task_id, []).append(
+                (datetime.fromisoformat(start), datetime.fromisoformat(end))
+            )
+        dependencies: Dict[str, List[int]] = {}
+        for task_id, dep_id in self.connection.execute(
+            "SELECT task_id, depends_on FROM task_dependencies "
+            f"{children}ORDER BY task_id, position",
+            params,
+        ):
+            dependencies.setdefault(task_id, []).append(int(dep_id))
+
+        tasks = []
+        for (
+            task_id,
+            _,
+            title,
+            duration_minutes,
+            priority,
+            earliest_start_time,
+            latest_end_time,
+            flexible,
+            is_completed,
+            description,
+            scheduled_date,
+            deadline,
+            energy_level,
+            active_session_start,
+        ) in self.connection.execute(
+            f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks {where} "
+            "ORDER BY scheduled_date, priority, position",
+            params,
+        ):
+            tasks.append(
+                Task(
+                    id=int(task_id),
+                    title=title,
+                    duration_minutes=duration_minutes,
+                    priority=priority,
+                    earliest_start_time=time.fromisoformat(earliest_start_time)
+                    if earliest_start_time
+                    else None,
+                    latest_end_time=time.fromisoformat(latest_end_time)
+                    if latest_end_time
+                    else None,
+                    flexible=bool(flexible),
+                    is_completed=bool(is_completed),
+                    description=description,
+                    scheduled_date=date.fromisoformat(scheduled_date),
+                    deadline=datetime.fromisoformat(deadline) if deadline else None,
+                    energy_level=energy_level,
+                    work_sessions=sessions.get(task_id, []),
+                    active_session_start=datetime.fromisoformat(active_session_start)
+                    if active_session_start
+                    else None,
+                    depends_on=dependencies.get(task_id, []),
+                )
+            )
+        return tasks
+
+    def save(self, tasks: List[Task]) -> None:
+        # Same order as the JSON file: by scheduled date and priority. Only rows
+        # that differ from the stored ones are written, and nothing at all when
+        # the board is unchanged.
+        tasks.sort(key=lambda t: (t.scheduled_date or date.today(), t.priority))
+        sessions = _children_of(
+            self.connection, "SELECT task_id, start_time, end_time FROM work_sessions"
+        )
+        dependencies = _children_of(
+            self.connection, "SELECT task_id, depends_on FROM task_dependencies"
+        )
+        changed = []
+        for task in tasks:
+            task_id = str(task.id)
+            children = (
+                [
+                    (start.isoformat(), end.isoformat())
+                    for start, end in task.work_sessions
+                ],
+                [(str(dep_id),) for dep_id in task.depends_on],
+            )
+            if children != (sessions.get(task_id, []), dependencies.get(task_id, [])):
+                changed.append(task)
+        written, removed = _diff_rows(
+            self.connection,
+            "tasks",
+            TASK_COLUMNS,
+            [_task_row(task, 0) for task in tasks],
+            ("scheduled_date", "priority"),
+        )
+        if not written and not removed and not changed:
+            log_rows(self.path, "task", 0, 0)
+            return
+
+        with self.connection:
+            for task_id in removed:
+                self.connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            self.connection.executemany(_upsert_sql("tasks", TASK_COLUMNS), written)
+            for task_id in removed + [str(task.id) for task in changed]:
+                self.connection.execute(
+                    "DELETE FROM work_sessions WHERE task_id = ?", (task_id,)
+                )
+                self.connection.execute(
+                    "DELETE FROM task_dependencies WHERE task_id = ?", (task_id,)
+                )
+            for task in changed:
+                self._insert_children(task)
+            _bump_revision(self.connection)
+        log_rows(self.path, "task", len(written), len(removed))
+
+    def save_one(self, task: Task) -> None:
+        row = _task_row(task, 0)
+        with self.connection:
+            position = _position(
+                self.connection,
+                "tasks",
+                ("scheduled_date", "priority"),
+                row[0],
+                (row[TASK_COLUMNS.index("scheduled_date")], task.priority),
+            )
+            row = _task_row(task, position)
+            if self._stored(row[0]) == (
+                row,
+                [
+                    (start.isoformat(), end.isoformat())
+                    for start, end in task.work_sessions
+                ],
+                [str(dep_id) for dep_id in task.depends_on],
+            ):
+                log_rows(self.path, "task", 0, 0)
+                return
+            self.connection.execute(_upsert_sql("tasks", TASK_COLUMNS), row)
+            self.connection.execute(
+                "DELETE FROM work_sessions WHERE task_id = ?", (str(task.id),)
+            )
+            self.connection.execute(
+                "DELETE FROM task_dependencies WHERE task_id = ?", (str(task.id),)
+            )
+            self._insert_children(task)
+            _bump_revision(self.connection)
+        log_rows(self.path, "task", 1, 0)
+
+    def _stored(self, task_id: str) -> tuple:
+        # The task's row, work sessions and dependencies as they are stored
+        row = self.connection.execute(
+            f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+        sessions = self.connection.execute(
+            "SELECT start_time, end_time FROM work_sessions WHERE task_id = ? ORDER BY position",
+            (task_id,),
+        ).fetchall()
+        dependencies = self.connection.execute(
+            "SELECT depends_on FROM task_dependencies WHERE task_id = ? ORDER BY position",
+            (task_id,),
+        ).fetchall()
+        return row, sessions, [dep_id for (dep_id,) in dependencies]
+
+    def _insert_children(self, task: Task) -> None:
+        task_id = str(task.id)
+        self.connection.executemany(
+            "INSERT INTO work_sessions (task_id, position, start_time, end_time) VALUES (?, ?, ?, ?)",
+            (
+                (task_id, position, start.isoformat(), end.isoformat())
+                for position, (start, end) in enumerate(task.work_sessions)
+            ),
+        )
+        self.connection.executemany(
+            "INSERT INTO task_dependencies (task_id, position, depends_on) VALUES (?, ?, ?)",
+            (
+                (task_id, position, str(dep_id))
+                for position, dep_id in enumerate(task.depends_on)
+            ),
+        )
+
+
+class SqliteEventStore:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.connection = _connect(path)
+
+    def fingerprint(self) -> bytes:
+        return _fingerprint(self.connection)
+
+    def load(
+        self, start_date: Optional[date] = None, end_date: Optional[date] = None
+    ) -> List[Event]:
+        # Start times are stored as ISO strings, which sort like the datetimes
+        conditions, params = [], []
+        if start_date:
+            conditions.append("start_time >= ?")
+            params.append(start_date.isoformat())
+        if end_date:
+            conditions.append("start_time < ?")
+            params.append((end_date + timedelta(days=1)).isoformat())
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        return [
+            Event(
+                id=int(event_id),
+                title=title,
+                start=datetime.fromisoformat(start),
+                end=datetime.fromisoformat(end),
+                description=description,
+                source=source,
+                external_id=external_id,
+            )
+            for (
+                event_id,
+                _,
+                title,
+                start,
+                end,
+                description,
+                source,
+                external_id,
+            ) in self.connection.execute(
+                f"SELECT {', '.join(EVENT_COLUMNS)} FROM events {where}"
+                "ORDER BY start_time, title, position",
+                params,
+            )
+        ]
+
+    def save(self, events: List[Event]) -> None:
+        # Same order as the JSON file: by start time, then by title. Only rows
+        # that differ from the stored ones are written.
+        events.sort(key=lambda e: (e.start, e.title))
+        written, removed = _diff_rows(
+            self.connection,
+            "events",
+            EVENT_COLUMNS,
+            [_event_row(event, 0) for event in events],
+            ("start_time", "title"),
+        )
+        if not written and not removed:
+            log_rows(self.path, "event", 0, 0)
+            return
+        with self.connection:
+            for event_id in removed:
+                self.connection.execute("DELETE FROM events WHERE id = ?", (event_id,))
+            self.connection.executemany(_upsert_sql("events", EVENT_COLUMNS), written)
+            _bump_revision(self.connection)
+        log_rows(self.path, "event", len(written), len(removed))
+
+    def save_one(self, event: Event) -> None:
+        row = _event_row(event, 0)
+        with self.connection:
+            position = _position(
+                self.connection,
+                "events",
+                ("start_time", "title"),
+                row[0],
+                (row[EVENT_COLUMNS.index("start_time")], event.title),
+            )
+            row = _event_row(event, position)
+            stored = self.connection.execute(
+                f"SELECT {', '.join(EVENT_COLUMNS)} FROM events WHERE id = ?", (row[0],)
+            ).fetchone()
+            if stored == row:
+                log_rows(self.path, "event", 0, 0)
+                return
+            self.connection.execute(_upsert_sql("events", EVENT_COLUMNS), row)
+            _bump_revision(self.connection)
+        log_rows(self.path, "event", 1, 0)
+
+    def save_changes(self, events: List[Event], removed: Set[int]) -> None:
+        # One transaction touching only the given rows, each placed among the
+        # rows sharing its sort key as save_one() would
+        if not events and not removed:
+            log_rows(self.path, "event", 0, 0)
+            return
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM events WHERE id = ?",
+                [(str(event_id),) for event_id in removed],
+            )
+            for event in sorted(events, key=lambda e: (e.start, e.title)):
+                row = _event_row(event, 0)
+                position = _position(
+                    self.connection,
+                    "events",
+                    ("start_time", "title"),
+                    row[0],
+                    (row[EVENT_COLUMNS.index("start_time")], event.title),
+                )
+                self.connection.execute(
+                    _upsert_sql("events", EVENT_COLUMNS), _event_row(event, position)
+                )
+            _bump_revision(self.connection)
+        log_rows(self.path, "event", len(events), len(removed))
+
+
+def migrate_from_json(
+    path: Path, tasks: List[Task], events: List[Event], force: bool = False
+) -> bool:
+    # Copy boards loaded from the JSON files into the database at `path`.
+    # Refuses to overwrite a database that already holds data unless forced.
+    task_store = SqliteTaskStore(path)
+    event_store = SqliteEventStore(path)
+    if not force and (
+        task_store.connection.execute("SELECT 1 FROM tasks LIMIT 1").fetchone()
+        or event_store.connection.execute("SELECT 1 FROM events LIMIT 1").fetchone()
+    ):
+        return False
+    task_store.save(tasks)
+    event_store.save(events)
+    return True
@@ -0,0 +1,42 @@
+from datetime import date
+from typing import List, Optional, Protocol, Set
+
+from taskboard.models.event import Event
+from taskboard.models.task import Task
+
+
+class TaskStore(Protocol):
+    # save() replaces every stored task, save_one() inserts or updates one.
+    # fingerprint() changes whenever the stored tasks do.
+    def load(self) -> List[Task]:
+        ...
+
+    def save(self, tasks: List[Task]) -> None:
+        ...
+
+    def save_one(self, task: Task) -> None:
+        ...
+
+    def fingerprint(self) -> bytes:
+        ...
+
+
+class EventStore(Protocol):
+    # save_changes() inserts or updates `events` and deletes the events whose
+    # ids are in `removed`, as one write
+    def load(
+        self, start_date: Optional[date] = None, end_date: Optional[date] = None
+    ) -> List[Event]:
+        ...
+
+    def save(self, events: List[Event]) -> None:
+        ...
+
+    def save_one(self, event: Event) -> None:
+        ...
+
+    def save_changes(self, events: List[Event], removed: Set[int]) -> None:
+        ...
+
+    def fingerprint(self) -> bytes:
+        ...
@@ -1,11 +1,26 @@
 import json
 from datetime import date, datetime, time
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional
 
 from taskboard.models.task import Task
+from taskboard.models.task_table import TaskTable
+from taskboard.storage.atomic import write_if_changed
+from taskboard.storage.binary_snapshot import (
+    read_snapshot,
+    read_snapshot_table,
+    snapshot_is_current,
+    write_snapshot,
+)
+from taskboard.storage.lazy_records import JsonTask
+from taskboard.storage.settings import TASKS_PATH, backend_name, db_path, lazy_records
+from taskboard.storage.store import TaskStore
+from taskboard.storage.write_log import log_skip
 
-DATA_PATH = Path(__file__).parent / "tasks.json"
+DATA_PATH = TASKS_PATH
+
+# Set by the daemon (taskboard.cli.serve) to the board it holds in memory
+resident_store: Optional[TaskStore] = None
 
 
 def _serialize_task(task: Task) -> dict:
@@ -71,16 +86,148 @@ def _deserialize_task(data: dict) -> Task:
     )
 
 
+class JsonTaskStore:
+    # The whole board in one JSON file, rewritten on every save. With a
+    # snapshot_path, every save also writes a binary copy that loads faster;
+    # it is used for as long as the JSON file is the one it was made from, so
+    # hand edits to the JSON file still win. With lazy, loaded tasks decode
+    # their times, dates and work sessions on first read.
+    def __init__(
+        self, path: Path, snapshot_path: Optional[Path] = None, lazy: bool = False
+    ):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.lazy = lazy
+
+    def load(self) -> List[Task]:
+        if self.snapshot_path is not None:
+            tasks = read_snapshot(self.snapshot_path, self.path, self.lazy)
+            if tasks is not None:
+                return tasks
+        if not self.path.exists():
+            return []
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        if self.lazy:
+            return [JsonTask(item) for item in data]
+        return [_deserialize_task(item) for item in data]
+
+    def load_table(self) -> TaskTable:
+        # As load(), into a TaskTable; tasks.json is read one task at a time
+        if self.snapshot_path is not None:
+            table = read_snapshot_table(self.snapshot_path, self.path)
+            if table is not None:
+                return table
+        if not self.path.exists():
+            return TaskTable()
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        return TaskTable.from_tasks(_deserialize_task(item) for item in data)
+
+    def save(self, tasks: List[Task]) -> None:
+        # Sort tasks by scheduled date and priority before saving. A board that
+        # serializes to what is already stored is not written again.
+        tasks.sort(key=lambda t: (t.scheduled_date or date.today(), t.priority))
+        data = json.dumps([_serialize_task(task) for task in tasks], indent=2)
+        written = write_if_changed(self.path, data.encode())
+        if self.snapshot_path is not None and (
+            written or not snapshot_is_current(self.snapshot_path, self.path)
+        ):
+            write_snapshot(self.snapshot_path, tasks, self.path)
+
+    def save_one(self, task: Task) -> None:
+        tasks = self.load()
+        for index, stored in enumerate(tasks):
+            if stored.id == task.id:
+                if stored == task:
+                    log_skip(self.path, f"task {task.id} unchanged")
+                    return
+                tasks[index] = task
+                break
+        else:
+            tasks.append(task)
+        self.save(tasks)
+
+    def fingerprint(self) -> bytes:
+        return self.path.read_bytes() if self.path.exists() else b""
+
+
+def get_task_store() -> TaskStore:
+    if resident_store is not None:
+        return resident_store
+    backend = backend_name()
+    if backend == "sqlite":
+        from taskboard.storage.sqlite_store import SqliteTaskStore
+
+        return SqliteTaskStore(db_path())
+    if backend == "journal":
+        from taskboard.storage.journal_store import JournalTaskStore
+
+        return JournalTaskStore(
+            DATA_PATH.with_name("tasks.snapshot.json"),
+            DATA_PATH.with_name("tasks.journal"),
+            seed_path=DATA_PATH,
+        )
+    if backend == "jsonl":
+        from taskboard.storage.jsonl_store import JsonlTaskStore
+
+        return JsonlTaskStore(
+            DATA_PATH.with_name("tasks.jsonl"), seed_path=DATA_PATH, lazy=lazy_records()
+        )
+    return JsonTaskStore(
+        DATA_PATH, DATA_PATH.with_name("tasks.bin"), lazy=lazy_records()
+    )
+
+
 def load_tasks() -> List[Task]:
-    if not DATA_PATH.exists():
-        return []
-    with open(DATA_PATH, "r") as f:
-        data = json.load(f)
-    return [_deserialize_task(item) for item in data]
+    return get_task_store().load()
+
+
+def iter_tasks(
+    completed: Optional[bool] = None, scheduled_until: Optional[date] = None
+) -> Iterator[Task]:
+    # Tasks in stored order, or only the completed or open ones, and only those
+    # scheduled on or before `scheduled_until`. The jsonl and sqlite stores
+    # read just the matching tasks through their indexes.
+    store = get_task_store()
+    if hasattr(store, "iter"):
+        return store.iter(completed, scheduled_until)
+    return (
+        t
+        for t in store.load()
+        if (completed is None or t.is_completed == completed)
+        and (
+            scheduled_until is None
+            or (t.scheduled_date or date.today()) <= scheduled_until
+        )
+    )
+
+
+def get_active_task() -> Optional[Task]:
+    # The task with a running session, if any
+    store = get_task_store()
+    if hasattr(store, "active"):
+        return store.active()
+    return next((t for t in store.load() if t.active_session_start is not None), None)
+
+
+def load_task_table() -> TaskTable:
+    # The board as columns rather than Task objects, for commands that read
+    # the whole board
+    store = get_task_store()
+    if hasattr(store, "load_table"):
+        return store.load_table()
+    return TaskTable.from_tasks(store.load())
 
 
 def save_tasks(tasks: List[Task]):
-    # Sort tasks by scheduled date and priority before saving
-    tasks.sort(key=lambda t: (t.scheduled_date or date.today(), t.priority))
-    with open(DATA_PATH, "w") as f:
-        json.dump([_serialize_task(task) for task in tasks], f, indent=2)
+    get_task_store().save(tasks)
+
+
+def save_task(task: Task):
+    # Insert or update a single task
+    get_task_store().save_one(task)
+
+
+def tasks_fingerprint() -> bytes:
+    return get_task_store().fingerprint()
@@ -0,0 +1,59 @@
+import atexit
+import os
+import sys
+from pathlib import Path
+
+# With TASKBOARD_DEBUG=1, every write to the board's files is logged to stderr,
+# with the bytes written by the command in total when it exits
+LOGGER_NAME = "taskboard.storage"
+
+_totals = {"bytes": 0, "skipped": 0}
+_configured = False
+
+
+def _configure() -> None:
+    global _configured
+    _configured = True
+    if os.environ.get("TASKBOARD_DEBUG") != "1":
+        return
+    import logging
+
+    logger = logging.getLogger(LOGGER_NAME)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("taskboard: %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    atexit.register(_report_totals)
+
+
+def _debug(message: str, *args) -> None:
+    if not _configured:
+        _configure()
+    # Nothing can be listening before logging is imported, which commands only
+    # do for TASKBOARD_DEBUG=1; it costs more to import than most commands run
+    logging = sys.modules.get("logging")
+    if logging is not None:
+        logging.getLogger(LOGGER_NAME).debug(message, *args)
+
+
+def _report_totals() -> None:
+    _debug(
+        "%d bytes written, %d unchanged writes skipped",
+        _totals["bytes"],
+        _totals["skipped"],
+    )
+
+
+def log_write(path: Path, size: int) -> None:
+    _totals["bytes"] += size
+    _debug("wrote %d bytes to %s", size, path.name)
+
+
+def log_skip(path: Path, reason: str = "unchanged") -> None:
+    _totals["skipped"] += 1
+    _debug("%s %s, not written", path.name, reason)
+
+
+def log_rows(path: Path, table: str, written: int, removed: int) -> None:
+    # SQLite writes pages, not files, so its writes are counted in rows
+    _debug("%s: %d %s rows written, %d removed", path.name, written, table, removed)
@@ -0,0 +1,124 @@
+import sys
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from taskboard.cli import display_tasks
+from taskboard.core.scheduler import generate_schedule
+from taskboard.models.task import Task
+from taskboard.storage import tasks_repository
+from taskboard.storage.archive import (
+    append_to_archive,
+    archive_completed_tasks,
+    archive_path,
+    iter_archived_tasks,
+)
+
+TODAY = date(2026, 3, 1)
+
+
+@pytest.fixture(autouse=True)
+def json_board(tmp_path, monkeypatch):
+    monkeypatch.setenv("TASKBOARD_BACKEND", "json")
+    monkeypatch.setattr(tasks_repository, "DATA_PATH", tmp_path / "tasks.json")
+
+
+def make_task(id, done_days_ago=None, depends_on=None):
+    task = Task(
+        id=id,
+        title=f"Task {id}",
+        duration_minutes=60,
+        priority=1,
+        earliest_start_time=None,
+        latest_end_time=None,
+        flexible=False,
+        scheduled_date=TODAY - timedelta(days=90),
+        depends_on=depends_on or [],
+    )
+    if done_days_ago is not None:
+        task.is_completed = True
+        end = datetime.combine(
+            TODAY - timedelta(days=done_days_ago), datetime.min.time()
+        )
+        task.work_sessions = [(end - timedelta(hours=1), end)]
+    return task
+
+
+def test_only_old_completed_tasks_are_archived():
+    tasks_repository.save_tasks(
+        [make_task(1, done_days_ago=40), make_task(2, done_days_ago=5), make_task(3)]
+    )
+
+    assert archive_completed_tasks(TODAY, older_than_days=30) == 1
+    assert [t.id for t in tasks_repository.load_tasks()] == [2, 3]
+    assert list(iter_archived_tasks()) == [make_task(1, done_days_ago=40)]
+
+    # Later runs add to the archive
+    assert archive_completed_tasks(TODAY, older_than_days=0) == 1
+    assert [t.id for t in iter_archived_tasks()] == [1, 2]
+    assert archive_completed_tasks(TODAY) == 0
+
+
+def test_archive_cut_short_by_a_crash_keeps_complete_members():
+    append_to_archive([make_task(1, done_days_ago=40)])
+    append_to_archive([make_task(2, done_days_ago=40)])
+    data = archive_path().read_bytes()
+    archive_path().write_bytes(data[:-10])
+
+    assert [t.id for t in iter_archived_tasks()] == [1]
+
+
+def test_archiving_after_a_crash_drops_the_torn_member():
+    append_to_archive([make_task(i, done_days_ago=40) for i in range(1, 200)])
+    data = archive_path().read_bytes()
+    archive_path().write_bytes(data[: len(data) // 2])
+    complete = [t.id for t in iter_archived_tasks()]
+
+    tasks_repository.save_tasks([make_task(i, done_days_ago=40) for i in (200, 201)])
+    assert archive_completed_tasks(TODAY) == 2
+    assert [t.id for t in iter_archived_tasks()] == complete + [200, 201]
+
+    # A garbled member ends the stream like a torn one does
+    with open(archive_path(), "ab") as f:
+        f.write(b"\x1f\x8b\x08\x00" + b"\xff" * 40)
+    assert [t.id for t in iter_archived_tasks()] == complete + [200, 201]
+    append_to_archive([make_task(202, done_days_ago=40)])
+    assert [t.id for t in iter_archived_tasks()] == complete + [200, 201, 202]
+
+
+def test_archived_dependencies_count_as_completed():
+    tasks_repository.save_tasks(
+        [make_task(1, done_days_ago=40), make_task(2, depends_on=[1])]
+    )
+    archive_completed_tasks(TODAY)
+
+    tasks = tasks_repository.load_tasks()
+    day_start = datetime(2026, 3, 1, 9)
+    schedule, unscheduled = generate_schedule(
+        tasks, [], day_start, day_start + timedelta(hours=8)
+    )
+    assert [b.id for b in schedule] == [2]
+    assert unscheduled == []
+
+
+def test_display_completed_streams_the_archive(monkeypatch, capsys):
+    tasks_repository.save_tasks(
+        [make_task(1, done_days_ago=40), make_task(2, done_days_ago=1), make_task(3)]
+    )
+    archive_completed_tasks(TODAY)
+    # A task left in both places by an interrupted run is shown once
+    append_to_archive([make_task(2, done_days_ago=1)])
+
+    monkeypatch.setattr(sys, "argv", ["display_tasks", "--completed"])
+    display_tasks.main()
+    assert capsys.readouterr().out.splitlines() == ["[✓] Task 1", "[✓] Task 2"]
+
+    # Archived tasks, finished before the ones in the store, are listed first
+    # among the completed tasks
+    monkeypatch.setattr(sys, "argv", ["display_tasks", "--all"])
+    display_tasks.main()
+    assert capsys.readouterr().out.splitlines() == [
+        "[✓] Task 1",
+        "[✓] Task 2",
+        "[!] Task 3",
+    ]
@@ -0,0 +1,71 @@
+import json
+import random
+from datetime import date, datetime, time, timedelta, timezone
+
+from taskboard.models.task import Task
+from taskboard.storage.binary_snapshot import decode_tasks, encode_tasks, read_snapshot
+from taskboard.storage.tasks_repository import JsonTaskStore
+
+
+def random_task(rng, task_id):
+    start = datetime(2026, 1, 1, 8) + timedelta(
+        minutes=rng.randint(0, 10_000), microseconds=rng.randint(0, 999_999)
+    )
+    return Task(
+        id=task_id,
+        title=rng.choice(["Write", "Review", "Zürich trip ✈", ""]) + f" {task_id % 7}",
+        duration_minutes=rng.choice([5, 30, 90]),
+        priority=rng.randint(1, 3),
+        earliest_start_time=rng.choice([None, time(9), time(0), time(13, 15, 30, 250)]),
+        latest_end_time=rng.choice([None, time(17, 45)]),
+        flexible=rng.random() < 0.5,
+        is_completed=rng.random() < 0.3,
+        description=rng.choice([None, "", "notes", "multi\nline"]),
+        scheduled_date=date(2026, 1, 1) + timedelta(days=rng.randint(-400, 400)),
+        deadline=rng.choice([None, start + timedelta(days=3)]),
+        energy_level=rng.randint(1, 3),
+        work_sessions=[(start, start + timedelta(minutes=25))] * rng.randint(0, 3),
+        active_session_start=rng.choice([None, start]),
+        depends_on=rng.sample(range(1, 50), rng.randint(0, 3)),
+    )
+
+
+def test_encoding_round_trips():
+    rng = random.Random(0)
+    tasks = [random_task(rng, i) for i in range(200)]
+    tasks.append(random_task(rng, 2**128 - 1))  # uuid4 ids use all 128 bits
+    assert decode_tasks(encode_tasks(tasks, 0, 0)) == tasks
+
+
+def test_store_loads_the_snapshot_it_wrote(tmp_path, monkeypatch):
+    rng = random.Random(1)
+    store = JsonTaskStore(tmp_path / "tasks.json", tmp_path / "tasks.bin")
+    store.save([random_task(rng, i) for i in range(50)])
+
+    from_json = JsonTaskStore(tmp_path / "tasks.json").load()
+    monkeypatch.setattr(json, "load", None)  # the snapshot must not need JSON
+    assert store.load() == from_json
+
+
+def test_hand_edited_json_wins_over_the_snapshot(tmp_path):
+    store = JsonTaskStore(tmp_path / "tasks.json", tmp_path / "tasks.bin")
+    store.save([random_task(random.Random(2), 1)])
+
+    data = json.loads((tmp_path / "tasks.json").read_text())
+    data[0]["title"] = "Edited by hand"
+    (tmp_path / "tasks.json").write_text(json.dumps(data))
+
+    assert read_snapshot(tmp_path / "tasks.bin", tmp_path / "tasks.json") is None
+    assert store.load()[0].title == "Edited by hand"
+
+
+def test_boards_the_format_cannot_hold_get_no_snapshot(tmp_path):
+    store = JsonTaskStore(tmp_path / "tasks.json", tmp_path / "tasks.bin")
+    store.save([random_task(random.Random(3), 1)])
+    assert (tmp_path / "tasks.bin").exists()
+
+    task = random_task(random.Random(3), 2)
+    task.active_session_start = datetime(2026, 1, 1, 9, tzinfo=timezone.utc)
+    store.save([task])
+    assert not (tmp_path / "tasks.bin").exists()
+    assert store.load() == [task]
@@ -0,0 +1,52 @@
+import random
+from datetime import datetime, time
+
+import pytest
+
+from taskboard.core.scheduler import generate_schedule
+from tests.test_scheduler_equivalence import DAY, as_tuples, random_board
+
+
+def schedule_both(tasks, events, day_start, day_end, buffer_minutes):
+    interval = generate_schedule(tasks, events, day_start, day_end, buffer_minutes)
+    bitmap = generate_schedule(
+        tasks, events, day_start, day_end, buffer_minutes, engine="bitmap"
+    )
+    return interval, bitmap
+
+
+@pytest.mark.scheduler
+@pytest.mark.parametrize("seed", range(40))
+def test_bitmap_matches_interval_engine(seed):
+    pytest.importorskip("numpy")
+    rng = random.Random(seed)
+    tasks, events = random_board(rng, rng.randint(1, 80), rng.randint(0, 10))
+    day_start = datetime.combine(DAY, time(rng.randint(6, 10), rng.choice([0, 7, 30])))
+    day_end = datetime.combine(DAY, time(rng.randint(17, 23), rng.choice([0, 59])))
+
+    (expected, expected_unscheduled), (actual, actual_unscheduled) = schedule_both(
+        tasks, events, day_start, day_end, rng.choice([0, 5, 10, 15])
+    )
+
+    assert as_tuples(actual) == as_tuples(expected)
+    assert [t.id for t in actual_unscheduled] == [t.id for t in expected_unscheduled]
+
+
+@pytest.mark.scheduler
+def test_bitmap_falls_back_for_unaligned_start():
+    # day_start carries seconds, which a minute bitmap cannot represent
+    tasks, events = random_board(random.Random(1), 30, 4)
+    day_start = datetime(2026, 1, 1, 9, 13, 27, 500)
+
+    (expected, _), (actual, _) = schedule_both(
+        tasks, events, day_start, datetime(2026, 1, 1, 18, 0), 5
+    )
+
+    assert as_tuples(actual) == as_tuples(expected)
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError):
+        generate_schedule(
+            [], [], datetime(2026, 1, 1, 9), datetime(2026, 1, 1, 17), engine="gpu"
+        )
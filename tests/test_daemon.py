@@ -0,0 +1,171 @@
+import io
+import os
+import socket
+import sys
+import threading
+from datetime import date
+
+import pytest
+
+from taskboard.daemon import client
+from taskboard.daemon.client import request, run_command
+from taskboard.daemon.handoff import run_via_daemon
+from taskboard.daemon.resident import Persister, ResidentTaskStore
+from taskboard.daemon.server import _bind, serve
+from taskboard.storage import events_repository, tasks_repository
+from tests.test_storage import make_task
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets"
+)
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    monkeypatch.setenv("TASKBOARD_BACKEND", "json")
+    monkeypatch.setenv("TASKBOARD_DAEMON", "auto")
+    monkeypatch.setattr(tasks_repository, "DATA_PATH", tmp_path / "tasks.json")
+    monkeypatch.setattr(events_repository, "DATA_PATH", tmp_path / "events.json")
+    monkeypatch.setattr(tasks_repository, "resident_store", None)
+    monkeypatch.setattr(events_repository, "resident_store", None)
+    tasks_repository.JsonTaskStore(tmp_path / "tasks.json").save(
+        [make_task(1, scheduled_date=date.today())]
+    )
+
+    path = tmp_path / "tb.sock"
+    ready = threading.Event()
+    thread = threading.Thread(target=serve, args=(path, ready), daemon=True)
+    thread.start()
+    assert ready.wait(5)
+    yield path
+    request(path, "stop")
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def run(path, command, *argv, stdin=""):
+    out, err = io.StringIO(), io.StringIO()
+    code = run_command(path, command, list(argv), io.StringIO(stdin), out, err)
+    return code, out.getvalue(), err.getvalue()
+
+
+def test_commands_run_in_the_daemon(daemon, tmp_path):
+    assert run(daemon, "display_tasks") == (0, "[ ] Task 1\n", "")
+
+    answers = "Write report\n45\n1\n\n\nn\n\n\nn\n"
+    code, out, _ = run(daemon, "add_task", stdin=answers)
+    assert code == 0
+    assert "Enter task title: " in out
+    assert "Task 'Write report' added successfully!" in out
+    assert run(daemon, "display_tasks")[1] == "[ ] Write report\n[ ] Task 1\n"
+
+    code, _, err = run(daemon, "display_tasks", "--bogus")
+    assert code == 2
+    assert "unrecognized arguments: --bogus" in err
+
+    # Saved in the background, and for good once the daemon stops
+    request(daemon, "stop")
+    titles = [
+        t.title for t in tasks_repository.JsonTaskStore(tmp_path / "tasks.json").load()
+    ]
+    assert titles == ["Write report", "Task 1"]
+
+
+def test_only_the_owner_can_connect(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        with _bind(tmp_path / "tb.sock") as listener:
+            assert os.stat(listener.getsockname()).st_mode & 0o777 == 0o600
+        assert os.umask(0o022) == 0o022
+    finally:
+        os.umask(umask)
+
+
+def test_board_changed_outside_the_daemon_is_read_again(daemon, tmp_path):
+    tasks_repository.JsonTaskStore(tmp_path / "tasks.json").save(
+        [make_task(2, scheduled_date=date.today())]
+    )
+    assert run(daemon, "display_tasks")[1] == "[ ] Task 2\n"
+
+
+def test_clients_fall_back_without_a_daemon_for_their_board(
+    daemon, tmp_path, monkeypatch
+):
+    assert (
+        run_command(tmp_path / "missing.sock", "display_tasks", [], None, None, None)
+        is None
+    )
+
+    # A client configured for another board
+    config = dict(client.board_config(), backend="sqlite")
+    monkeypatch.setattr(client, "board_config", lambda: config)
+    assert run(daemon, "display_tasks") == (None, "", "")
+
+
+def test_clients_fall_back_when_the_daemon_does_not_answer(tmp_path, monkeypatch):
+    monkeypatch.setattr(client, "CONNECT_TIMEOUT", 0.1)
+    path = tmp_path / "stuck.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(str(path))
+        listener.listen(1)
+        assert run(path, "display_tasks") == (None, "", "")
+
+
+def test_watching_stays_out_of_the_daemon(daemon, monkeypatch):
+    # The daemon would serve nobody else while the watch runs
+    monkeypatch.setenv("TASKBOARD_SOCKET", str(daemon))
+    monkeypatch.setattr(sys, "argv", ["run_today", "--wat"])
+    assert not run_via_daemon("run_today")
+
+
+def test_a_command_waiting_at_a_prompt_does_not_hold_up_other_clients(daemon):
+    class Prompt(io.StringIO):
+        # Input that the user only types once `typed` is set
+        def __init__(self, text):
+            super().__init__(text)
+            self.asked = threading.Event()
+            self.typed = threading.Event()
+
+        def readline(self, *args):
+            self.asked.set()
+            assert self.typed.wait(5)
+            return super().readline(*args)
+
+    answers = Prompt("Write report\n45\n1\n\n\nn\n\n\nn\n")
+    adding = threading.Thread(
+        target=run_command,
+        args=(daemon, "add_task", [], answers, io.StringIO(), io.StringIO()),
+    )
+    adding.start()
+    assert answers.asked.wait(5)
+
+    # Refused at once, so the client runs the command itself
+    assert run(daemon, "display_tasks") == (None, "", "")
+    assert request(daemon, "ping")
+
+    answers.typed.set()
+    adding.join(5)
+    assert run(daemon, "display_tasks")[1] == "[ ] Write report\n[ ] Task 1\n"
+
+
+def test_a_local_write_during_a_pending_save_is_read_again(tmp_path):
+    store = tasks_repository.JsonTaskStore(tmp_path / "tasks.json")
+    store.save([make_task(1)])
+    persister = Persister()
+    resident = ResidentTaskStore(store, persister)
+
+    # A refused client writes right after the daemon's write lands
+    save_one = store.save_one
+    local = tasks_repository.JsonTaskStore(tmp_path / "tasks.json")
+
+    def save_then_local_write(task):
+        save_one(task)
+        local.save_one(make_task(3))
+
+    store.save_one = save_then_local_write
+    resident.save_one(make_task(2))
+    assert [t.id for t in resident.load()] == [1, 2]
+
+    persister.flush()
+    resident.refresh()
+    assert [t.id for t in resident.load()] == [1, 2, 3]
@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from taskboard.__main__ import COMMANDS, main
+
+ROOT = Path(__file__).parents[1]
+
+
+def run_taskboard(tmp_path, *argv, code=""):
+    env = dict(
+        os.environ,
+        TASKBOARD_BACKEND="sqlite",
+        TASKBOARD_DB=str(tmp_path / "board.db"),
+        TASKBOARD_SOCKET=str(tmp_path / "missing.sock"),
+    )
+    env.pop("TASKBOARD_DAEMON", None)
+    script = (
+        f"import sys\nfrom taskboard.__main__ import main\nmain({list(argv)!r})\n{code}"
+    )
+    return subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_every_cli_module_is_a_command():
+    modules = {path.stem for path in (ROOT / "taskboard" / "cli").glob("*.py")}
+    assert {name.replace("-", "_") for name in COMMANDS} == modules
+
+
+def test_usage_and_unknown_commands(capsys):
+    main(["--help"])
+    assert "run-today" in capsys.readouterr().out
+
+    with pytest.raises(SystemExit) as exit:
+        main(["bogus"])
+    assert exit.value.code == 2
+    assert "unknown command 'bogus'" in capsys.readouterr().err
+
+
+def test_commands_import_only_what_they_need(tmp_path):
+    result = run_taskboard(
+        tmp_path,
+        "display_events",
+        "--date",
+        "2026-01-01",
+        code="print(sorted({'socket', 'logging', 'taskboard.core.scheduler'} & set(sys.modules)))",
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "No events found.\n[]\n"
+
+
+def test_startup_profile(tmp_path):
+    result = run_taskboard(tmp_path, "--startup-profile", "display-events")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "No events found.\n"
+    report = result.stderr.splitlines()
+    assert report[0].startswith("taskboard display-events: ")
+    assert report[1] == "import time: self [us] | cumulative | imported package"
+    assert any("taskboard.storage.events_repository" in line for line in report)
@@ -1,10 +1,13 @@
+import random
 from datetime import datetime, time, timedelta
 
 import pytest
 
-from taskboard.core.scheduler import generate_schedule
+from taskboard.core.compiled import TICKS_PER_MINUTE, compile_events, to_ticks
+from taskboard.core.scheduler import _apply_event_blocking, generate_schedule
 from taskboard.models.event import Event
 from taskboard.models.task import Task
+from tests.reference_scheduler import _apply_event_blocking as reference_event_blocking
 
 
 def make_day(hour):
@@ -187,3 +190,55 @@ def test_no_overlap_any_blocks():
 
     for i in range(len(schedule) - 1):
         assert schedule[i].end_time <= schedule[i + 1].start_time
+
+
+@pytest.mark.scheduler
+def test_event_ending_inside_buffer_before_day_start_is_ignored():
+    # The day starts after the event, so no trailing buffer is applied
+    event = make_event(14, 15)
+    day = event.start.date()
+    day_start = to_ticks(make_day(15).replace(minute=5), day)
+
+    free_time = _apply_event_blocking(
+        day_start,
+        to_ticks(make_day(18), day),
+        compile_events([event], day),
+        15 * TICKS_PER_MINUTE,
+    )
+
+    assert list(free_time) == [(day_start, to_ticks(make_day(18), day))]
+
+
+@pytest.mark.scheduler
+@pytest.mark.parametrize("seed", range(200))
+def test_event_blocking_matches_reference(seed):
+    rng = random.Random(seed)
+    day = make_day(0)
+    events = []
+    for event_id in range(rng.randint(0, 15)):
+        start = day + timedelta(
+            days=rng.choice([0, 0, 0, 0, 1, -1]), minutes=rng.randrange(0, 1440, 5)
+        )
+        end = start + timedelta(minutes=rng.choice([0, 5, 10, 20, 30, 60, 180]))
+        events.append(
+            Event(id=event_id, title=f"Event {event_id}", start=start, end=end)
+        )
+    day_start = day + timedelta(minutes=rng.randrange(0, 1440, 5))
+    day_end = day + timedelta(minutes=rng.randrange(0, 1440, 5))
+    buffer_minutes = rng.choice([0, 5, 10, 15, 30])
+
+    expected = reference_event_blocking(
+        [(day_start, day_end)], events, day.date(), timedelta(minutes=buffer_minutes)
+    )
+    actual = _apply_event_blocking(
+        to_ticks(day_start, day.date()),
+        to_ticks(day_end, day.date()),
+        compile_events(events, day.date()),
+        buffer_minutes * TICKS_PER_MINUTE,
+    )
+
+    assert list(actual) == [
+        (to_ticks(start, day.date()), to_ticks(end, day.date()))
+        for start, end in expected
+        if start < end
+    ]
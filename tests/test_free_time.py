@@ -0,0 +1,70 @@
+import random
+
+from taskboard.core.free_time import FreeTimeIndex
+
+
+def brute_first_fit(intervals, after, min_length):
+    for start, end in sorted(intervals):
+        if start > after and end - start >= min_length:
+            return start, end
+    return None
+
+
+def test_iterates_in_start_order_and_skips_empty_intervals():
+    index = FreeTimeIndex([(50, 60), (0, 10), (20, 20), (30, 45)])
+
+    assert list(index) == [(0, 10), (30, 45), (50, 60)]
+    assert len(index) == 3
+    assert index.max_length() == 15
+
+
+def test_floor_and_first_fit():
+    index = FreeTimeIndex([(0, 10), (30, 45), (50, 60)])
+
+    assert index.floor(35) == (30, 45)
+    assert index.floor(-1) is None
+    assert index.first_fit(0, 12) == (30, 45)
+    assert index.first_fit(30, 10) == (50, 60)
+    assert index.first_fit(30, 11) is None
+
+
+def test_split_on_insert():
+    index = FreeTimeIndex([(0, 100)])
+
+    index.split((0, 100), 20, 35)
+    index.split((35, 100), 35, 50)
+
+    assert list(index) == [(0, 20), (50, 100)]
+    assert index.max_length() == 50
+
+
+def test_overlapping():
+    index = FreeTimeIndex([(0, 10), (30, 45), (50, 60)])
+
+    assert index.overlapping(5, 31) == [(0, 10), (30, 45)]
+    assert index.overlapping(10, 30) == []
+    assert index.overlapping(45, 70) == [(50, 60)]
+
+
+def test_matches_brute_force_under_random_splits():
+    rng = random.Random(7)
+    index = FreeTimeIndex([(0, 10_000)])
+    intervals = [(0, 10_000)]
+
+    for _ in range(500):
+        after = rng.randint(-10, 10_000)
+        min_length = rng.randint(1, 200)
+        expected = brute_first_fit(intervals, after, min_length)
+        assert index.first_fit(after, min_length) == expected
+
+        if expected is not None:
+            start, end = expected
+            cut_start = rng.randint(start, end - 1)
+            cut_end = rng.randint(cut_start + 1, end + 5)
+            index.split(expected, cut_start, cut_end)
+            intervals.remove(expected)
+            intervals += [(start, cut_start), (cut_end, end)]
+            intervals = [(s, e) for s, e in intervals if s < e]
+
+        assert list(index) == sorted(intervals)
+        assert index.max_length() == max((e - s for s, e in intervals), default=None)
@@ -0,0 +1,288 @@
+import random
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from taskboard.cli import display_events, import_ics
+from taskboard.core import recurrence
+from taskboard.core.recurrence import expand, parse_rule
+from taskboard.models.event import Event
+from taskboard.models.recurring_event import RecurringEvent
+from taskboard.storage import events_repository
+from taskboard.storage.events_repository import events_fingerprint, load_events
+from taskboard.storage.ics import IcsReader, iter_components
+from taskboard.storage.recurring_events import RecurringEventStore
+
+CALENDAR = """BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VEVENT
+UID:review@example.com
+SUMMARY:Design review\\, round 2
+DESCRIPTION:Bring the
+  mockups
+DTSTART:20261019T130000
+DTEND:20261019T140000
+BEGIN:VALARM
+DESCRIPTION:Reminder
+END:VALARM
+END:VEVENT
+BEGIN:VEVENT
+UID:standup@example.com
+SUMMARY:Standup
+DTSTART:20200106T093000
+DURATION:PT15M
+RRULE:FREQ=WEEKLY;BYDAY=MO,WE,FR
+EXDATE:20261021T093000
+END:VEVENT
+BEGIN:VEVENT
+UID:standup@example.com
+RECURRENCE-ID:20261023T093000
+SUMMARY:Standup (moved)
+DTSTART:20261023T110000
+DTEND:20261023T111500
+END:VEVENT
+BEGIN:VEVENT
+UID:call@example.com
+SUMMARY:Call
+DTSTART:20261020T080000Z
+DTEND:20261020T083000Z
+END:VEVENT
+BEGIN:VEVENT
+UID:holiday@example.com
+SUMMARY:Holiday
+DTSTART;VALUE=DATE:20261020
+TRANSP:TRANSPARENT
+END:VEVENT
+BEGIN:VEVENT
+UID:hourly@example.com
+SUMMARY:Hydrate
+DTSTART:20261019T090000
+DTEND:20261019T090500
+RRULE:FREQ=HOURLY
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def utc_to_local(*fields):
+    return datetime(*fields, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
+
+@pytest.fixture
+def calendar(tmp_path, monkeypatch):
+    monkeypatch.setenv("TASKBOARD_BACKEND", "json")
+    monkeypatch.setattr(events_repository, "DATA_PATH", tmp_path / "events.json")
+    monkeypatch.setattr(events_repository, "SYNC_STATE_PATH", tmp_path / "sync.json")
+    monkeypatch.setattr(
+        events_repository, "RECURRING_PATH", tmp_path / "recurring.json"
+    )
+    path = tmp_path / "calendar.ics"
+    path.write_text(CALENDAR.replace("\n", "\r\n"), newline="")
+    return path
+
+
+def test_rules_expand_inside_the_window():
+    def days(rule, first, start, end):
+        return [moment.date() for moment in expand(parse_rule(rule), first, start, end)]
+
+    assert days(
+        "FREQ=MONTHLY;BYDAY=-1FR;COUNT=3",
+        datetime(2026, 1, 30, 10),
+        date(2026, 1, 1),
+        date(2027, 1, 1),
+    ) == [date(2026, 1, 30), date(2026, 2, 27), date(2026, 3, 27)]
+    assert days(
+        "FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,TH;UNTIL=20261020",
+        datetime(2026, 10, 1, 10),
+        date(2026, 1, 1),
+        date(2027, 1, 1),
+    ) == [date(2026, 10, 1), date(2026, 10, 13), date(2026, 10, 15)]
+    assert days(
+        "FREQ=YEARLY;BYMONTH=11;BYDAY=4TH",
+        datetime(2026, 11, 26, 10),
+        date(2028, 1, 1),
+        date(2029, 12, 31),
+    ) == [date(2028, 11, 23), date(2029, 11, 22)]
+    assert days(
+        "FREQ=MONTHLY;BYMONTHDAY=31",
+        datetime(2026, 1, 31, 10),
+        date(2026, 1, 1),
+        date(2026, 6, 30),
+    ) == [date(2026, 1, 31), date(2026, 3, 31), date(2026, 5, 31)]
+
+    # Skipping the periods before the window gives what enumerating them does
+    rng = random.Random(7)
+    for _ in range(300):
+        freq = rng.choice(["DAILY", "WEEKLY", "MONTHLY", "YEARLY"])
+        rule = f"FREQ={freq};INTERVAL={rng.randint(1, 4)}"
+        rule += {
+            "WEEKLY": ";BYDAY=TU,SA",
+            "MONTHLY": ";BYDAY=2WE",
+            "YEARLY": ";BYMONTH=2,8",
+        }.get(freq, "")
+        first = datetime(2024, rng.randint(1, 12), rng.randint(1, 28), 9)
+        start = date(2024, 1, 1) + timedelta(days=rng.randint(0, 2000))
+        end = start + timedelta(days=rng.randint(0, 40))
+        everything = expand(parse_rule(rule), first, first.date(), end)
+        assert list(expand(parse_rule(rule), first, start, end)) == [
+            moment for moment in everything if moment.date() >= start
+        ]
+
+
+def test_expanding_a_long_running_rule_only_visits_the_window(monkeypatch):
+    visited = []
+    days = recurrence._days
+    monkeypatch.setattr(
+        recurrence, "_days", lambda *args: visited.append(args[2]) or days(*args)
+    )
+
+    rule = parse_rule("FREQ=DAILY")
+    assert list(
+        expand(rule, datetime(1990, 1, 1, 9), date(2026, 10, 19), date(2026, 10, 20))
+    ) == [
+        datetime(2026, 10, 19, 9),
+        datetime(2026, 10, 20, 9),
+    ]
+    assert visited == [date(2026, 10, 19), date(2026, 10, 20)]
+
+
+def test_unsupported_rules_are_refused():
+    for rule in (
+        "FREQ=HOURLY",
+        "FREQ=MONTHLY;BYSETPOS=-1",
+        "FREQ=WEEKLY;BYDAY=1MO",
+        "FREQ=WEEKLY;BYMONTHDAY=15",
+        "FREQ=DAILY;INTERVAL=0",
+    ):
+        with pytest.raises(ValueError):
+            parse_rule(rule)
+
+
+def test_components_are_read_one_at_a_time():
+    read = []
+
+    def lines():
+        for line in CALENDAR.splitlines():
+            read.append(line)
+            yield line
+
+    components = iter_components(lines())
+    first = next(components)
+    assert first["UID"] == [({}, "review@example.com")]
+    assert "Reminder" not in str(first)
+    # Only one line past the event is read, to see that it is not folded
+    assert read[-2:] == ["END:VEVENT", "BEGIN:VEVENT"]
+
+
+def test_reader_turns_vevents_into_events_and_series(calendar):
+    reader = IcsReader(calendar, "work")
+    items = list(reader)
+    events = [item for item in items if isinstance(item, Event)]
+    (standup,) = [item for item in items if isinstance(item, RecurringEvent)]
+
+    review, moved, call = events
+    assert (review.title, review.description) == (
+        "Design review, round 2",
+        "Bring the mockups",
+    )
+    assert (review.source, review.external_id) == ("work", "review@example.com")
+    assert moved.external_id == "standup@example.com/20261023T093000"
+    assert (call.start, call.end) == (
+        utc_to_local(2026, 10, 20, 8),
+        utc_to_local(2026, 10, 20, 8, 30),
+    )
+
+    assert standup.end - standup.start == timedelta(minutes=15)
+    assert standup.exdates == [
+        datetime(2026, 10, 21, 9, 30),
+        datetime(2026, 10, 23, 9, 30),
+    ]
+    assert len(reader.skipped) == 1 and reader.skipped[0].startswith(
+        "hourly@example.com"
+    )
+
+    # Reading the file again gives the same ids
+    assert [
+        item.id for item in IcsReader(calendar, "work") if isinstance(item, Event)
+    ] == [e.id for e in events]
+
+
+def test_import_expands_repeating_events_only_for_the_days_read(
+    calendar, monkeypatch, capsys
+):
+    monkeypatch.setattr(sys, "argv", ["import_ics", str(calendar), "--source", "work"])
+    import_ics.main()
+    assert "3 events added" in capsys.readouterr().out
+    assert len(load_events()) == 3
+
+    week = load_events(date(2026, 10, 19), date(2026, 10, 23))
+    standups = [(e.title, e.start) for e in week if e.title.startswith("Standup")]
+    assert standups == [
+        ("Standup", datetime(2026, 10, 19, 9, 30)),
+        ("Standup (moved)", datetime(2026, 10, 23, 11, 0)),
+    ]
+    assert week == sorted(week, key=lambda e: (e.start, e.title))
+
+    # The days read are cached; reading them again does not expand the rules
+    with monkeypatch.context() as patch:
+        patch.setattr(
+            RecurringEventStore, "load", lambda self: pytest.fail("expanded again")
+        )
+        assert load_events(date(2026, 10, 19), date(2026, 10, 23)) == week
+
+    # The same file again is not read
+    import_ics.main()
+    assert "has not changed since it was last imported" in capsys.readouterr().out
+
+    # A changed file syncs what was imported under the same source
+    before = events_fingerprint()
+    calendar.write_text(CALENDAR.replace("BYDAY=MO,WE,FR", "BYDAY=TU"))
+    monkeypatch.setattr(sys, "argv", ["import_ics", str(calendar), "--source", "work"])
+    import_ics.main()
+    assert events_fingerprint() != before
+    assert len(load_events()) == 3
+    assert [
+        e.start
+        for e in load_events(date(2026, 10, 19), date(2026, 10, 23))
+        if e.title == "Standup"
+    ] == [datetime(2026, 10, 20, 9, 30)]
+
+
+def test_display_events_lists_repeating_events_in_time_order(
+    calendar, monkeypatch, capsys
+):
+    monkeypatch.setattr(sys, "argv", ["import_ics", str(calendar), "--source", "work"])
+    import_ics.main()
+    capsys.readouterr()
+
+    # The standup repeats and starts before the review, which is stored
+    monkeypatch.setattr(sys, "argv", ["display_events", "--date", "2026-10-19"])
+    display_events.main()
+    assert capsys.readouterr().out.splitlines() == [
+        "- Standup (Event): 2026-10-19 09:30 to 2026-10-19 09:45",
+        "- Design review, round 2 (Event): 2026-10-19 13:00 to 2026-10-19 14:00",
+    ]
+
+
+def test_import_cut_short_before_the_repeating_events_runs_again(
+    calendar, monkeypatch, capsys
+):
+    monkeypatch.setattr(sys, "argv", ["import_ics", str(calendar), "--source", "work"])
+    with monkeypatch.context() as patch:
+        patch.setattr(RecurringEventStore, "save", lambda self, series: 1 / 0)
+        with pytest.raises(ZeroDivisionError):
+            import_ics.main()
+    capsys.readouterr()
+
+    # The events were synced, but the file is read again for its standup
+    import_ics.main()
+    assert "3 unchanged, and 1 repeating events" in capsys.readouterr().out
+    assert [
+        (e.title, e.start) for e in load_events(date(2026, 10, 19), date(2026, 10, 19))
+    ] == [
+        ("Standup", datetime(2026, 10, 19, 9, 30)),
+        ("Design review, round 2", datetime(2026, 10, 19, 13, 0)),
+    ]
+    import_ics.main()
+    assert "has not changed" in capsys.readouterr().out
@@ -0,0 +1,239 @@
+import copy
+import random
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from taskboard.core.incremental import ChangeSet, advance, plan_schedule, reschedule
+from taskboard.core.scheduler import generate_schedule
+from taskboard.models.event import Event
+from taskboard.models.task import Task
+from tests.test_scheduler_equivalence import as_tuples, random_board
+
+# Active sessions are only taken at face value while they have not run over
+FUTURE = date(2030, 1, 1)
+
+
+def at(hour, minute=0):
+    return datetime.combine(FUTURE, time(hour, minute))
+
+
+def make_task(id, duration=60, priority=2, earliest=None, depends_on=None):
+    return Task(
+        id=id,
+        title=f"Task {id}",
+        duration_minutes=duration,
+        priority=priority,
+        earliest_start_time=earliest,
+        latest_end_time=None,
+        flexible=False,
+        depends_on=depends_on or [],
+    )
+
+
+def future_board(rng):
+    tasks, events = random_board(rng, rng.randint(1, 40), rng.randint(0, 6))
+    for task in tasks:
+        if task.scheduled_date:
+            task.scheduled_date = FUTURE + (task.scheduled_date - date(2026, 1, 1))
+    for event in events:
+        event.start = datetime.combine(FUTURE, event.start.time())
+        event.end = datetime.combine(FUTURE, event.end.time())
+    return tasks, events
+
+
+def random_change(rng, tasks, events):
+    # Applies one edit to the board in place and describes it
+    active = [t for t in tasks if t.active_session_start is not None]
+    pool = [t for t in tasks if not t.is_completed and t.active_session_start is None]
+    kind = rng.choice(["add", "start", "stop", "complete", "event"])
+
+    if kind == "start" and pool and not active:
+        task = rng.choice(pool)
+        task.active_session_start = at(rng.randint(8, 14), rng.choice([0, 20]))
+        return ChangeSet(started_tasks=[task.id])
+    if kind == "stop" and active:
+        task = active[0]
+        task.active_session_start = None
+        task.is_completed = rng.random() < 0.5
+        return ChangeSet(stopped_tasks=[task.id])
+    if kind == "complete" and pool:
+        task = rng.choice(pool)
+        task.is_completed = True
+        return ChangeSet(stopped_tasks=[task.id])
+    if kind == "event":
+        start = at(rng.randint(8, 20), rng.choice([0, 30]))
+        event = Event(
+            id=500_000, title="New", start=start, end=start + timedelta(minutes=45)
+        )
+        events.append(event)
+        return ChangeSet(added_events=[event])
+
+    task = make_task(
+        max((t.id for t in tasks), default=0) + 1,
+        duration=rng.choice([15, 30, 60]),
+        priority=rng.randint(1, 3),
+        earliest=rng.choice([None, time(rng.randint(9, 18))]),
+        depends_on=[rng.choice(tasks).id] if tasks and rng.random() < 0.3 else [],
+    )
+    tasks.append(task)
+    return ChangeSet(added_tasks=[task.id])
+
+
+def assert_valid(blocks, unscheduled, tasks, events, day_end, buffer_minutes):
+    buffer = timedelta(minutes=buffer_minutes)
+    task_map = {t.id: t for t in tasks}
+    ends = {b.id: b.end_time for b in blocks}
+    placed = [b for b in blocks if task_map[b.id].active_session_start is None]
+
+    for block in placed:
+        assert block.end_time <= day_end
+        assert block.end_time - block.start_time == timedelta(
+            minutes=task_map[block.id].duration_minutes
+        )
+        for event in events:
+            if event.start.date() == FUTURE:
+                assert block.end_time <= event.start or block.start_time >= event.end
+        for dep_id in task_map[block.id].depends_on:
+            if dep_id in ends:
+                assert block.start_time >= ends[dep_id]
+    for first, second in zip(blocks, blocks[1:]):
+        assert first.end_time <= second.start_time
+        if second in placed:
+            assert first.end_time + buffer <= second.start_time
+
+    # Every task in today's pool ends up in exactly one of the two lists
+    pool = {
+        t.id
+        for t in tasks
+        if not t.is_completed
+        and t.active_session_start is None
+        and (t.scheduled_date is None or t.scheduled_date <= FUTURE)
+    }
+    assert sorted([b.id for b in placed] + [t.id for t in unscheduled]) == sorted(pool)
+
+
+@pytest.mark.scheduler
+@pytest.mark.parametrize("seed", range(20))
+def test_plan_matches_generate_schedule(seed):
+    rng = random.Random(seed)
+    tasks, events = future_board(rng)
+    buffer_minutes = rng.choice([0, 10])
+
+    plan = plan_schedule(tasks, events, at(8), at(20), buffer_minutes)
+    expected, expected_unscheduled = generate_schedule(
+        tasks, events, at(8), at(20), buffer_minutes
+    )
+
+    assert as_tuples(plan.blocks) == as_tuples(expected)
+    assert [t.id for t in plan.unscheduled] == [t.id for t in expected_unscheduled]
+
+
+@pytest.mark.scheduler
+@pytest.mark.parametrize("seed", range(60))
+def test_reschedule_keeps_a_valid_plan(seed):
+    rng = random.Random(seed)
+    tasks, events = future_board(rng)
+    buffer_minutes = rng.choice([0, 10])
+    plan = plan_schedule(tasks, events, at(8), at(20), buffer_minutes)
+
+    for _ in range(3):
+        tasks, events = copy.deepcopy(tasks), list(events)
+        changes = random_change(rng, tasks, events)
+        plan = reschedule(plan, tasks, events, changes)
+        assert_valid(
+            plan.blocks, plan.unscheduled, tasks, events, at(20), buffer_minutes
+        )
+
+
+@pytest.mark.scheduler
+def test_added_task_keeps_blocks_before_its_earliest_start():
+    tasks = [make_task(1, priority=3), make_task(2, priority=3)]
+    plan = plan_schedule(tasks, [], at(9), at(17))
+
+    # Planned from scratch the new task would go first
+    tasks.append(make_task(3, priority=1, earliest=time(10)))
+    plan = reschedule(plan, tasks, [], ChangeSet(added_tasks=[3]))
+
+    assert [(b.id, b.start_time) for b in plan.blocks] == [
+        (1, at(9)),
+        (3, at(10)),
+        (2, at(11)),
+    ]
+
+
+@pytest.mark.scheduler
+def test_starting_the_next_task_on_time_keeps_the_rest():
+    tasks = [make_task(i, priority=i) for i in (1, 2, 3)]
+    tasks.append(make_task(4, priority=3, depends_on=[1]))
+    plan = plan_schedule(tasks, [], at(9), at(17), buffer_minutes=10)
+
+    tasks[0].active_session_start = at(9)
+    started = reschedule(plan, tasks, [], ChangeSet(started_tasks=[1]))
+
+    assert started.placements == {
+        task_id: placed for task_id, placed in plan.placements.items() if task_id != 1
+    }
+    assert [b.title for b in started.blocks][0] == "Task 1 (IN PROGRESS)"
+
+
+@pytest.mark.scheduler
+def test_new_event_moves_only_what_it_overlaps():
+    tasks = [make_task(i) for i in (1, 2, 3)]
+    plan = plan_schedule(tasks, [], at(9), at(17))
+
+    event = Event(id=99, title="Call", start=at(11), end=at(11, 30))
+    plan = reschedule(plan, tasks, [event], ChangeSet(added_events=[event]))
+
+    assert [(b.id, b.start_time) for b in plan.blocks] == [
+        (1, at(9)),
+        (2, at(10)),
+        (3, at(11, 30)),
+    ]
+
+
+@pytest.mark.scheduler
+@pytest.mark.parametrize("seed", range(20))
+def test_advancing_the_clock_matches_a_fresh_plan(seed):
+    rng = random.Random(seed)
+    tasks, events = future_board(rng)
+    buffer_minutes = rng.choice([0, 10])
+    plan = plan_schedule(tasks, events, at(8), at(20), buffer_minutes)
+
+    now = at(8)
+    while now < at(20):
+        now += timedelta(minutes=rng.choice([1, 5, 13]))
+        fresh = plan_schedule(tasks, events, now, at(20), buffer_minutes)
+        advanced = advance(plan, events, now)
+        if advanced is not None:
+            assert as_tuples(advanced.blocks) == as_tuples(fresh.blocks)
+            assert [t.id for t in advanced.unscheduled] == [
+                t.id for t in fresh.unscheduled
+            ]
+        plan = advanced or fresh
+
+
+def test_advancing_past_a_block_or_an_event_buffer_plans_again():
+    tasks = [make_task(1), make_task(2)]
+    plan = plan_schedule(tasks, [], at(9), at(17))
+    assert advance(plan, [], at(9)).blocks == plan.blocks
+    assert advance(plan, [], at(9, 1)) is None
+
+    # Free time after an event only waits out its buffer while the event is
+    # still ahead of the day's start
+    event = Event(id=99, title="Call", start=at(9), end=at(9, 30))
+    plan = plan_schedule(tasks, [event], at(8, 55), at(17), buffer_minutes=10)
+    assert plan.blocks[0].start_time == at(9, 40)
+    assert advance(plan, [event], at(9, 20)) is not None
+    assert advance(plan, [event], at(9, 30)) is None
+
+
+def test_no_changes_returns_the_same_plan():
+    tasks = [make_task(1)]
+    plan = plan_schedule(tasks, [], at(9), at(17))
+    assert reschedule(plan, tasks, [], ChangeSet()) is plan
+
+
+def test_plan_rejects_unknown_engine():
+    with pytest.raises(ValueError):
+        plan_schedule([], [], at(9), at(17), engine="gpu")
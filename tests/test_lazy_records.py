@@ -0,0 +1,85 @@
+import random
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from taskboard.models.event import Event
+from taskboard.storage.events_repository import JsonEventStore
+from taskboard.storage.settings import lazy_records
+from taskboard.storage.tasks_repository import JsonTaskStore
+from tests.test_binary_snapshot import random_task
+
+
+@pytest.fixture(params=["json", "snapshot"])
+def stores(request, tmp_path):
+    # (eager store, lazy store) over the same board
+    snapshot = tmp_path / "tasks.bin" if request.param == "snapshot" else None
+    rng = random.Random(0)
+    JsonTaskStore(tmp_path / "tasks.json", snapshot).save(
+        [random_task(rng, i) for i in range(100)]
+    )
+    return (
+        JsonTaskStore(tmp_path / "tasks.json"),
+        JsonTaskStore(tmp_path / "tasks.json", snapshot, lazy=True),
+    )
+
+
+def test_lazy_tasks_equal_eager_ones(stores):
+    eager, lazy = stores
+    tasks = lazy.load()
+    assert tasks == eager.load()
+    assert eager.load() == tasks
+
+
+def test_fields_are_decoded_on_first_read(stores):
+    _, lazy = stores
+    task = lazy.load()[0]
+    assert task._decoded == 0
+
+    sessions = task.work_sessions
+    assert task._decoded != 0
+    assert task.work_sessions is sessions
+    assert isinstance(task.scheduled_date, date)
+
+
+def test_assigned_fields_are_saved(stores):
+    eager, lazy = stores
+    tasks = lazy.load()
+    started = datetime(2026, 3, 1, 9, 30)
+    tasks[0].active_session_start = started
+    tasks[0].earliest_start_time = time(6)
+    tasks[0].title = "Renamed"
+    lazy.save(tasks)
+
+    reloaded = {t.id: t for t in eager.load()}[tasks[0].id]
+    assert reloaded.active_session_start == started
+    assert reloaded.earliest_start_time == time(6)
+    assert reloaded.title == "Renamed"
+
+
+def test_lazy_events(tmp_path):
+    start = datetime(2026, 1, 1, 9)
+    events = [
+        Event(
+            id=i,
+            title=f"Event {i}",
+            start=start + timedelta(days=i),
+            end=start + timedelta(days=i, hours=1),
+            description=None if i % 2 else "notes",
+        )
+        for i in range(10)
+    ]
+    JsonEventStore(tmp_path / "events.json").save(events)
+
+    lazy = JsonEventStore(tmp_path / "events.json", lazy=True)
+    assert lazy.load() == events
+    day = date(2026, 1, 4)
+    assert lazy.load(day, day) == [events[3]]
+
+
+def test_lazy_mode_from_the_environment(monkeypatch):
+    monkeypatch.setenv("TASKBOARD_LAZY", "1")
+    assert lazy_records()
+    monkeypatch.setenv("TASKBOARD_LAZY", "yes")
+    with pytest.raises(ValueError):
+        lazy_records()
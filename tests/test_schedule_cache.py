@@ -0,0 +1,138 @@
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from taskboard.cli import run_today
+from taskboard.core.timeline import ScheduledBlock
+from taskboard.models.task import Task
+from taskboard.storage import events_repository, schedule_cache, tasks_repository
+from taskboard.storage.schedule_cache import CachedSchedule, ScheduleCache, cache_key
+
+
+def make_entry(valid_until=None, titles=("Write",)):
+    start = datetime(2026, 1, 1, 9, 0)
+    return CachedSchedule(
+        blocks=[
+            ScheduledBlock(
+                id=i,
+                title=title,
+                start_time=start + timedelta(hours=i),
+                end_time=start + timedelta(hours=i + 1),
+            )
+            for i, title in enumerate(titles)
+        ],
+        unscheduled=[("Later", 30)],
+        valid_until=valid_until,
+    )
+
+
+def test_key_depends_on_every_part():
+    assert cache_key(b"ab", b"c") != cache_key(b"a", b"bc")
+    assert cache_key(b"a", b"b") == cache_key(b"a", b"b")
+
+
+def test_round_trip_and_counters(tmp_path):
+    cache = ScheduleCache(tmp_path)
+    now = datetime(2026, 1, 1, 8, 0)
+
+    assert cache.get("k", now) is None
+    cache.put("k", make_entry())
+    assert cache.get("k", now) == make_entry()
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_entry_expires_when_the_clock_matters(tmp_path):
+    cache = ScheduleCache(tmp_path)
+    cache.put("k", make_entry(valid_until=datetime(2026, 1, 1, 10, 0)))
+
+    assert cache.get("k", datetime(2026, 1, 1, 9, 59)) is not None
+    assert cache.get("k", datetime(2026, 1, 1, 10, 0)) is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    entry_size = len(json.dumps(schedule_cache._serialize_entry(make_entry())))
+    cache = ScheduleCache(tmp_path, max_bytes=entry_size * 2)
+    now = datetime(2026, 1, 1, 8, 0)
+
+    cache.put("a", make_entry())
+    cache.put("b", make_entry())
+    # Both written a while ago, so the hit below is clearly the latest use
+    for key in ("a", "b"):
+        os.utime(tmp_path / f"{key}.json", (1_000_000, 1_000_000))
+    cache.get("a", now)  # b is now the least recently used
+    cache.put("c", make_entry())
+
+    assert cache.get("b", now) is None
+    assert cache.get("a", now) is not None
+    assert cache.get("c", now) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_removed_by_another_run_are_not_an_error(tmp_path, monkeypatch):
+    cache = ScheduleCache(tmp_path, max_bytes=1)
+    now = datetime(2026, 1, 1, 8, 0)
+    cache.put("a", make_entry())
+
+    # Evicted between the read and the mtime refresh
+    utime = os.utime
+    monkeypatch.setattr(os, "utime", lambda path: os.unlink(path) or utime(path))
+    assert cache.get("a", now) == make_entry()
+    monkeypatch.undo()
+
+    # Gone between the listing and the stat, or removed by another run first
+    cache.put("b", make_entry())
+    glob, unlink = Path.glob, Path.unlink
+    monkeypatch.setattr(
+        Path, "glob", lambda self, pattern: [*glob(self, pattern), self / "gone.json"]
+    )
+    monkeypatch.setattr(Path, "unlink", lambda self: unlink(self) or unlink(self))
+    cache.put("c", make_entry())
+    monkeypatch.undo()
+    assert sorted(path.name for path in tmp_path.glob("*.json")) == [
+        "c.json",
+        "stats.json",
+    ]
+    assert cache.stats() == {"hits": 1, "misses": 0, "evictions": 0}
+
+
+def test_run_today_renders_cached_schedule(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(tasks_repository, "DATA_PATH", tmp_path / "tasks.json")
+    monkeypatch.setattr(events_repository, "DATA_PATH", tmp_path / "events.json")
+    monkeypatch.setattr(schedule_cache, "CACHE_DIR", tmp_path / "cache")
+    tasks_repository.save_tasks(
+        [
+            Task(
+                id=1,
+                title="Write",
+                duration_minutes=60,
+                priority=1,
+                earliest_start_time=None,
+                latest_end_time=None,
+                flexible=False,
+                scheduled_date=date.today(),
+            )
+        ]
+    )
+
+    def run(*args):
+        monkeypatch.setattr(
+            sys, "argv", ["run_today", "--start", "09:00", "--end", "17:00", *args]
+        )
+        run_today.main()
+        return capsys.readouterr().out
+
+    first = run()
+    assert "09:00 - 10:00: Write (60 mins)" in first
+    assert run() == first
+    assert run("--no-cache") == first
+    assert ScheduleCache().stats() == {"hits": 1, "misses": 1, "evictions": 0}
+
+    # Editing the board changes the key
+    tasks = tasks_repository.load_tasks()
+    tasks[0].duration_minutes = 30
+    tasks_repository.save_tasks(tasks)
+    assert "09:00 - 09:30: Write (30 mins)" in run()
+
+    assert "Hit rate: 33.3% of 3 lookups" in run("--cache-stats")
@@ -0,0 +1,197 @@
+import random
+import sys
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from taskboard.cli import run_week
+from taskboard.core.scheduler import generate_schedule, generate_schedule_range
+from taskboard.models.event import Event
+from taskboard.models.task import Task
+from taskboard.storage import events_repository, tasks_repository
+from tests.test_scheduler_equivalence import DAY, as_tuples, random_board
+
+WINDOW = (time(9, 0), time(17, 0))
+
+
+def make_task(id, duration=60, priority=2, scheduled_date=None, depends_on=None):
+    return Task(
+        id=id,
+        title=f"Task {id}",
+        duration_minutes=duration,
+        priority=priority,
+        earliest_start_time=None,
+        latest_end_time=None,
+        flexible=False,
+        scheduled_date=scheduled_date,
+        depends_on=depends_on or [],
+    )
+
+
+def day(offset):
+    return DAY + timedelta(days=offset)
+
+
+def at(offset, hour):
+    return datetime.combine(day(offset), time(hour))
+
+
+@pytest.mark.scheduler
+@pytest.mark.parametrize("seed", range(20))
+def test_single_day_range_matches_generate_schedule(seed):
+    rng = random.Random(seed)
+    tasks, events = random_board(rng, rng.randint(1, 60), rng.randint(0, 8))
+    buffer_minutes = rng.choice([0, 10])
+
+    expected, expected_unscheduled = generate_schedule(
+        tasks, events, at(0, 9), at(0, 17), buffer_minutes
+    )
+    plan, unscheduled = generate_schedule_range(
+        tasks, events, DAY, DAY, WINDOW, buffer_minutes
+    )
+
+    assert as_tuples(plan[DAY]) == as_tuples(expected)
+    # Tasks outside the horizon are not reported as left over
+    assert {t.id for t in unscheduled} == {
+        t.id
+        for t in expected_unscheduled
+        if t.scheduled_date is None or t.scheduled_date <= DAY
+    }
+
+
+@pytest.mark.scheduler
+def test_overflow_carries_forward():
+    tasks = [make_task(i, duration=300) for i in (1, 2, 3)]
+
+    plan, unscheduled = generate_schedule_range(tasks, [], day(0), day(1), WINDOW)
+
+    assert [b.id for b in plan[day(0)]] == [1]
+    assert [b.id for b in plan[day(1)]] == [2]
+    assert [t.id for t in unscheduled] == [3]
+
+
+@pytest.mark.scheduler
+def test_future_task_joins_on_its_scheduled_date():
+    tasks = [make_task(1, scheduled_date=day(2)), make_task(2)]
+
+    plan, _ = generate_schedule_range(tasks, [], day(0), day(3), WINDOW)
+
+    assert [b.id for b in plan[day(0)]] == [2]
+    assert plan[day(1)] == []
+    assert [b.id for b in plan[day(2)]] == [1]
+
+
+@pytest.mark.scheduler
+def test_cross_day_dependency_waits_for_parent():
+    parent = make_task(1, scheduled_date=day(1))
+    child = make_task(2, priority=1, depends_on=[1])
+
+    plan, unscheduled = generate_schedule_range(
+        [parent, child], [], day(0), day(2), WINDOW, buffer_minutes=10
+    )
+
+    assert plan[day(0)] == []
+    blocks = {b.id: b for b in plan[day(1)]}
+    assert blocks[2].start_time >= blocks[1].end_time + timedelta(minutes=10)
+    assert not unscheduled
+
+
+@pytest.mark.scheduler
+def test_events_only_block_their_own_day():
+    event = Event(id=99, title="Offsite", start=at(1, 9), end=at(1, 16))
+    tasks = [make_task(1, duration=120, scheduled_date=day(1))]
+
+    plan, unscheduled = generate_schedule_range(tasks, [event], day(1), day(2), WINDOW)
+
+    assert plan[day(1)] == []
+    assert plan[day(2)][0].start_time == at(2, 9)
+    assert not unscheduled
+
+
+def test_range_rejects_unknown_engine():
+    with pytest.raises(ValueError):
+        generate_schedule_range([], [], DAY, DAY, WINDOW, engine="gpu")
+
+
+def test_first_day_start_overrides_window():
+    tasks = [make_task(1), make_task(2)]
+
+    plan, _ = generate_schedule_range(
+        tasks, [], day(0), day(1), WINDOW, first_day_start=at(0, 16)
+    )
+
+    assert [b.start_time for b in plan[day(0)]] == [at(0, 16)]
+    assert [b.start_time for b in plan[day(1)]] == [at(1, 9)]
+
+
+def test_plan_has_every_day_of_the_horizon():
+    plan, _ = generate_schedule_range([], [], day(0), day(6), WINDOW)
+    assert list(plan) == [day(i) for i in range(7)]
+
+
+def multi_day_board(rng, n_days):
+    # Tasks spread over the horizon, with dependencies mostly inside one day
+    tasks = []
+    for task_id in range(1, rng.randint(5, 80)):
+        offset = rng.randrange(n_days)
+        same_day = [t.id for t in tasks if t.scheduled_date == day(offset)]
+        depends_on = []
+        if same_day and rng.random() < 0.3:
+            depends_on = [rng.choice(same_day)]
+        elif tasks and rng.random() < 0.05:
+            depends_on = [rng.choice(tasks).id]
+        tasks.append(
+            make_task(
+                task_id,
+                duration=rng.choice([15, 30, 60, 120, 240]),
+                priority=rng.randint(1, 3),
+                scheduled_date=day(offset),
+                depends_on=depends_on,
+            )
+        )
+    events = [
+        Event(id=1000 + i, title="Event", start=at(offset, 12), end=at(offset, 13))
+        for i, offset in enumerate(rng.sample(range(n_days), n_days // 2))
+    ]
+    return tasks, events
+
+
+@pytest.mark.scheduler
+@pytest.mark.parametrize("seed", range(8))
+def test_parallel_range_matches_serial(seed):
+    rng = random.Random(seed)
+    tasks, events = multi_day_board(rng, 6)
+    buffer_minutes = rng.choice([0, 10])
+
+    expected, expected_unscheduled = generate_schedule_range(
+        tasks, events, day(0), day(5), WINDOW, buffer_minutes
+    )
+    plan, unscheduled = generate_schedule_range(
+        tasks, events, day(0), day(5), WINDOW, buffer_minutes, workers=2
+    )
+
+    assert {d: as_tuples(blocks) for d, blocks in plan.items()} == {
+        d: as_tuples(blocks) for d, blocks in expected.items()
+    }
+    assert [t.id for t in unscheduled] == [t.id for t in expected_unscheduled]
+
+
+def test_run_week_shows_the_events_of_past_days(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("TASKBOARD_BACKEND", "json")
+    monkeypatch.setattr(tasks_repository, "DATA_PATH", tmp_path / "tasks.json")
+    monkeypatch.setattr(events_repository, "DATA_PATH", tmp_path / "events.json")
+    last_week = date.today() - timedelta(days=7)
+    lunch = datetime.combine(last_week, time(12))
+    events_repository.save_events(
+        [Event(id=1, title="Lunch", start=lunch, end=lunch + timedelta(hours=1))]
+    )
+    tasks_repository.save_tasks([make_task(2, scheduled_date=last_week)])
+
+    monkeypatch.setattr(
+        sys, "argv", ["run_week", "--from", last_week.isoformat(), "--days", "1"]
+    )
+    run_week.main()
+    assert capsys.readouterr().out.splitlines()[3:5] == [
+        "09:00 - 10:00: Task 2 (60 mins)",
+        "12:00 - 13:00: [EVENT] Lunch (60 mins)",
+    ]
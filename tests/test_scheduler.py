@@ -116,3 +116,21 @@ def test_buffer_between_tasks():
 
     assert schedule[0].end_time.minute == 0
     assert schedule[1].start_time.minute == 10
+
+
+@pytest.mark.scheduler
+def test_buffer_before_later_scheduled_block():
+    anchored = make_task(id=1, priority=1, earliest_start_time=time(10, 0))
+    filler = make_task(id=2, priority=2)
+
+    schedule, _ = generate_schedule(
+        [anchored, filler],
+        [],
+        day_start=make_day(9),
+        day_end=make_day(17),
+        buffer_minutes=10,
+    )
+
+    # The free hour before the anchored task has no room for the trailing buffer
+    assert [block.id for block in schedule] == [1, 2]
+    assert schedule[1].start_time == make_day(11).replace(minute=10)
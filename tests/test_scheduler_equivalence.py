@@ -0,0 +1,80 @@
+import random
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from taskboard.core.scheduler import generate_schedule
+from taskboard.models.event import Event
+from taskboard.models.task import Task
+from tests.reference_scheduler import generate_schedule as reference_schedule
+
+DAY = date(2026, 1, 1)
+
+
+def random_board(rng: random.Random, n_tasks: int, n_events: int):
+    ids = list(range(1, n_tasks + 1))
+    tasks = []
+    for task_id in ids:
+        earliest = latest = None
+        if rng.random() < 0.3:
+            earliest = time(rng.randint(8, 16), rng.choice([0, 15, 30, 45]))
+        if rng.random() < 0.3:
+            latest = time(rng.randint(10, 20), rng.choice([0, 15, 30, 45]))
+        depends_on = []
+        if rng.random() < 0.4:
+            # Includes unknown ids, self references and cycles
+            depends_on = [rng.choice(ids + [10_000]) for _ in range(rng.randint(1, 3))]
+        scheduled_date = None
+        if rng.random() < 0.1:
+            scheduled_date = DAY + timedelta(days=rng.choice([-1, 1]))
+        tasks.append(
+            Task(
+                id=task_id,
+                title=f"Task {task_id}",
+                duration_minutes=rng.choice([5, 15, 30, 45, 60, 90, 120]),
+                priority=rng.randint(1, 3),
+                earliest_start_time=earliest,
+                latest_end_time=latest,
+                flexible=rng.random() < 0.5,
+                is_completed=rng.random() < 0.1,
+                scheduled_date=scheduled_date,
+                depends_on=depends_on,
+            )
+        )
+
+    events = []
+    for event_id in range(n_events):
+        start = datetime.combine(DAY, time(rng.randint(7, 20), rng.choice([0, 10, 30])))
+        events.append(
+            Event(
+                id=100_000 + event_id,
+                title=f"Event {event_id}",
+                start=start,
+                end=start + timedelta(minutes=rng.choice([10, 30, 60, 90])),
+            )
+        )
+    return tasks, events
+
+
+def as_tuples(blocks):
+    return [(b.id, b.title, b.start_time, b.end_time) for b in blocks]
+
+
+@pytest.mark.scheduler
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_reference_scheduler(seed):
+    rng = random.Random(seed)
+    tasks, events = random_board(rng, rng.randint(1, 60), rng.randint(0, 8))
+    day_start = datetime.combine(DAY, time(rng.randint(6, 10), rng.choice([0, 7, 30])))
+    day_end = datetime.combine(DAY, time(rng.randint(17, 23), 0))
+    buffer_minutes = rng.choice([0, 0, 5, 10, 15])
+
+    expected, expected_unscheduled = reference_schedule(
+        tasks, events, day_start, day_end, buffer_minutes
+    )
+    actual, actual_unscheduled = generate_schedule(
+        tasks, events, day_start, day_end, buffer_minutes
+    )
+
+    assert as_tuples(actual) == as_tuples(expected)
+    assert [t.id for t in actual_unscheduled] == [t.id for t in expected_unscheduled]
@@ -0,0 +1,657 @@
+import logging
+import random
+import sys
+from dataclasses import replace
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from taskboard.cli import display_tasks
+from taskboard.models.event import Event
+from taskboard.models.task import Task
+from taskboard.storage import (
+    events_repository,
+    partitioned_events,
+    tasks_repository,
+    write_log,
+)
+from taskboard.storage.journal_store import JournalTaskStore
+from taskboard.storage.jsonl_store import JsonlEventStore, JsonlTaskStore
+from taskboard.storage.partitioned_events import PartitionedEventStore
+from taskboard.storage.sqlite_store import SqliteTaskStore, migrate_from_json
+
+
+@pytest.fixture(params=["json", "sqlite", "journal", "monthly", "jsonl"])
+def backend(request, tmp_path, monkeypatch):
+    if request.param == "monthly":
+        monkeypatch.setenv("TASKBOARD_BACKEND", "json")
+        monkeypatch.setenv("TASKBOARD_EVENT_LAYOUT", "monthly")
+    else:
+        monkeypatch.setenv("TASKBOARD_BACKEND", request.param)
+    monkeypatch.setenv("TASKBOARD_DB", str(tmp_path / "taskboard.db"))
+    monkeypatch.setattr(tasks_repository, "DATA_PATH", tmp_path / "tasks.json")
+    monkeypatch.setattr(events_repository, "DATA_PATH", tmp_path / "events.json")
+    monkeypatch.setattr(events_repository, "SYNC_STATE_PATH", tmp_path / "sync.json")
+    return request.param
+
+
+def make_task(id, priority=2, scheduled_date=date(2026, 1, 1), **fields):
+    return Task(
+        id=id,
+        title=f"Task {id}",
+        duration_minutes=30,
+        priority=priority,
+        earliest_start_time=fields.pop("earliest_start_time", None),
+        latest_end_time=fields.pop("latest_end_time", None),
+        flexible=fields.pop("flexible", False),
+        scheduled_date=scheduled_date,
+        **fields,
+    )
+
+
+def make_event(id, hour, title="Event"):
+    start = datetime(2026, 1, 1, hour)
+    return Event(id=id, title=title, start=start, end=start + timedelta(hours=1))
+
+
+def test_tasks_round_trip(backend):
+    started = datetime(2026, 1, 1, 9, 30)
+    task = make_task(
+        2**100 + 7,  # ids are uuid4 integers
+        earliest_start_time=time(9),
+        latest_end_time=time(17, 30),
+        flexible=True,
+        is_completed=True,
+        description="Notes",
+        deadline=datetime(2026, 1, 3, 12),
+        energy_level=3,
+        work_sessions=[(started, started + timedelta(minutes=20))],
+        active_session_start=started,
+        depends_on=[5, 3],
+    )
+    tasks_repository.save_tasks([task, make_task(5), make_task(3)])
+
+    loaded = tasks_repository.load_tasks()
+    assert loaded[0] == task
+    assert [t.id for t in loaded] == [task.id, 5, 3]
+
+
+def test_events_round_trip(backend):
+    events = [
+        make_event(2, 11),
+        Event(
+            id=1,
+            title="Sync",
+            start=datetime(2026, 1, 1, 9),
+            end=datetime(2026, 1, 1, 10),
+            description="Weekly",
+            source="google",
+            external_id="abc",
+        ),
+    ]
+    events_repository.save_events(list(events))
+    assert events_repository.load_events() == [events[1], events[0]]
+
+
+def test_single_saves_keep_the_order_a_full_save_would(backend):
+    rng = random.Random(3)
+    days = [date(2026, 1, 1), date(2026, 1, 2)]
+    tasks = [make_task(i, priority=rng.randint(1, 3)) for i in range(20)]
+    tasks_repository.save_tasks(tasks)
+
+    for new_id in range(20, 80):
+        task = rng.choice(tasks)
+        if rng.random() < 0.6:
+            task.priority = rng.randint(1, 3)
+            task.scheduled_date = rng.choice(days)
+            task.active_session_start = datetime(2026, 1, 1, rng.randint(8, 12))
+        else:
+            task = make_task(new_id, rng.randint(1, 3), rng.choice(days))
+            tasks.append(task)
+        tasks_repository.save_task(task)
+        tasks.sort(key=lambda t: (t.scheduled_date, t.priority))
+        assert tasks_repository.load_tasks() == tasks
+
+
+def test_filtered_reads_and_the_active_task(backend):
+    rng = random.Random(4)
+    tasks = [
+        make_task(
+            i,
+            priority=rng.randint(1, 3),
+            scheduled_date=date(2026, 1, rng.randint(1, 5)),
+            is_completed=rng.random() < 0.5,
+        )
+        for i in range(40)
+    ]
+    tasks_repository.save_tasks(list(tasks))
+    assert tasks_repository.get_active_task() is None
+
+    active = make_task(40, scheduled_date=date(2026, 1, 3))
+    active.active_session_start = datetime(2026, 1, 3, 9)
+    tasks_repository.save_task(active)
+    tasks.append(active)
+    tasks.sort(key=lambda t: (t.scheduled_date, t.priority))
+    assert tasks_repository.get_active_task() == active
+
+    # In stored order, with the task added last where a full save puts it
+    for completed in (None, True, False):
+        for until in (None, date(2026, 1, 2), date(2026, 1, 3)):
+            found = tasks_repository.iter_tasks(completed, until)
+            expected = [
+                t
+                for t in tasks
+                if (completed is None or t.is_completed == completed)
+                and (until is None or t.scheduled_date <= until)
+            ]
+            assert [t.id for t in found] == [t.id for t in expected]
+
+
+def test_display_lists_tasks_in_the_same_order_on_every_backend(
+    backend, monkeypatch, capsys
+):
+    monkeypatch.setenv("TASKBOARD_DAEMON", "off")
+    rng = random.Random(5)
+    tasks_repository.save_tasks(
+        [
+            make_task(
+                i,
+                priority=rng.randint(1, 3),
+                scheduled_date=date(2026, 1, rng.randint(2, 4)),
+                is_completed=rng.random() < 0.3,
+            )
+            for i in range(30)
+        ]
+    )
+    # Saved one at a time, so the jsonl store appends them
+    tasks_repository.save_task(make_task(30, scheduled_date=date(2026, 1, 1)))
+    tasks_repository.save_task(
+        make_task(
+            31,
+            priority=1,
+            scheduled_date=date(2026, 1, 3),
+            active_session_start=datetime(2026, 1, 3, 9),
+        )
+    )
+
+    def titles(*args):
+        monkeypatch.setattr(sys, "argv", ["display_tasks", *args])
+        display_tasks.main()
+        lines = capsys.readouterr().out.splitlines()
+        return [line[4:].split(" (ACTIVE")[0] for line in lines]
+
+    # The order display_tasks has always listed them in
+    listed = sorted(
+        tasks_repository.load_tasks(),
+        key=lambda t: (
+            not t.is_completed,
+            t.scheduled_date or date.max,
+            t.active_session_start is not None,
+        ),
+    )
+    assert titles("--all") == [t.title for t in listed]
+    assert titles("--date", "2026-01-04") == [
+        t.title for t in listed if not t.is_completed
+    ]
+    assert titles("--completed") == [t.title for t in listed if t.is_completed]
+
+
+def test_single_event_save(backend):
+    events_repository.save_events([make_event(1, 9), make_event(2, 10)])
+    moved = make_event(1, 12, title="Moved")
+    events_repository.save_event(moved)
+    events_repository.save_event(make_event(3, 8))
+
+    assert [(e.id, e.title) for e in events_repository.load_events()] == [
+        (3, "Event"),
+        (2, "Event"),
+        (1, "Moved"),
+    ]
+
+
+def test_events_by_date_range(backend):
+    events = [
+        Event(
+            id=i,
+            title=f"Event {i}",
+            start=datetime(2025, 11, 20, 9) + timedelta(days=9 * i, minutes=i),
+            end=datetime(2025, 11, 20, 10) + timedelta(days=9 * i),
+        )
+        for i in range(12)
+    ]
+    events_repository.save_events(list(events))
+
+    def starting(first, last):
+        return [e.id for e in events if first <= e.start.date() <= last]
+
+    for first, last in [
+        (date(2025, 12, 1), date(2026, 1, 31)),
+        (date(2025, 12, 8), date(2025, 12, 8)),
+        (date(2026, 2, 1), date(2026, 2, 3)),
+        (date(2024, 1, 1), date(2030, 1, 1)),
+    ]:
+        loaded = events_repository.load_events(first, last)
+        assert [e.id for e in loaded] == starting(first, last)
+    assert [e.id for e in events_repository.load_events(date(2026, 2, 1))] == starting(
+        date(2026, 2, 1), date.max
+    )
+
+
+def test_fingerprint_changes_on_every_write(backend):
+    seen = {tasks_repository.tasks_fingerprint()}
+    tasks_repository.save_tasks([make_task(1)])
+    seen.add(tasks_repository.tasks_fingerprint())
+    tasks_repository.save_task(make_task(1, priority=1))
+    seen.add(tasks_repository.tasks_fingerprint())
+    events_repository.save_event(make_event(1, 9))
+    seen.add(events_repository.events_fingerprint())
+    assert len(seen) == 4
+
+
+def test_unchanged_saves_do_not_write(backend):
+    tasks_repository.save_tasks([make_task(1), make_task(2)])
+    events_repository.save_events([make_event(1, 9), make_event(2, 10)])
+    tasks_fingerprint = tasks_repository.tasks_fingerprint()
+    events_fingerprint = events_repository.events_fingerprint()
+
+    tasks_repository.save_tasks(tasks_repository.load_tasks())
+    events_repository.save_events(events_repository.load_events())
+    events_repository.save_event(make_event(2, 10))
+    if backend != "journal":
+        # The journal appends every single save; it is its cheap path
+        tasks_repository.save_task(make_task(2))
+    assert tasks_repository.tasks_fingerprint() == tasks_fingerprint
+    assert events_repository.events_fingerprint() == events_fingerprint
+
+
+def calendar_events(count, first_id=1000):
+    events = []
+    for i in range(count):
+        start = datetime(2026, 1 + i % 3, 1 + i % 28, 9)
+        events.append(
+            Event(
+                id=first_id + i,
+                title=f"Meeting {i}",
+                start=start,
+                end=start + timedelta(minutes=30),
+                source="work",
+                external_id=f"e{i}",
+            )
+        )
+    return events
+
+
+def test_sync_events_upserts_by_external_id(backend):
+    events_repository.save_event(make_event(1, 9))
+    result = events_repository.sync_events("work", calendar_events(30))
+    assert (result.added, result.updated, result.removed) == (30, 0, 0)
+
+    # Ids come from the caller on the first sync and are kept after that
+    calendar = calendar_events(31, first_id=5000)
+    calendar[3].title = "Renamed"
+    calendar[5].start += timedelta(days=40)
+    calendar[5].end += timedelta(days=40)
+    del calendar[7]
+    result = events_repository.sync_events("work", calendar, token="t1")
+    assert (result.added, result.updated, result.removed) == (1, 2, 1)
+    assert result.unchanged == 27
+    stored = {e.external_id: e for e in events_repository.load_events()}
+    assert len(stored) == 31 and stored[None] == make_event(1, 9)
+    assert (stored["e3"].id, stored["e3"].title) == (1003, "Renamed")
+    assert stored["e5"].start == calendar[5].start and stored["e30"].id == 5030
+    assert "e7" not in stored
+
+    # An unchanged token skips the listing entirely
+    def unread():
+        raise AssertionError("read")
+        yield
+
+    assert events_repository.sync_events("work", unread(), token="t1").up_to_date
+
+    # After another write the index is built from the store again
+    events_repository.save_event(make_event(2, 10))
+    result = events_repository.sync_events("work", calendar, token="t1")
+    assert not result.up_to_date and result.unchanged == 30
+    with pytest.raises(ValueError):
+        events_repository.sync_events("work", [make_event(3, 11)])
+
+
+def test_sync_refuses_a_listing_that_repeats_an_external_id(backend):
+    events_repository.sync_events("work", calendar_events(5), token="t1")
+    before = events_repository.events_fingerprint()
+
+    calendar = calendar_events(5)
+    repeated = replace(calendar[2], id=9999, title="Other copy")
+    for listing in (calendar + [repeated], [repeated] + calendar):
+        with pytest.raises(ValueError, match="'e2'"):
+            events_repository.sync_events("work", listing, token="t2")
+    # Nothing was written, and the last sync's index still holds
+    assert events_repository.events_fingerprint() == before
+    assert events_repository.sync_events("work", calendar, token="t1").up_to_date
+
+
+def test_sqlite_sync_touches_only_changed_rows(tmp_path, monkeypatch):
+    monkeypatch.setenv("TASKBOARD_BACKEND", "sqlite")
+    monkeypatch.setenv("TASKBOARD_DB", str(tmp_path / "board.db"))
+    monkeypatch.setattr(events_repository, "SYNC_STATE_PATH", tmp_path / "sync.json")
+    calendar = calendar_events(2000)
+    events_repository.sync_events("work", calendar)
+
+    store = events_repository.get_event_store()
+    before = store.connection.total_changes
+    calendar[10].description = "Agenda"
+    calendar.append(calendar_events(2001)[-1])
+    del calendar[50]
+    result = events_repository.sync_events("work", calendar)
+
+    # One row updated, one added, one deleted, and the revision
+    assert (result.added, result.updated, result.removed) == (1, 1, 1)
+    assert store.connection.total_changes - before == 4
+    assert events_repository.load_events() == sorted(
+        calendar, key=lambda e: (e.start, e.title)
+    )
+
+
+def test_sqlite_save_writes_only_changed_rows(tmp_path):
+    store = SqliteTaskStore(tmp_path / "board.db")
+    tasks = [make_task(i, priority=1 + i % 3) for i in range(200)]
+    store.save(list(tasks))
+
+    before = store.connection.total_changes
+    tasks[10].title = "Renamed"
+    tasks.append(make_task(200, priority=1))
+    del tasks[50]
+    store.save(list(tasks))
+
+    # Two task rows written, one deleted, and the revision
+    assert store.connection.total_changes - before == 4
+    assert store.load() == sorted(tasks, key=lambda t: t.priority)
+
+
+def test_debug_log_reports_bytes_written(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(write_log, "_configured", True)
+    store = tasks_repository.JsonTaskStore(tmp_path / "tasks.json")
+    with caplog.at_level(logging.DEBUG, logger="taskboard.storage"):
+        store.save([make_task(1)])
+        store.save([make_task(1)])
+    size = (tmp_path / "tasks.json").stat().st_size
+    assert caplog.messages == [
+        f"wrote {size} bytes to tasks.json",
+        "tasks.json unchanged, not written",
+    ]
+
+
+def test_sqlite_save_one_touches_only_that_task(tmp_path):
+    store = SqliteTaskStore(tmp_path / "board.db")
+    store.save([make_task(i, depends_on=[i - 1] if i else []) for i in range(200)])
+
+    before = store.connection.total_changes
+    task = make_task(7, depends_on=[6])
+    task.active_session_start = datetime(2026, 1, 1, 9)
+    store.save_one(task)
+
+    # The task row, its dependency deleted and inserted again, and the revision
+    assert store.connection.total_changes - before == 4
+
+
+def test_unknown_backend(monkeypatch):
+    monkeypatch.setenv("TASKBOARD_BACKEND", "csv")
+    with pytest.raises(ValueError):
+        tasks_repository.load_tasks()
+
+
+def test_migration_copies_json_and_refuses_to_overwrite(tmp_path):
+    tasks = [make_task(i, priority=3 - i % 3) for i in range(10)]
+    events = [make_event(i, 8 + i) for i in range(3)]
+    path = tmp_path / "board.db"
+
+    assert migrate_from_json(path, list(tasks), list(events))
+    assert SqliteTaskStore(path).load() == sorted(tasks, key=lambda t: t.priority)
+    assert not migrate_from_json(path, [], [])
+    assert migrate_from_json(path, [], [], force=True)
+    assert SqliteTaskStore(path).load() == []
+
+
+def journal_store(tmp_path, **options):
+    return JournalTaskStore(
+        tmp_path / "tasks.snapshot.json",
+        tmp_path / "tasks.journal",
+        seed_path=tmp_path / "tasks.json",
+        **options,
+    )
+
+
+def test_journal_starts_from_the_json_board(tmp_path):
+    tasks_repository.JsonTaskStore(tmp_path / "tasks.json").save(
+        [make_task(1), make_task(2)]
+    )
+    store = journal_store(tmp_path)
+    assert [t.id for t in store.load()] == [1, 2]
+
+    store.save_one(make_task(3, priority=1))
+    # Later edits to the JSON file no longer reach the journal's board
+    tasks_repository.JsonTaskStore(tmp_path / "tasks.json").save([])
+    assert [t.id for t in store.load()] == [3, 1, 2]
+
+
+def test_journal_appends_without_rewriting_the_snapshot(tmp_path):
+    store = journal_store(tmp_path)
+    store.save([make_task(i) for i in range(50)])
+    snapshot = (tmp_path / "tasks.snapshot.json").read_bytes()
+
+    task = make_task(7, priority=1)
+    task.active_session_start = datetime(2026, 1, 1, 9)
+    store.save_one(task)
+
+    assert (tmp_path / "tasks.snapshot.json").read_bytes() == snapshot
+    assert len((tmp_path / "tasks.journal").read_bytes().splitlines()) == 2
+    assert store.load()[0] == task
+
+
+def test_journal_compacts_past_the_threshold(tmp_path):
+    store = journal_store(tmp_path, compact_bytes=2000)
+    store.save([make_task(i) for i in range(5)])
+
+    for i in range(5, 30):
+        store.save_one(make_task(i, priority=1 + i % 3))
+        assert (tmp_path / "tasks.journal").stat().st_size <= 2000 + 1000
+
+    expected = [make_task(i) for i in range(5)] + [
+        make_task(i, priority=1 + i % 3) for i in range(5, 30)
+    ]
+    expected.sort(key=lambda t: t.priority)
+    assert store.load() == expected
+
+
+def test_journal_skips_a_torn_record(tmp_path):
+    store = journal_store(tmp_path)
+    store.save([make_task(1)])
+    store.save_one(make_task(2))
+    with open(tmp_path / "tasks.journal", "ab") as f:
+        f.write(b'{"op": "save", "task": {"id": 3, "ti')  # crashed mid-append
+
+    store.save_one(make_task(4))
+    assert [t.id for t in store.load()] == [1, 2, 4]
+
+
+def test_journal_from_an_older_snapshot_is_not_replayed(tmp_path):
+    store = journal_store(tmp_path)
+    store.save([make_task(1)])
+    store.save_one(make_task(2, priority=1))
+    journal = (tmp_path / "tasks.journal").read_bytes()
+
+    # A crash right after compaction wrote the new snapshot leaves the old journal
+    store.compact()
+    (tmp_path / "tasks.journal").write_bytes(
+        journal + b'{"op": "save", "task": null}\n'
+    )
+    assert [t.id for t in store.load()] == [2, 1]
+
+
+def test_monthly_layout_rewrites_only_changed_partitions(tmp_path, monkeypatch):
+    written = []
+    write_atomic = partitioned_events.write_atomic
+    monkeypatch.setattr(
+        partitioned_events,
+        "write_atomic",
+        lambda path, data: written.append(path.name) or write_atomic(path, data),
+    )
+    store = PartitionedEventStore(tmp_path / "events")
+    events = [make_event(i, 9) for i in range(3)]
+    events[1].start = events[1].end = datetime(2026, 2, 1, 9)
+    events[2].start = events[2].end = datetime(2026, 3, 1, 9)
+    store.save(list(events))
+    assert sorted(written) == ["2026-01.json", "2026-02.json", "2026-03.json"] + [
+        "index.json",
+        "manifest.json",
+    ]
+
+    written.clear()
+    events[1].title = "Renamed"
+    store.save(list(events))
+    assert "2026-02.json" in written
+    assert "2026-01.json" not in written and "2026-03.json" not in written
+
+    # Reading one day opens only that month
+    read = []
+    monkeypatch.setattr(store, "_read_partition", lambda name: read.append(name) or [])
+    store.load(date(2026, 3, 1), date(2026, 3, 1))
+    assert read == ["2026-03"]
+    del store._read_partition
+
+    # Synced changes rewrite only the months they touch
+    written.clear()
+    events[0].title = "Renamed"
+    store.save_changes([events[0]], {events[2].id})
+    assert sorted(written) == ["2026-01.json", "index.json", "manifest.json"]
+    assert store.load() == events[:2]
+    assert not (tmp_path / "events" / "2026-03.json").exists()
+
+
+def test_monthly_layout_moves_an_event_between_months(tmp_path):
+    events_repository.JsonEventStore(tmp_path / "events.json").save(
+        [make_event(1, 9), make_event(2, 10)]
+    )
+    store = PartitionedEventStore(
+        tmp_path / "events", seed_path=tmp_path / "events.json"
+    )
+    assert [e.id for e in store.load()] == [1, 2]
+
+    moved = make_event(1, 9)
+    moved.start, moved.end = datetime(2026, 2, 3, 9), datetime(2026, 2, 3, 10)
+    store.save_one(moved)
+
+    assert store.load() == [make_event(2, 10), moved]
+    assert sorted(p.name for p in (tmp_path / "events").iterdir()) == [
+        "2026-01.json",
+        "2026-02.json",
+        "index.json",
+        "manifest.json",
+    ]
+    store.save_one(make_event(2, 11))
+    assert [e.id for e in store.load()] == [2, 1]
+    store.save([moved])
+    assert not (tmp_path / "events" / "2026-01.json").exists()
+
+
+def test_jsonl_starts_from_the_json_board(tmp_path):
+    tasks_repository.JsonTaskStore(tmp_path / "tasks.json").save(
+        [make_task(1), make_task(2)]
+    )
+    store = JsonlTaskStore(tmp_path / "tasks.jsonl", seed_path=tmp_path / "tasks.json")
+    assert [t.id for t in store.load()] == [1, 2]
+
+    store.save_one(make_task(3, priority=1))
+    tasks_repository.JsonTaskStore(tmp_path / "tasks.json").save([])
+    assert [t.id for t in store.load()] == [3, 1, 2]
+
+
+def test_jsonl_appends_new_records_without_rewriting(tmp_path):
+    store = JsonlTaskStore(tmp_path / "tasks.jsonl")
+    store.save([make_task(i) for i in range(50)])
+    before = (tmp_path / "tasks.jsonl").read_bytes()
+
+    store.save_one(make_task(50, priority=1))
+    after = (tmp_path / "tasks.jsonl").read_bytes()
+    assert after.startswith(before)
+    assert len(after.splitlines()) == 51
+    assert store.load()[0] == make_task(50, priority=1)
+
+    # Changing a stored task rewrites the file in order
+    store.save_one(make_task(7, priority=3))
+    assert [t.id for t in store.load()][-1] == 7
+    assert len((tmp_path / "tasks.jsonl").read_bytes().splitlines()) == 51
+
+
+def test_jsonl_filters_while_reading(tmp_path):
+    store = JsonlTaskStore(tmp_path / "tasks.jsonl")
+    store.save([make_task(i, is_completed=i % 2 == 0) for i in range(6)])
+    assert [t.id for t in store.iter(completed=False)] == [1, 3, 5]
+    assert [t.id for t in store.iter(completed=True)] == [0, 2, 4]
+
+    events = JsonlEventStore(tmp_path / "events.jsonl")
+    events.save([make_event(1, 9), make_event(2, 10)])
+    events.save_one(
+        Event(
+            id=3,
+            title="Later",
+            start=datetime(2026, 1, 5, 9),
+            end=datetime(2026, 1, 5, 10),
+        )
+    )
+    assert [e.id for e in events.iter(date(2026, 1, 1), date(2026, 1, 1))] == [1, 2]
+    assert [e.id for e in events.iter(date(2026, 1, 2))] == [3]
+
+    # An appended event is read where a full save would have put it
+    events.save_one(make_event(4, 8))
+    assert [e.id for e in events.iter()] == [4, 1, 2, 3]
+    assert [e.id for e in events.iter(date(2026, 1, 1), date(2026, 1, 1))] == [4, 1, 2]
+
+
+def test_jsonl_skips_a_torn_record(tmp_path):
+    store = JsonlTaskStore(tmp_path / "tasks.jsonl")
+    store.save([make_task(1)])
+    with open(tmp_path / "tasks.jsonl", "ab") as f:
+        f.write(b'{"id": 3, "ti')  # crashed mid-append
+
+    store.save_one(make_task(4))
+    assert [t.id for t in store.load()] == [1, 4]
+
+
+def test_jsonl_index_reads_only_the_matching_lines(tmp_path, monkeypatch):
+    store = JsonlTaskStore(tmp_path / "tasks.jsonl")
+    store.save(
+        [make_task(i, scheduled_date=date(2026, 1, 1 + i % 10)) for i in range(100)]
+    )
+    monkeypatch.setattr(
+        store.file, "lines", lambda: pytest.fail("the whole file was read")
+    )
+    assert sorted(t.id for t in store.iter(False, date(2026, 1, 2))) == sorted(
+        list(range(0, 100, 10)) + list(range(1, 100, 10))
+    )
+
+    events = JsonlEventStore(tmp_path / "events.jsonl")
+    events.save([make_event(1, 9), make_event(2, 10)])
+    monkeypatch.setattr(
+        events.file, "lines", lambda: pytest.fail("the whole file was read")
+    )
+    assert [e.id for e in events.iter(date(2026, 1, 1), date(2026, 1, 1))] == [1, 2]
+    assert list(events.iter(date(2026, 1, 2), date(2026, 1, 2))) == []
+
+
+def test_jsonl_index_follows_appends_and_hand_edits(tmp_path):
+    store = JsonlTaskStore(tmp_path / "tasks.jsonl")
+    store.save([make_task(1), make_task(2)])
+    index = (tmp_path / "tasks.jsonl.idx").read_bytes()
+
+    active = make_task(3)
+    active.active_session_start = datetime(2026, 1, 1, 9)
+    store.save_one(active)
+    assert (tmp_path / "tasks.jsonl.idx").read_bytes() != index
+    assert store.active() == active
+
+    # An index that no longer matches the file is rebuilt
+    lines = (tmp_path / "tasks.jsonl").read_bytes().splitlines(keepends=True)
+    (tmp_path / "tasks.jsonl").write_bytes(lines[2] + lines[0])
+    assert store.active() == active
+    assert [t.id for t in store.iter(completed=False)] == [3, 1]
@@ -0,0 +1,125 @@
+import random
+import sys
+from datetime import datetime, time, timedelta, timezone
+
+import pytest
+
+from taskboard.core.scheduler import generate_schedule
+from taskboard.models.event import Event
+from taskboard.models.task import Task
+from taskboard.models.task_table import TaskTable
+from taskboard.storage.binary_snapshot import read_snapshot_table
+from taskboard.storage.tasks_repository import JsonTaskStore
+from tests.test_binary_snapshot import random_task
+from tests.test_scheduler_equivalence import DAY, as_tuples, random_board
+
+
+def test_table_round_trips():
+    rng = random.Random(0)
+    tasks = [random_task(rng, i) for i in range(200)]
+    table = TaskTable.from_tasks(tasks)
+    assert len(table) == len(tasks)
+    assert table.to_tasks() == tasks
+    assert list(table) == tasks
+    assert tasks == list(table)
+    assert table[-1] == tasks[-1]
+    with pytest.raises(IndexError):
+        table[len(tasks)]
+
+
+def test_values_the_arrays_cannot_hold():
+    start = datetime(2026, 1, 1, 9, tzinfo=timezone.utc)
+    tasks = [
+        random_task(random.Random(1), 1),
+        Task(
+            id=2**128 - 1,
+            title="uuid",
+            duration_minutes=30,
+            priority=1,
+            earliest_start_time=None,
+            latest_end_time=None,
+            flexible=True,
+            work_sessions=[(start, start + timedelta(minutes=25))],
+            depends_on=[2**100],
+        ),
+    ]
+    assert TaskTable.from_tasks(tasks).to_tasks() == tasks
+
+
+def test_rows_write_through_to_the_table():
+    table = TaskTable.from_tasks([random_task(random.Random(2), 1)])
+    row = table[0]
+    row.title = "Renamed"
+    row.is_completed = True
+    row.earliest_start_time = time(6)
+    session = (datetime(2026, 1, 2, 9), datetime(2026, 1, 2, 10))
+    row.work_sessions = row.work_sessions + [session]
+
+    task = table[0].to_task()
+    assert task.title == "Renamed"
+    assert task.is_completed is True
+    assert task.earliest_start_time == time(6)
+    assert task.work_sessions[-1] == session
+
+
+def test_changed_rows():
+    rng = random.Random(2)
+    tasks = [random_task(rng, i) for i in range(300)]
+    before = TaskTable.from_tasks(tasks)
+
+    tasks[3].title += "!"
+    tasks[40].work_sessions = tasks[40].work_sessions + [
+        (datetime(2026, 1, 1, 9), datetime(2026, 1, 1, 10))
+    ]
+    tasks[41].depends_on = [7]
+    tasks[200].is_completed = not tasks[200].is_completed
+    tasks.append(random_task(rng, 300))
+    after = TaskTable.from_tasks(tasks)
+    after[250].work_sessions = after[250].work_sessions  # same, as an override
+
+    assert before.changed_rows(after) == [3, 40, 41, 200]
+    assert after.changed_rows(before) == [3, 40, 41, 200]
+    assert before.changed_rows(TaskTable.from_tasks(before)) == []
+
+
+def test_scheduling_rows_matches_scheduling_tasks():
+    rng = random.Random(3)
+    for _ in range(50):
+        tasks, events = random_board(rng, rng.randint(1, 40), rng.randint(0, 6))
+        day_start = datetime.combine(DAY, time(8))
+        day_end = datetime.combine(DAY, time(18))
+        expected, expected_unscheduled = generate_schedule(
+            tasks, events, day_start, day_end, buffer_minutes=5
+        )
+        rows = list(TaskTable.from_tasks(tasks))
+        blocks, unscheduled = generate_schedule(
+            rows, events, day_start, day_end, buffer_minutes=5
+        )
+        assert as_tuples(blocks) == as_tuples(expected)
+        assert [t.id for t in unscheduled] == [t.id for t in expected_unscheduled]
+
+
+@pytest.mark.parametrize("top_id", [100, 2**64 - 1, 2**128 - 1])
+def test_snapshot_loads_into_a_table(tmp_path, top_id):
+    rng = random.Random(4)
+    store = JsonTaskStore(tmp_path / "tasks.json", tmp_path / "tasks.bin")
+    store.save([random_task(rng, i) for i in range(50)] + [random_task(rng, top_id)])
+
+    table = read_snapshot_table(tmp_path / "tasks.bin", tmp_path / "tasks.json")
+    assert table.to_tasks() == store.load()
+    assert (
+        JsonTaskStore(tmp_path / "tasks.json").load_table().to_tasks() == store.load()
+    )
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need 3.10")
+def test_models_have_no_instance_dict():
+    task = random_task(random.Random(5), 1)
+    event = Event(
+        id=1,
+        title="Standup",
+        start=datetime(2026, 1, 1, 9),
+        end=datetime(2026, 1, 1, 10),
+    )
+    assert not hasattr(task, "__dict__")
+    assert not hasattr(event, "__dict__")
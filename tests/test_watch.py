@@ -0,0 +1,156 @@
+import asyncio
+import io
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from taskboard.cli import run_today
+from taskboard.cli.run_today import (
+    LiveSchedule,
+    build_schedule,
+    format_schedule,
+    watch_schedule,
+)
+from taskboard.core import incremental
+from taskboard.core.incremental import plan_schedule
+from taskboard.models.event import Event
+from taskboard.models.task import Task
+from taskboard.storage import events_repository, tasks_repository
+
+
+def at(hour, minute=0):
+    return datetime.combine(date.today(), time(hour, minute))
+
+
+def make_task(id, priority=2, title=None):
+    return Task(
+        id=id,
+        title=title or f"Task {id}",
+        duration_minutes=60,
+        priority=priority,
+        earliest_start_time=None,
+        latest_end_time=None,
+        flexible=False,
+    )
+
+
+@pytest.fixture
+def board(tmp_path, monkeypatch):
+    monkeypatch.setenv("TASKBOARD_BACKEND", "json")
+    monkeypatch.setattr(tasks_repository, "DATA_PATH", tmp_path / "tasks.json")
+    monkeypatch.setattr(events_repository, "DATA_PATH", tmp_path / "events.json")
+    tasks_repository.save_tasks([make_task(1), make_task(2)])
+    events_repository.save_events(
+        [Event(id=7, title="Lunch", start=at(12), end=at(12, 30))]
+    )
+
+
+def run_today_output(now, buffer_minutes=10):
+    return format_schedule(
+        build_schedule(
+            list(tasks_repository.load_task_table()),
+            events_repository.load_events(now.date(), now.date()),
+            now,
+            at(20),
+            buffer_minutes,
+            "interval",
+            now,
+        )
+    )
+
+
+def test_live_schedule_follows_the_board_and_the_clock(board, monkeypatch):
+    loads = []
+    load_task_table = run_today.load_task_table
+    monkeypatch.setattr(
+        run_today, "load_task_table", lambda: loads.append(1) or load_task_table()
+    )
+    live = LiveSchedule(None, time(20), 10, "interval")
+
+    assert live.refresh(at(11, 50)) == run_today_output(at(11, 50))
+    table = live.plan.table
+    # Nothing was placed before lunch, so the plan stands as the clock moves on
+    assert live.refresh(at(12, 15)) == run_today_output(at(12, 15))
+    assert "[EVENT - ONGOING] Lunch" in live.refresh(at(12, 15))
+    assert live.plan.table is table
+    # Past the start of the first block, the day is planned again
+    assert live.refresh(at(12, 41)) == run_today_output(at(12, 41))
+    assert live.plan.table is not table
+    assert len(loads) == 1
+
+    tasks_repository.save_task(make_task(3, priority=1))
+    schedule = live.refresh(at(12, 42))
+    assert schedule.index("Task 3") < schedule.index("Task 1")
+    tasks_repository.save_task(make_task(2, title="Renamed"))
+    assert "Renamed" in live.refresh(at(12, 43))
+    assert len(loads) == 3
+
+    assert "The day is over" in live.refresh(at(20, 5))
+
+
+def test_tasks_added_before_others_keep_the_earlier_blocks(board, monkeypatch):
+    live = LiveSchedule(time(9), time(20), 0, "interval")
+    first = live.refresh(at(8))
+    planned = []
+    monkeypatch.setattr(
+        incremental,
+        "plan_schedule",
+        lambda *args: planned.append(1) or plan_schedule(*args),
+    )
+    monkeypatch.setattr(run_today, "plan_schedule", incremental.plan_schedule)
+
+    # Saved ahead of tasks 1 and 2, but only free from 14:00
+    task = make_task(3, priority=1)
+    task.earliest_start_time = time(14)
+    tasks_repository.save_task(task)
+    assert [t.id for t in tasks_repository.load_tasks()] == [3, 1, 2]
+    schedule = live.refresh(at(8))
+    assert planned == []
+    assert (
+        schedule.splitlines()[3:6]
+        == first.splitlines()[3:6]
+        == [
+            "09:00 - 10:00: Task 1 (60 mins)",
+            "10:00 - 11:00: Task 2 (60 mins)",
+            "12:00 - 12:30: [EVENT] Lunch (30 mins)",
+        ]
+    )
+    assert "14:00 - 15:00: Task 3 (60 mins)" in schedule
+
+    # Only its place on the board puts this one ahead of task 1
+    task = make_task(4)
+    task.scheduled_date = date.today() - timedelta(days=1)
+    tasks_repository.save_task(task)
+    assert "09:00 - 10:00: Task 4" in live.refresh(at(8))
+    assert planned == [1]
+
+
+async def until(condition, timeout=5.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("timed out")
+
+
+def test_watch_redraws_once_a_burst_of_changes_settles(board):
+    live = LiveSchedule(time(9), time(20), 0, "interval")
+    out = io.StringIO()
+
+    def frames():
+        return out.getvalue().split("watching for changes.\n")[:-1]
+
+    async def scenario():
+        watcher = asyncio.ensure_future(
+            watch_schedule(live, out, poll_seconds=0.01, debounce_seconds=0.1)
+        )
+        await until(lambda: frames())
+        tasks_repository.save_task(make_task(3))
+        await asyncio.sleep(0.03)
+        tasks_repository.save_task(make_task(4))
+        await until(lambda: "Task 4" in frames()[-1])
+        watcher.cancel()
+
+    asyncio.run(scenario())
+    assert "Task 1" in frames()[0]
+    assert not any("Task 3" in frame and "Task 4" not in frame for frame in frames())